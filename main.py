@@ -1,98 +1,259 @@
 #!/usr/bin/env python3
 
+# Only what every command needs is imported up front; selenium, browsers and crawling modules
+# are imported by the commands that use them, so that commands which don't crawl start instantly.
+import argparse
 from logging import getLogger
 import logging.config
-import undetected_chromedriver as uc
-from selenium import webdriver 
 from datetime import datetime
-from multiprocessing import Manager
-import concurrent.futures as f
 import traceback
 import sys
 
-import src.indeed as Indeed
-import src.linkedin as Linkedin
-from src.jobloaderfactory import JobLoaderFactory
-from src.base.basejobloader import BaseJobLoader
-from src.constants import CHROME_DRIVER_PATH, STOPLIST_FILE_NAME, REPORT_FOLDER_NAME, KEEP_NEWEST_REPORTS_COUNT
-from src.constants import DEROGATORY_MARK_WEIGHT_HANDICAP, LOG_CONFIG_FILE_NAME, MAX_THREADS
+from src.constants import STOPLIST_FILE_NAME, STOPLIST_INDEX_FILE_NAME, REPORT_FOLDER_NAME, KEEP_NEWEST_REPORTS_COUNT, LAST_RESULTS_FILE_NAME
+from src.constants import LOG_CONFIG_FILE_NAME, DEROGATORY_MARK_WEIGHT_HANDICAP, DAEMON_INTERVAL_MINUTES
 from src.utility import getAbsPathRelativeToFile, getSimpleModuleName
-from src.jobprocessor import JobProcessor, RegexFilteringWeight, SalaryFilteringWeight
-from src.renderer.htmlrenderer import HtmlRenderer
-from src.filemanager import FileManager
 
-if __name__ == "__main__":
-    try:
-        # configure logging
-        logging.config.fileConfig(getAbsPathRelativeToFile(__file__, LOG_CONFIG_FILE_NAME))
+def createBrowser():
+    import undetected_chromedriver as uc
+    from selenium import webdriver
+    from src.base.leanbrowser import makeBrowserOptionsLean, blockUnneededResources
+    from src.constants import CHROME_DRIVER_PATH, LEAN_BROWSER
+
+    # undetected_chromedriver does not allow reusing options between browsers, so every browser gets its own
+    options = webdriver.ChromeOptions()
+    options.add_argument("--lang=en-US")
+    options.add_argument('--headless=new') # no browser window
+    options.add_argument('--disable-popup-blocking') # page prefetching opens the next page in a new tab
+    if LEAN_BROWSER:
+        makeBrowserOptionsLean(options)
+    driver = uc.Chrome(options=options, driver_executable_path=CHROME_DRIVER_PATH)
+    if LEAN_BROWSER:
+        blockUnneededResources(driver)
+    return driver
+
+def getSearches() -> dict:
+    import src.indeed as Indeed
+    import src.linkedin as Linkedin
+
+    # setup job search parameters
+    indeedParams = Indeed.SearchParams()
+    indeedParams.query = 'Spanish AND (Translator OR Interpreter) NOT Medical'
+    indeedParams.location = 'United States'
+    indeedParams.dateRange = Indeed.Enums.DateRange.Last7Days
+    indeedParams.jobType = Indeed.Enums.JobType.Contract
+    indeedParams.postedBy = Indeed.Enums.PostedBy.Employer
+    indeedParams.remoteOrTemporarilyRemote = Indeed.Enums.Remote.Remote
+
+    linkedinParams = Linkedin.SearchParams()
+    linkedinParams.query = 'Truck Driver NOT ("Uber Agency" OR Delivery)'
+    linkedinParams.location = 'Los Angeles, California, United States'
+    linkedinParams.dateRange = Linkedin.Enums.DateRange.Past24Hours
+    linkedinParams.experienceLevel = Linkedin.Enums.ExperienceLevel.EntryLevel
+    linkedinParams.withinMiles = Linkedin.Enums.WithinMiles._50
+
+    # searches by name; add as many as needed, searches that load the same pages are loaded once
+    return { 'Indeed Search Parameters': indeedParams, 'Linkedin Search Parameters': linkedinParams }
+
+def getWeighingConditions() -> list:
+    from src.jobprocessor import RegexFilteringWeight, SalaryFilteringWeight
+
+    # setup job filtering/weighing after search
+    return [RegexFilteringWeight(fieldNameToTest = 'title', weight = DEROGATORY_MARK_WEIGHT_HANDICAP, regex = r'diesel|loader'),
+            RegexFilteringWeight(fieldNameToTest = 'company', weight = DEROGATORY_MARK_WEIGHT_HANDICAP, regex = r'recruit|hire|talent|partners'),
+            RegexFilteringWeight(fieldNameToTest = 'title', weight = 2, regex = r'class a|local'),
+            RegexFilteringWeight(fieldNameToTest = 'company', weight = 1, regex = r'department'),
+            SalaryFilteringWeight(weight = 3, salaryMustBeNoLessThan = 80000)]
 
-        # setup job search parameters
-        indeedParams = Indeed.SearchParams()
-        indeedParams.query = 'Spanish AND (Translator OR Interpreter) NOT Medical'
-        indeedParams.location = 'United States'
-        indeedParams.dateRange = Indeed.Enums.DateRange.Last7Days
-        indeedParams.jobType = Indeed.Enums.JobType.Contract
-        indeedParams.postedBy = Indeed.Enums.PostedBy.Employer
-        indeedParams.remoteOrTemporarilyRemote = Indeed.Enums.Remote.Remote
-
-        linkedinParams = Linkedin.SearchParams()
-        linkedinParams.query = 'Truck Driver NOT ("Uber Agency" OR Delivery)'
-        linkedinParams.location = 'Los Angeles, California, United States'
-        linkedinParams.dateRange = Linkedin.Enums.DateRange.Past24Hours
-        linkedinParams.experienceLevel = Linkedin.Enums.ExperienceLevel.EntryLevel
-        linkedinParams.withinMiles = Linkedin.Enums.WithinMiles._50
-
-        # setup job filtering/weighing after search
-        weighingConditions = [RegexFilteringWeight(fieldNameToTest = 'title', weight = DEROGATORY_MARK_WEIGHT_HANDICAP, regex = r'diesel|loader'),
-                              RegexFilteringWeight(fieldNameToTest = 'company', weight = DEROGATORY_MARK_WEIGHT_HANDICAP, regex = r'recruit|hire|talent|partners'),
-                              RegexFilteringWeight(fieldNameToTest = 'title', weight = 2, regex = r'class a|local'),
-                              RegexFilteringWeight(fieldNameToTest = 'company', weight = 1, regex = r'department'),
-                              SalaryFilteringWeight(weight = 3, salaryMustBeNoLessThan = 80000)]
-
-        # setup browser
-        options = webdriver.ChromeOptions()
-        options.add_argument("--lang=en-US")
-        options.add_argument('--headless=new') # no browser window
-        driver = uc.Chrome(options=options, driver_executable_path=CHROME_DRIVER_PATH)
-
-        # setup multithreading
-        m = Manager()
-        lock = m.Lock()
-        factory = JobLoaderFactory()
-        searchParams = [ indeedParams, linkedinParams ]
-        for i in range(len(searchParams) - 1): # open tabs for Indeed and Linkedin in browser
-            driver.execute_script("window.open('');")
-        loaders = [factory.createJobLoader(searchParams[i], driver, lock, i) for i in range(len(searchParams))]
-        jobs = []
-
-        # load jobs
-        with f.ThreadPoolExecutor(max_workers=MAX_THREADS) as executor:
-            results = executor.map(BaseJobLoader.loadJobs, loaders, searchParams)
-            for result in results:
-                jobs.extend(result)
+def saveReport(groupedJobs: list, date: datetime, searches: dict) -> None:
+    from src.renderer.htmlrenderer import HtmlRenderer
+    from src.filemanager import FileManager
 
+    # create report
+    htmlString = HtmlRenderer().render(groupedJobs, date=date, searchParams = searches)
+
+    # save report
+    fileManager = FileManager(getAbsPathRelativeToFile(__file__, REPORT_FOLDER_NAME))
+    fileManager.saveFile('report', 'html', htmlString)
+
+    # do some housekeeping - remove old reports
+    fileManager.deleteOldFiles('*.html', KEEP_NEWEST_REPORTS_COUNT)
+
+# Sets up everything crawls need and returns a function that runs one crawl (and saves its results and report)
+# along with a function that releases it all. Browsers stay open between crawls.
+def startCrawling(hostStaggerSeconds: float = 0) -> tuple:
+    from src.jobloaderfactory import JobLoaderFactory
+    from src.crawlengine import CrawlEngine
+    from src.base.driverpool import DriverPool
+    from src.base.httpclient import HttpClient
+    from src.base.pagecache import PageCache, PageCacheMode
+    from src.base.crawlhistory import CrawlHistory
+    from src.base.crawljournal import CrawlJournal
+    from src.jobprocessor import JobProcessor
+    from src.resultstore import ResultStore
+    from src.constants import MAX_BROWSERS, LOAD_JOBS_OVER_HTTP, PAGE_CACHE_MODE, PAGE_CACHE_FOLDER_NAME, INCREMENTAL_CRAWL, CRAWL_HISTORY_FILE_NAME
+    from src.constants import RESUME_INTERRUPTED_CRAWLS, CRAWL_JOURNAL_FOLDER_NAME, LOAD_JOB_DETAILS, JOB_DETAIL_CACHE_FOLDER_NAME
+    from src.base.jobdetailcache import JobDetailCache
+    from src.jobdetailenricher import JobDetailEnricher
+
+    searches = getSearches()
+
+    # setup browsers: they are started on demand, one per loader, up to MAX_BROWSERS
+    driverPool = DriverPool(createBrowser, size = min(MAX_BROWSERS, len(searches)))
+    httpClient = HttpClient() if LOAD_JOBS_OVER_HTTP else None
+    pageCache = PageCache(getAbsPathRelativeToFile(__file__, PAGE_CACHE_FOLDER_NAME), PageCacheMode(PAGE_CACHE_MODE)) if PAGE_CACHE_MODE else None
+    crawlHistory = CrawlHistory(getAbsPathRelativeToFile(__file__, CRAWL_HISTORY_FILE_NAME)) if INCREMENTAL_CRAWL else None
+    crawlJournal = CrawlJournal(getAbsPathRelativeToFile(__file__, CRAWL_JOURNAL_FOLDER_NAME)) if RESUME_INTERRUPTED_CRAWLS else None
+    factory = JobLoaderFactory()
+    createJobLoader = lambda params: factory.createJobLoader(params, driverPool, httpClient, pageCache, crawlHistory, crawlJournal)
+    jobDetailEnricher = JobDetailEnricher(JobDetailCache(getAbsPathRelativeToFile(__file__, JOB_DETAIL_CACHE_FOLDER_NAME)),
+                                          lambda jobLink: factory.createJobDetailLoader(jobLink, driverPool, httpClient)) if LOAD_JOB_DETAILS else None
+    jobProcessor = JobProcessor(getAbsPathRelativeToFile(__file__, STOPLIST_FILE_NAME), getWeighingConditions(),
+                                getAbsPathRelativeToFile(__file__, STOPLIST_INDEX_FILE_NAME))
+    crawlEngine = CrawlEngine(hostStaggerSeconds = hostStaggerSeconds)
+    resultStore = ResultStore(getAbsPathRelativeToFile(__file__, LAST_RESULTS_FILE_NAME))
+
+    def crawlOnce() -> None:
+        driverPool.discardDeadDrivers() # a browser that crashed since the last crawl would fail every page
+
+        # load and process jobs (assign weights and derogatory marks based on job titles and company names, then sort);
+        # jobs are processed page by page while the rest are still loading, after their descriptions are loaded if needed
+        jobBatches = crawlEngine.streamSearchesAsync(searches, createJobLoader)
+        if jobDetailEnricher:
+            jobBatches = jobDetailEnricher.enrichBatchesAsync(jobBatches)
+        groupedJobs = crawlEngine.run(jobProcessor.processJobBatchesAsync(jobBatches))
+        date = datetime.now()
+        resultStore.save(groupedJobs, date)
+        saveReport(groupedJobs, date, searches)
+
+    def stopCrawling() -> None:
         # Seeing "OSError: [WinError 6] The handle is invalid" on quit?
         # Use this solution: https://github.com/ultrafunkamsterdam/undetected-chromedriver/issues/955#issuecomment-1473294652
-        driver.quit() # stop browser.
+        driverPool.quit() # stop browsers.
+        if httpClient:
+            httpClient.close()
+
+    return crawlOnce, stopCrawling
+
+def crawl(args: argparse.Namespace) -> int:
+    crawlOnce, stopCrawling = startCrawling()
+    try:
+        crawlOnce()
+    finally:
+        stopCrawling()
+    return 0
+
+def daemon(args: argparse.Namespace) -> int:
+    from src.crawlscheduler import CrawlScheduler
+    from src.constants import DAEMON_HOST_STAGGER_SECONDS
+
+    crawlOnce, stopCrawling = startCrawling(DAEMON_HOST_STAGGER_SECONDS)
+    try:
+        CrawlScheduler(args.every * 60).run(lambda cycle: crawlOnce())
+    except KeyboardInterrupt:
+        getLogger(getSimpleModuleName(__name__)).info('Stopped')
+    finally:
+        stopCrawling()
+    return 0
+
+def render(args: argparse.Namespace) -> int:
+    from src.resultstore import ResultStore
+
+    results = ResultStore(getAbsPathRelativeToFile(__file__, LAST_RESULTS_FILE_NAME)).load()
+    if results is None:
+        return 1
+    groupedJobs, date = results
+    saveReport(groupedJobs, date, getSearches())
+    return 0
 
-        # process jobs (assign weights and derogatory marks based on job titles and company names, then sort)
-        jobProcessor = JobProcessor(getAbsPathRelativeToFile(__file__, STOPLIST_FILE_NAME), weighingConditions)
-        groupedJobs = jobProcessor.processJobs(jobs)
+def getWorkQueue():
+    from src.workqueue import WorkQueue
+    from src.constants import WORK_QUEUE_FILE_NAME
 
-        # create report
-        htmlString = HtmlRenderer().render(groupedJobs, date=datetime.now(), 
-                                           searchParams = { 'Indeed Search Parameters': indeedParams, 'Linkedin Search Parameters': linkedinParams })
+    return WorkQueue(getAbsPathRelativeToFile(__file__, WORK_QUEUE_FILE_NAME))
+
+def queueSearches(args: argparse.Namespace) -> int:
+    from src.jobloaderfactory import JobLoaderFactory
+
+    factory = JobLoaderFactory()
+    getWorkQueue().startCrawl(getSearches(), lambda params: factory.createJobLoader(params, None).getSearchKey(params))
+    return 0
+
+def work(args: argparse.Namespace) -> int:
+    from src.jobloaderfactory import JobLoaderFactory
+    from src.crawlworker import CrawlWorker
+    from src.base.driverpool import DriverPool
+    from src.base.httpclient import HttpClient
+    from src.base.pagecache import PageCache, PageCacheMode
+    from src.constants import LOAD_JOBS_OVER_HTTP, PAGE_CACHE_MODE, PAGE_CACHE_FOLDER_NAME
+
+    # every worker has one browser, run as many workers as the machine can take (all on this machine, see WorkQueue);
+    # the queue takes the place of crawl journal, and crawl history, which only one process can keep, is not used
+    driverPool = DriverPool(createBrowser, size = 1)
+    httpClient = HttpClient() if LOAD_JOBS_OVER_HTTP else None
+    pageCache = PageCache(getAbsPathRelativeToFile(__file__, PAGE_CACHE_FOLDER_NAME), PageCacheMode(PAGE_CACHE_MODE)) if PAGE_CACHE_MODE else None
+    factory = JobLoaderFactory()
+    try:
+        CrawlWorker(getWorkQueue(), lambda params: factory.createJobLoader(params, driverPool, httpClient, pageCache)).run()
+    except KeyboardInterrupt:
+        getLogger(getSimpleModuleName(__name__)).info('Stopped')
+    finally:
+        driverPool.quit()
+        if httpClient:
+            httpClient.close()
+    return 0
 
-        # save report
-        fileManager = FileManager(getAbsPathRelativeToFile(__file__, REPORT_FOLDER_NAME))
-        fileManager.saveFile('report', 'html', htmlString)
+def collect(args: argparse.Namespace) -> int:
+    from src.jobprocessor import JobProcessor
+    from src.resultstore import ResultStore
+
+    workQueue = getWorkQueue()
+    if not workQueue.isCrawlFinished():
+        getLogger(getSimpleModuleName(__name__)).warning('Workers are not done yet, the report will only have jobs loaded so far')
+    groupedJobs = JobProcessor(getAbsPathRelativeToFile(__file__, STOPLIST_FILE_NAME), getWeighingConditions(),
+                               getAbsPathRelativeToFile(__file__, STOPLIST_INDEX_FILE_NAME)).processJobs(workQueue.getJobs())
+    date = datetime.now()
+    ResultStore(getAbsPathRelativeToFile(__file__, LAST_RESULTS_FILE_NAME)).save(groupedJobs, date)
+    saveReport(groupedJobs, date, getSearches())
+    return 0
+
+def validateStoplist(args: argparse.Namespace) -> int:
+    from src.jobprocessor import JobProcessor
+
+    stoplistPath = args.stoplist or getAbsPathRelativeToFile(__file__, STOPLIST_FILE_NAME)
+    return 1 if JobProcessor(stoplistPath).validateStoplist() is None else 0
+
+def parseArgs(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description = 'Loads jobs from Indeed and Linkedin and makes a report out of them.')
+    parser.set_defaults(command = crawl) # no command means crawl, as it always did
+    commands = parser.add_subparsers(title = 'commands')
+    commands.add_parser('crawl', help = 'load jobs, process them and make a report (default)').set_defaults(command = crawl)
+    daemonParser = commands.add_parser('daemon', help = 'keep running and crawl on schedule, browsers stay open between crawls')
+    daemonParser.add_argument('--every', type = float, default = DAEMON_INTERVAL_MINUTES, metavar = 'MINUTES',
+                              help = 'minutes between starts of crawls, %d by default' % DAEMON_INTERVAL_MINUTES)
+    daemonParser.set_defaults(command = daemon)
+    commands.add_parser('render', help = 'make a report out of the results of the last crawl again, without loading anything').set_defaults(command = render)
+    commands.add_parser('queue', help = 'put searches into the work queue for workers to load, replacing whatever was there').set_defaults(command = queueSearches)
+    commands.add_parser('work', help = 'load searches from the work queue until there are none left; run as many workers as needed').set_defaults(command = work)
+    commands.add_parser('collect', help = 'process jobs loaded by workers and make a report').set_defaults(command = collect)
+    validateParser = commands.add_parser('validate-stoplist', help = 'check that the stoplist can be read and report entries that are skipped')
+    validateParser.add_argument('stoplist', nargs = '?', help = 'path to stoplist, %s next to main.py by default' % STOPLIST_FILE_NAME)
+    validateParser.set_defaults(command = validateStoplist)
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    exitCode = 1
+    try:
+        args = parseArgs(sys.argv[1:])
+
+        # configure logging
+        logging.config.fileConfig(getAbsPathRelativeToFile(__file__, LOG_CONFIG_FILE_NAME))
 
-        # do some housekeeping - remove old reports
-        fileManager.deleteOldFiles('*.html', KEEP_NEWEST_REPORTS_COUNT)
+        exitCode = args.command(args)
     except Exception as ex:
         exInfo = sys.exc_info()
         try:
             getLogger(getSimpleModuleName(__name__)).critical("Critical error, application cannot continue", exc_info=1)
         except Exception as ex2: # in case logger is badly configured and we can't use it, log to console
             traceback.print_exception(*exInfo)
-            traceback.print_exc()
\ No newline at end of file
+            traceback.print_exc()
+    sys.exit(exitCode)
@@ -1,54 +1,652 @@
 import abc
+import asyncio
+import copy
 import time
+from random import uniform
+from contextlib import contextmanager, nullcontext
+from typing import Callable, Iterator, Generator, TYPE_CHECKING
 from logging import getLogger, Logger
-from selenium.webdriver.chrome.webdriver import WebDriver
-from random import randrange
-from multiprocessing.managers import AcquirerProxy
 
-from ..constants import MIN_SECONDS_TO_SLEEP, MAX_SECONDS_TO_SLEEP
+from ..constants import PREFETCH_NEXT_PAGE, PAGE_LOAD_TIMEOUT_SECONDS, PAGE_LOAD_ATTEMPTS, PAGE_RETRY_BASE_SECONDS, PAGE_RETRY_MAX_SECONDS, PAGE_RETRY_JITTER
 from ..jobinfo import JobInfo
 from .basesearchparams import BaseSearchParams
-from ..utility import getSimpleModuleName
+from .driverpool import DriverPool
+from .hostsemaphores import HostSemaphores
+from .pagecache import PageCache, PageCacheMode
+from .crawlhistory import CrawlHistory
+from .crawljournal import CrawlJournal, CrawlCheckpoint
+from .pageloadstats import PageFailure, PageLoadStats
+from .ratelimiter import RateLimiters, sharedRateLimiters
+from ..utility import canonicalizeUrl, getSimpleModuleName
+
+if TYPE_CHECKING: # selenium takes a while to import and http loaders and replays don't need it
+    from selenium.webdriver.chrome.webdriver import WebDriver
+
+# a search gave up on a page after every attempt to load it failed, see BaseJobLoader.loadJobsOrRaise
+class SearchGivenUpError(Exception):
+    pass
+
 
 class BaseJobLoader(abc.ABC):
-    _driver: WebDriver
-    _tabNumber: int
-    _lock: AcquirerProxy
+    _driverPool: DriverPool
+    _driver: 'WebDriver'
+    _rateLimiters: RateLimiters
+    _pageCache: PageCache | None
+    _crawlHistory: CrawlHistory | None
+    _crawlJournal: CrawlJournal | None
+    _prefetchNextPage: bool = PREFETCH_NEXT_PAGE
+    _pageLoadAttempts: int = PAGE_LOAD_ATTEMPTS
+    _pageLoadStats: PageLoadStats
+    _shardOverflowingSearches: bool = False
+    _shards: list[BaseSearchParams]
+    # Facets a search that finds more jobs than can be loaded is split by, as (search params attribute, values).
+    # Values of a facet should cover every job the search finds, but they needn't exclude each other (an Indeed job can be
+    # both full-time and contract): shards that find the same job are fine, because jobs of a search are told apart by their links
+    # when results are put together (CrawlEngine.streamSearchesAsync, WorkQueue.getJobs).
+    _shardFacets: list[tuple[str, list]] = []
+    __prefetchTab: str | None = None
     _logger: Logger
+    # Javascript that reads everything a loader needs from the current page in one round trip and returns
+    # plain JSON: { jobs: [ ...raw job cards... ], count: total jobs found or null, next: next page url or null }.
+    # Loaders that see the http status also set blocked: true on pages the site refused to serve.
+    _pageExtractionScript: str = None
+    # Javascript that returns text of the job description on a job's own page, or null
+    _jobDescriptionScript: str = None
+    # Format of raw pages in page cache. Loaders that encode them differently have a format of their own,
+    # so that they don't read each other's pages from cache (all loaders of a site load the same urls).
+    _rawPageFormat: str = 'extractedpage'
 
-    def __init__(self, driver: WebDriver, lock: AcquirerProxy, tabNumber: int, loggerName: str):
-        self._driver = driver
-        self._tabNumber = tabNumber
-        self._lock = lock
+    def __init__(self, driverPool: DriverPool, loggerName: str):
+        self._driverPool = driverPool
+        self._driver = None
+        self._rateLimiters = sharedRateLimiters
+        self._pageCache = None
+        self._crawlHistory = None
+        self._crawlJournal = None
+        self._pageLoadStats = PageLoadStats()
+        self._shards = []
         self._logger = getLogger(getSimpleModuleName(loggerName))
 
-    def _switchToProperTab(self) -> None:
-        tabHandle = self._driver.window_handles[self._tabNumber]
-        self._driver.switch_to.window(tabHandle)
+    @property
+    def driverPool(self) -> DriverPool | None:
+        return self._driverPool
+
+    @property
+    def pageCache(self) -> PageCache | None:
+        return self._pageCache
+
+    @pageCache.setter
+    def pageCache(self, pageCache: PageCache | None) -> None:
+        self._pageCache = pageCache
+
+    # with crawl history, paging stops at the first page that has nothing but jobs seen on previous runs
+    @property
+    def crawlHistory(self) -> CrawlHistory | None:
+        return self._crawlHistory
+
+    @crawlHistory.setter
+    def crawlHistory(self, crawlHistory: CrawlHistory | None) -> None:
+        self._crawlHistory = crawlHistory
+
+    # with crawl journal, a crawl that was interrupted is resumed from the last page it finished
+    @property
+    def crawlJournal(self) -> CrawlJournal | None:
+        return self._crawlJournal
+
+    @crawlJournal.setter
+    def crawlJournal(self, crawlJournal: CrawlJournal | None) -> None:
+        self._crawlJournal = crawlJournal
+
+    # attempts and failures of every page this loader has loaded
+    @property
+    def pageLoadStats(self) -> PageLoadStats:
+        return self._pageLoadStats
+
+    # With sharding, a search that finds more jobs than can be loaded doesn't load any and leaves shards instead:
+    # searches that find the same jobs together (see getShards), for whoever runs it to load.
+    @property
+    def shardOverflowingSearches(self) -> bool:
+        return self._shardOverflowingSearches
+
+    @shardOverflowingSearches.setter
+    def shardOverflowingSearches(self, shardOverflowingSearches: bool) -> None:
+        self._shardOverflowingSearches = shardOverflowingSearches
 
-    def loadJobs(self, searchParams: BaseSearchParams, shouldSleep: bool = True) -> list[JobInfo]:
+    # shards left by the last search, empty if it didn't need any
+    @property
+    def shards(self) -> list[BaseSearchParams]:
+        return self._shards
+
+    # Splits the search by the first facet it doesn't filter by yet, one search per value of that facet.
+    # Returns an empty list if the search filters by all facets already.
+    def getShards(self, searchParams: BaseSearchParams) -> list[BaseSearchParams]:
+        for attribute, values in self._shardFacets:
+            if getattr(searchParams, attribute, None) is None:
+                shards = []
+                for value in values:
+                    shard = copy.copy(searchParams)
+                    setattr(shard, attribute, value)
+                    shards.append(shard)
+                return shards
+        return []
+
+    # searches with the same key load the same pages
+    def getSearchKey(self, searchParams: BaseSearchParams) -> str:
+        return canonicalizeUrl(self._getFirstPageUrl(searchParams))
+
+    # the same posting has the same id no matter how its link was decorated
+    def getJobId(self, jobLink: str) -> str:
+        return canonicalizeUrl(jobLink)
+
+    # Loads the full description from the job's own page, returns None if there is none. Detail pages wait for their turn
+    # like any other page of the same host. Pages are not cached or replayed, see JobDetailCache for that.
+    async def loadJobDescriptionAsync(self, jobLink: str, shouldSleep: bool = True, hostSemaphores: HostSemaphores = None) -> str | None:
+        if self.__isReplaying():
+            return None
+        try:
+            async with self.__waitForSession(False):
+                session = self._openSession()
+                await asyncio.to_thread(session.__enter__)
+                try:
+                    await self._sleepAsync(jobLink, shouldSleep)
+                    async with (hostSemaphores or HostSemaphores()).forUrl(jobLink):
+                        self._logger.info('Loading job details from url = "%s"...', jobLink)
+                        description = await asyncio.to_thread(self._fetchJobDescription, jobLink)
+                finally:
+                    await asyncio.to_thread(session.__exit__, None, None, None)
+        except Exception:
+            self._logger.exception('Exception on loading job details from url = "%s"', jobLink)
+            return None
+        description = ' '.join(description.split()) if description else None
+        if not description:
+            self._logger.warning('There is no job description at url = "%s"', jobLink)
+        return description or None
+
+    # If onJobs is given, jobs are handed to it page by page as soon as they are loaded instead of being returned at the end
+    def loadJobs(self, searchParams: BaseSearchParams, shouldSleep: bool = True, onJobs: Callable[[list[JobInfo]], None] = None) -> list[JobInfo]:
         try:
-            return self._loadJobsInner(searchParams, shouldSleep)
+            with self.__openSessionUnlessReplaying():
+                return self._loadJobsInner(searchParams, shouldSleep, onJobs)
         except Exception:
             self._logger.exception('Exception on loading jobs')
             return []
 
-    @abc.abstractmethod        
-    def _loadJobsInner(self, searchParams: BaseSearchParams, shouldSleep: bool) -> list[JobInfo]:
+    # Same as loadJobs, but for callers that can have the search loaded again instead of settling for part of it:
+    # exceptions get to the caller, and so does a search that gave up on a page (as SearchGivenUpError).
+    # Pages finished before that are in the crawl journal, if there is one.
+    def loadJobsOrRaise(self, searchParams: BaseSearchParams, shouldSleep: bool = True) -> list[JobInfo]:
+        searchesGivenUp = self._pageLoadStats.searchesGivenUp
+        with self.__openSessionUnlessReplaying():
+            jobs = self._loadJobsInner(searchParams, shouldSleep)
+        if self._pageLoadStats.searchesGivenUp > searchesGivenUp:
+            raise SearchGivenUpError('Search gave up on a page after %d attempts' % self._pageLoadAttempts)
+        return jobs
+
+    # acquires whatever is needed to load pages for one search - a browser by default
+    @contextmanager
+    def _openSession(self) -> Iterator[None]:
+        # the driver is ours alone until the lease ends, no other loader can navigate it away
+        with self._driverPool.lease() as driver:
+            self._driver = driver
+            try:
+                yield
+            finally:
+                self._driver = None
+
+    # waits for a free browser on the event loop rather than in a worker thread (see DriverPool.getLeaseSemaphore)
+    def __waitForSession(self, isReplaying: bool):
+        return nullcontext() if self._driverPool is None or isReplaying else self._driverPool.getLeaseSemaphore()
+
+    def __isReplaying(self) -> bool:
+        return self._pageCache is not None and self._pageCache.mode == PageCacheMode.Replay
+
+    def __openSessionUnlessReplaying(self):
+        return nullcontext() if self.__isReplaying() else self._openSession() # replayed pages need no browser
+
+    def _loadJobsInner(self, searchParams: BaseSearchParams, shouldSleep: bool, onJobs: Callable[[list[JobInfo]], None] = None) -> list[JobInfo]:
+        crawl = self._crawl(searchParams, onJobs)
+        prefetchedUrl = None
+        try:
+            url, pageNumber = next(crawl)
+            while True:
+                page = self.__loadPageFromCache(url)
+                if page is None:
+                    page, prefetchedUrl = self.__loadPage(searchParams, pageNumber, url, prefetchedUrl, shouldSleep)
+
+                url, pageNumber = crawl.send(page)
+        except StopIteration as finished:
+            return finished.value
+        finally:
+            self._discardPrefetchedPage()
+
+    # returns loaded page and url of the page prefetched after it, if any
+    def __loadPage(self, searchParams: BaseSearchParams, pageNumber: int, url: str, prefetchedUrl: str | None, shouldSleep: bool) -> tuple[dict, str | None]:
+        attempt = 1
+        while True:
+            self._pageLoadStats.attempts += 1
+            try:
+                if url == prefetchedUrl:
+                    prefetchedUrl = None
+                    rawPage = self._takePrefetchedPage(url)
+                else:
+                    self._discardPrefetchedPage()
+                    prefetchedUrl = None
+                    self._sleep(url, shouldSleep)
+                    self._logger.info('Loading jobs from url = "%s"...', url)
+                    rawPage = self._fetchPage(url)
+
+                # start loading the next page while this one is parsed, as early as its url is known
+                prefetchedUrl = self.__prefetch(self._predictNextPageUrl(searchParams, pageNumber, None), shouldSleep)
+                page = self._parsePage(url, rawPage)
+                prefetchedUrl = prefetchedUrl or self.__prefetch(self._predictNextPageUrl(searchParams, pageNumber, page), shouldSleep)
+                error, failure = None, self.__classifyPage(pageNumber, page)
+            except Exception as e:
+                error, failure, page = e, self.__classifyError(e), None
+
+            if failure is None:
+                self.__storeInCache(url, pageNumber, rawPage, page)
+                return page, prefetchedUrl
+            if not self.__shouldRetry(url, attempt, failure, error):
+                return self.__giveUp(failure, page), prefetchedUrl
+
+            self._discardPrefetchedPage() # whatever was predicted from a bad page can't be trusted
+            prefetchedUrl = None
+            self._backOff(attempt, shouldSleep)
+            attempt += 1
+
+    def __shouldPrefetch(self, url: str | None) -> bool:
+        return bool(url) and self._prefetchNextPage and not self.__isInCache(url)
+
+    def __prefetch(self, url: str | None, shouldSleep: bool) -> str | None:
+        if not self.__shouldPrefetch(url):
+            return None
+        self._sleep(url, shouldSleep) # prefetched pages wait for their turn like any other page
+        self._logger.info('Prefetching jobs from url = "%s"...', url)
+        self._startPrefetch(url)
+        return url
+
+    async def loadJobsAsync(self, searchParams: BaseSearchParams, shouldSleep: bool = True, hostSemaphores: HostSemaphores = None,
+                            onJobs: Callable[[list[JobInfo]], None] = None) -> list[JobInfo]:
+        try:
+            # page loads and session setup block (browser, sockets), so they run in worker threads
+            # while waiting between pages doesn't hold any thread at all
+            async with self.__waitForSession(self.__isReplaying()):
+                session = self.__openSessionUnlessReplaying()
+                await asyncio.to_thread(session.__enter__)
+                try:
+                    return await self._loadJobsInnerAsync(searchParams, shouldSleep, hostSemaphores or HostSemaphores(), onJobs)
+                finally:
+                    await asyncio.to_thread(session.__exit__, None, None, None)
+        except Exception:
+            self._logger.exception('Exception on loading jobs')
+            return []
+
+    async def _loadJobsInnerAsync(self, searchParams: BaseSearchParams, shouldSleep: bool, hostSemaphores: HostSemaphores,
+                                  onJobs: Callable[[list[JobInfo]], None] = None) -> list[JobInfo]:
+        crawl = self._crawl(searchParams, onJobs)
+        prefetchedUrl = None
+        try:
+            url, pageNumber = next(crawl)
+            while True:
+                page = await asyncio.to_thread(self.__loadPageFromCache, url)
+                if page is None:
+                    page, prefetchedUrl = await self.__loadPageAsync(searchParams, pageNumber, url, prefetchedUrl, shouldSleep, hostSemaphores)
+
+                url, pageNumber = crawl.send(page)
+        except StopIteration as finished:
+            return finished.value
+        finally:
+            await self.__discardPrefetchedPageAsync(prefetchedUrl, hostSemaphores)
+
+    async def __loadPageAsync(self, searchParams: BaseSearchParams, pageNumber: int, url: str, prefetchedUrl: str | None, shouldSleep: bool,
+                              hostSemaphores: HostSemaphores) -> tuple[dict, str | None]:
+        attempt = 1
+        while True:
+            self._pageLoadStats.attempts += 1
+            try:
+                if url == prefetchedUrl:
+                    try:
+                        rawPage = await asyncio.to_thread(self._takePrefetchedPage, url)
+                    finally:
+                        prefetchedUrl = None
+                        hostSemaphores.forUrl(url).release()
+                else:
+                    prefetchedUrl = await self.__discardPrefetchedPageAsync(prefetchedUrl, hostSemaphores)
+                    await self._sleepAsync(url, shouldSleep)
+                    async with hostSemaphores.forUrl(url):
+                        self._logger.info('Loading jobs from url = "%s"...', url)
+                        rawPage = await asyncio.to_thread(self._fetchPage, url)
+
+                # start loading the next page while this one is parsed, as early as its url is known
+                prefetchedUrl = await self.__prefetchAsync(self._predictNextPageUrl(searchParams, pageNumber, None), shouldSleep, hostSemaphores)
+                page = await asyncio.to_thread(self._parsePage, url, rawPage)
+                prefetchedUrl = prefetchedUrl or await self.__prefetchAsync(self._predictNextPageUrl(searchParams, pageNumber, page), shouldSleep, hostSemaphores)
+                error, failure = None, self.__classifyPage(pageNumber, page)
+            except Exception as e:
+                error, failure, page = e, self.__classifyError(e), None
+
+            if failure is None:
+                await asyncio.to_thread(self.__storeInCache, url, pageNumber, rawPage, page)
+                return page, prefetchedUrl
+            if not self.__shouldRetry(url, attempt, failure, error):
+                return self.__giveUp(failure, page), prefetchedUrl
+
+            prefetchedUrl = await self.__discardPrefetchedPageAsync(prefetchedUrl, hostSemaphores) # predicted from a bad page
+            await self._backOffAsync(attempt, shouldSleep)
+            attempt += 1
+
+    async def __prefetchAsync(self, url: str | None, shouldSleep: bool, hostSemaphores: HostSemaphores) -> str | None:
+        if not await asyncio.to_thread(self.__shouldPrefetch, url):
+            return None
+        await self._sleepAsync(url, shouldSleep)
+        await hostSemaphores.forUrl(url).acquire() # held until the prefetched page is taken or discarded
+        try:
+            self._logger.info('Prefetching jobs from url = "%s"...', url)
+            await asyncio.to_thread(self._startPrefetch, url)
+        except BaseException:
+            hostSemaphores.forUrl(url).release()
+            raise
+        return url
+
+    async def __discardPrefetchedPageAsync(self, prefetchedUrl: str | None, hostSemaphores: HostSemaphores) -> None:
+        if prefetchedUrl:
+            try:
+                await asyncio.to_thread(self._discardPrefetchedPage)
+            finally:
+                hostSemaphores.forUrl(prefetchedUrl).release()
+        return None
+
+    @staticmethod
+    def __classifyError(error: Exception) -> PageFailure:
+        from selenium.common.exceptions import TimeoutException
+        return PageFailure.Timeout if isinstance(error, (TimeoutError, TimeoutException)) else PageFailure.Error
+
+    # returns None if the page is fine
+    def __classifyPage(self, pageNumber: int, page: dict) -> PageFailure | None:
+        if page.get('blocked'):
+            return PageFailure.BlockPage
+        return None if self._isPageHealthy(pageNumber, page) else PageFailure.EmptyPage
+
+    def __shouldRetry(self, url: str, attempt: int, failure: PageFailure, error: Exception | None) -> bool:
+        self._pageLoadStats.failures[failure] += 1
+        if attempt >= self._pageLoadAttempts:
+            self._logger.error('Giving up on url = "%s" after %d attempts, last one failed with %s', url, attempt, failure.value, exc_info = error)
+            return False
+        self._logger.warning('Attempt %d of %d to load url = "%s" failed with %s%s', attempt, self._pageLoadAttempts, url, failure.value,
+                             ': %s' % error if error else '')
+        self._rateLimiters.forUrl(url).reportThrottled() # the last attempt is reported by the crawl like any other page
+        return True
+
+    # An empty page is handed to the crawl as it is - it may just be the end of results. Anything else ends the search
+    # with whatever it has loaded so far.
+    @staticmethod
+    def __giveUp(failure: PageFailure, page: dict | None) -> dict:
+        if failure == PageFailure.EmptyPage:
+            return page
+        return { 'jobs': [], 'count': None, 'next': None, 'blocked': failure == PageFailure.BlockPage, 'failed': True }
+
+    def __getSecondsToBackOff(self, attempt: int) -> float:
+        secondsToBackOff = min(PAGE_RETRY_MAX_SECONDS, PAGE_RETRY_BASE_SECONDS * 2 ** (attempt - 1))
+        secondsToBackOff += uniform(0, PAGE_RETRY_JITTER * secondsToBackOff) # retries of different searches don't line up
+        self._logger.info('Retrying in %.1f seconds...', secondsToBackOff)
+        return secondsToBackOff
+
+    def _backOff(self, attempt: int, shouldSleep: bool) -> None:
+        if shouldSleep:
+            time.sleep(self.__getSecondsToBackOff(attempt))
+
+    async def _backOffAsync(self, attempt: int, shouldSleep: bool) -> None:
+        if shouldSleep:
+            await asyncio.sleep(self.__getSecondsToBackOff(attempt))
+
+    def __isInCache(self, url: str) -> bool:
+        return self._pageCache is not None and self._pageCache.mode != PageCacheMode.Record and self._pageCache.get(url, self._rawPageFormat) is not None
+
+    # returns None if the page has to be loaded
+    def __loadPageFromCache(self, url: str) -> dict | None:
+        if self._pageCache is None or self._pageCache.mode == PageCacheMode.Record:
+            return None
+
+        payload = self._pageCache.get(url, self._rawPageFormat)
+        if payload is not None:
+            self._logger.info('Loading jobs from url = "%s" (cached)...', url)
+            return self._parsePage(url, self._decodeRawPage(payload))
+        if self.__isReplaying():
+            self._logger.warning('Url = "%s" is not in page cache, there is nothing to replay', url)
+            return { 'jobs': [], 'count': None, 'next': None }
+        return None
+
+    # block pages are never cached, they would be served again instead of the real page
+    def __storeInCache(self, url: str, pageNumber: int, rawPage: any, page: dict) -> None:
+        if self._pageCache is not None and self._isPageHealthy(pageNumber, page):
+            self._pageCache.put(url, self._encodeRawPage(rawPage), self._rawPageFormat)
+
+    # Paging logic shared by all ways of loading pages: yields urls of pages to load with their page numbers (a resumed crawl
+    # doesn't start at 0) and gets loaded pages sent back, returns loaded jobs when there are no more pages to load.
+    # Jobs that go to onJobs are not kept (nor returned).
+    def _crawl(self, searchParams: BaseSearchParams, onJobs: Callable[[list[JobInfo]], None] = None) -> Generator[tuple[str, int], dict, list[JobInfo]]:
+        results = []
+        jobsToRemember = []
+        loadedCount = 0
+        keptCount = 0
+        limit = 0
+        pageNumber = 0
+        gaveUp = False
+        url = self._getFirstPageUrl(searchParams)
+        searchKey = canonicalizeUrl(url)
+        self._shards = []
+
+        checkpoint = self.__resumeFromCheckpoint(searchKey)
+        if checkpoint:
+            pageNumber = checkpoint.pageNumber + 1
+            url = checkpoint.nextPageUrl
+            limit = checkpoint.limit
+            loadedCount = checkpoint.loadedCount
+            keptCount = len(checkpoint.jobs)
+            if self._crawlHistory is not None:
+                jobsToRemember.extend(checkpoint.jobs)
+            if onJobs is None:
+                results.extend(checkpoint.jobs)
+            elif checkpoint.jobs:
+                onJobs(checkpoint.jobs)
+
+        while True: # do-while imitation
+            page = yield url, pageNumber
+            self.__reportPageHealth(url, pageNumber, page)
+            if page.get('failed'):
+                self._logger.warning('Could not load page %d, search ends with the jobs loaded so far', pageNumber + 1)
+                self._pageLoadStats.searchesGivenUp += 1
+                gaveUp = True
+                break
+
+            if pageNumber == 0: # first page - get loading limit
+                limit = self._getJobCountLimit(page)
+                if not limit:
+                    break
+                if self.__shard(searchParams, page, limit):
+                    break
+                self._logger.info('Will attempt to load %d jobs', limit)
+
+            jobsOnPage = self._getJobsFromPage(url, page)
+            jobsToKeep = jobsOnPage[0:max(0, limit - loadedCount)] # nothing over the limit
+            loadedCount += len(jobsOnPage)
+            keptCount += len(jobsToKeep)
+            self._logger.info('Loaded %d out of %d jobs', loadedCount, limit)
+            if self._crawlHistory is not None:
+                jobsToRemember.extend(jobsToKeep)
+            if onJobs is None:
+                results.extend(jobsToKeep)
+            elif jobsToKeep:
+                onJobs(jobsToKeep)
+
+            nextPageUrl = self._getNextPageUrl(searchParams, pageNumber, page, jobsOnPage)
+            if not nextPageUrl:
+                break
+            elif self.__areAllJobsSeen(searchKey, jobsOnPage):
+                self._logger.info('All jobs on page were loaded on previous runs, won\'t be loading more, process finished')
+                break
+            elif loadedCount >= limit:
+                self._logger.info('Loaded equal to or more jobs (%d) than discovered limit (%d), won\'t be loading more, process finished', loadedCount, limit)
+                break
+            else:
+                if self._crawlJournal is not None:
+                    self._crawlJournal.recordPage(searchKey, pageNumber, nextPageUrl, limit, loadedCount, jobsToKeep)
+                url = nextPageUrl
+                pageNumber += 1
+
+        if self._crawlJournal is not None and not gaveUp:
+            self._crawlJournal.discard(searchKey) # finished, nothing to resume
+        self._logger.info('Loaded a total of %d jobs', keptCount)
+        if self._crawlHistory is not None and not gaveUp: # next run picks up the rest, it mustn't think the rest was seen
+            self._crawlHistory.remember(searchKey, jobsToRemember)
+        return results
+
+    # Returns True if the search is split into shards instead of being loaded. The first page that shows the search overflows
+    # is not used for any shard (shards have first pages of their own, and they find its jobs again), so splitting costs
+    # one page load more than loading the shards; that page is in the page cache like any other, for replays.
+    def __shard(self, searchParams: BaseSearchParams, page: dict, limit: int) -> bool:
+        totalCount = self._getTotalJobCount(page)
+        if not self._shardOverflowingSearches or totalCount is None or totalCount <= limit:
+            return False
+        shards = self.getShards(searchParams)
+        if not shards:
+            self._logger.info('Search found %d jobs, only %d of them can be loaded and there is nothing left to split it by', totalCount, limit)
+            return False
+        self._logger.info('Search found %d jobs, more than %d that can be loaded, splitting it into %d searches', totalCount, limit, len(shards))
+        self._shards = shards
+        return True
+
+    def __resumeFromCheckpoint(self, searchKey: str) -> CrawlCheckpoint | None:
+        if self._crawlJournal is None:
+            return None
+        checkpoint = self._crawlJournal.getCheckpoint(searchKey)
+        if checkpoint is None:
+            self._crawlJournal.discard(searchKey) # whatever is left there can't be resumed from
+            return None
+        self._logger.info('Resuming interrupted crawl from page %d, %d jobs were loaded before it was interrupted', checkpoint.pageNumber + 2, len(checkpoint.jobs))
+        return checkpoint
+
+    def __areAllJobsSeen(self, searchKey: str, jobs: list[JobInfo]) -> bool:
+        return self._crawlHistory is not None and len(jobs) > 0 and all(self._crawlHistory.isSeen(searchKey, job) for job in jobs)
+
+    @abc.abstractmethod
+    def _getFirstPageUrl(self, searchParams: BaseSearchParams) -> str:
         pass
+
+    # returns how many jobs to load, 0 if there's nothing to load
+    @abc.abstractmethod
+    def _getJobCountLimit(self, page: dict) -> int:
+        pass
+
+    @abc.abstractmethod
+    def _getJobsFromPage(self, url: str, page: dict) -> list[JobInfo]:
+        pass
+
+    # returns None if there are no more pages to load
+    @abc.abstractmethod
+    def _getNextPageUrl(self, searchParams: BaseSearchParams, pageNumber: int, page: dict, jobsOnPage: list[JobInfo]) -> str | None:
+        pass
+
+    # returns how many jobs the search found in total, regardless of loading limits, None if it's not known
+    def _getTotalJobCount(self, page: dict) -> int | None:
+        return None
+
+    # Returns the url of the page that will come after the given one, if it can be told before the crawl asks for it.
+    # Called once before the page is parsed (page is None) and, if that gave nothing, once more after.
+    def _predictNextPageUrl(self, searchParams: BaseSearchParams, pageNumber: int, page: dict | None) -> str | None:
+        return None
+
+    # Loading a page is split in two so that the next page can be fetched while the current one is parsed:
+    # _fetchPage does the network part and returns whatever _parsePage needs to turn it into a page dictionary.
+    # Browsers can't hand out a page without the browser, so for them the raw page is the extracted page itself.
+    def _fetchPage(self, url: str) -> any:
+        self._threadSafeGet(url)
+        return self._threadSafeExtractPage(self._pageExtractionScript)
+
+    def _parsePage(self, url: str, rawPage: any) -> dict:
+        return rawPage
+
+    # returns text of the job description on the job's page, None if there's none
+    def _fetchJobDescription(self, jobLink: str) -> str | None:
+        self._threadSafeGet(jobLink)
+        return self._threadSafeExecuteScript(self._jobDescriptionScript)
+
+    # raw pages go to page cache as json
+    def _encodeRawPage(self, rawPage: any) -> any:
+        return rawPage
+
+    def _decodeRawPage(self, payload: any) -> any:
+        return payload
+
+    # Browsers prefetch in a background tab: window.open doesn't wait for the page to load and doesn't switch
+    # the driver to the new tab, so the current page can still be processed meanwhile.
+    def _startPrefetch(self, url: str) -> None:
+        tabsBefore = set(self._driver.window_handles)
+        self._driver.execute_script('window.open(arguments[0], "_blank");', url)
+        newTabs = [ tab for tab in self._driver.window_handles if tab not in tabsBefore ]
+        self.__prefetchTab = newTabs[0] if newTabs else None
+        if not self.__prefetchTab:
+            self._logger.warning('Could not open a tab to prefetch url = "%s", will load it normally', url)
+
+    def _takePrefetchedPage(self, url: str) -> any:
+        prefetchTab, self.__prefetchTab = self.__prefetchTab, None
+        if not prefetchTab:
+            return self._fetchPage(url)
+
+        from selenium.webdriver.support.wait import WebDriverWait
+        self._driver.close() # this page is extracted already, the prefetch tab takes its place
+        self._driver.switch_to.window(prefetchTab)
+        # 'interactive' is as far as eager page loading waits for, see LEAN_BROWSER
+        WebDriverWait(self._driver, PAGE_LOAD_TIMEOUT_SECONDS).until(lambda driver: driver.execute_script('return document.readyState') != 'loading')
+        return self._threadSafeExtractPage(self._pageExtractionScript)
+
+    def _discardPrefetchedPage(self) -> None:
+        prefetchTab, self.__prefetchTab = self.__prefetchTab, None
+        if prefetchTab:
+            currentTab = self._driver.current_window_handle
+            self._driver.switch_to.window(prefetchTab)
+            self._driver.close()
+            self._driver.switch_to.window(currentTab)
     
-    def _sleep(self, shouldSleep: bool) -> None:
+    # Block pages, error statuses and pages that unexpectedly come back empty make the rate limiter back off,
+    # anything else lets it speed up. An empty last page or a search that found nothing is not a reason to slow down.
+    def _isPageHealthy(self, pageNumber: int, page: dict) -> bool:
+        if page.get('blocked') or page.get('failed'):
+            return False
+        if page['jobs']:
+            return True
+        return page['count'] is not None if pageNumber == 0 else not page['next']
+
+    def __reportPageHealth(self, url: str, pageNumber: int, page: dict) -> None:
+        rateLimiter = self._rateLimiters.forUrl(url)
+        if self._isPageHealthy(pageNumber, page):
+            rateLimiter.reportSuccess()
+        else:
+            rateLimiter.reportThrottled()
+
+    def __getSecondsToSleep(self, url: str) -> float:
+        secondsToSleep = self._rateLimiters.forUrl(url).reserve()
+        if secondsToSleep > 0:
+            self._logger.info('Sleeping for %.1f seconds...', secondsToSleep)
+        return secondsToSleep
+
+    def _sleep(self, url: str, shouldSleep: bool) -> None:
         if shouldSleep:
-            secondsToSleep = randrange(MIN_SECONDS_TO_SLEEP, MAX_SECONDS_TO_SLEEP)
-            self._logger.info('Sleeping for %d seconds...', secondsToSleep)
-            time.sleep(secondsToSleep)
+            time.sleep(self.__getSecondsToSleep(url))
+
+    async def _sleepAsync(self, url: str, shouldSleep: bool) -> None:
+        if shouldSleep:
+            await asyncio.sleep(self.__getSecondsToSleep(url))
 
     def _threadSafeGet(self, url: str | None) -> None:
-        with self._lock:
-                self._switchToProperTab()
-                self._driver.get(url)
+        self._driver.get(url)
 
     def _threadSafeExecuteScript(self, script: any) -> any:
-        with self._lock:
-                self._switchToProperTab()
-                return self._driver.execute_script(script)
\ No newline at end of file
+        return self._driver.execute_script(script)
+
+    # one round trip to the browser no matter how many job cards there are on the page
+    def _threadSafeExtractPage(self, script: str) -> dict:
+        page = self._threadSafeExecuteScript(script)
+        if not isinstance(page, dict):
+            page = {}
+        return { 'jobs': page.get('jobs') or [], 'count': page.get('count'), 'next': page.get('next') }
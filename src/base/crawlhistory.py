@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from logging import getLogger, Logger
+from typing import Callable
+
+from ..constants import CRAWL_HISTORY_RETENTION_DAYS
+from ..jobinfo import JobInfo
+from ..utility import getSimpleModuleName
+
+# Remembers, per search, which jobs previous runs have loaded: their links and the newest posting date among them.
+# A job counts as seen if its link was loaded before or it was posted before the newest job of previous runs.
+# Jobs that don't tell when they were posted are only seen by their links, and don't move the newest date.
+# Searches are told apart by their keys (BaseJobLoader.getSearchKey). Links not loaded again for retentionDays are forgotten.
+class CrawlHistory:
+    __filePath: str
+    __retentionSeconds: float
+    __clock: Callable[[], float]
+    __searches: dict[str, dict] # search key -> { 'links': { link: last seen timestamp }, 'newestDatePosted': iso date or None }
+    __lock: threading.Lock
+    __logger: Logger
+
+    def __init__(self, filePath: str, retentionDays: float = CRAWL_HISTORY_RETENTION_DAYS, clock: Callable[[], float] = time.time):
+        self.__filePath = filePath
+        self.__retentionSeconds = retentionDays * 24 * 60 * 60
+        self.__clock = clock
+        self.__lock = threading.Lock()
+        self.__logger = getLogger(getSimpleModuleName(__name__))
+        self.__searches = self.__load()
+
+    def __load(self) -> dict[str, dict]:
+        try:
+            with open(self.__filePath, encoding='utf-8') as f:
+                searches = json.load(f)
+            return searches if isinstance(searches, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError):
+            self.__logger.warning('Crawl history at "%s" is damaged, all jobs will be considered new', self.__filePath)
+            return {}
+
+    def __save(self) -> None:
+        temporaryFilePath = self.__filePath + '.tmp'
+        with open(temporaryFilePath, 'w', encoding='utf-8') as f:
+            json.dump(self.__searches, f)
+        os.replace(temporaryFilePath, self.__filePath)
+
+    def isSeen(self, searchKey: str, job: JobInfo) -> bool:
+        with self.__lock:
+            search = self.__searches.get(searchKey)
+            if not search:
+                return False
+            if job.jobLink in search['links']:
+                return True
+            newestDatePosted = search.get('newestDatePosted')
+            return bool(newestDatePosted) and job.datePosted is not None and job.datePosted < datetime.fromisoformat(newestDatePosted)
+
+    def remember(self, searchKey: str, jobs: list[JobInfo]) -> None:
+        with self.__lock:
+            now = self.__clock()
+            search = self.__searches.setdefault(searchKey, { 'links': {}, 'newestDatePosted': None })
+            search['links'] = { link: seenAt for link, seenAt in search['links'].items() if now - seenAt <= self.__retentionSeconds }
+            for job in jobs:
+                search['links'][job.jobLink] = now
+
+            datesPosted = [ job.datePosted.isoformat() for job in jobs if job.datePosted is not None ]
+            if search['newestDatePosted']:
+                datesPosted.append(search['newestDatePosted'])
+            search['newestDatePosted'] = max(datesPosted, key = datetime.fromisoformat) if datesPosted else None
+            self.__save()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+
+import hashlib
+import json
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from logging import getLogger, Logger
+from typing import Callable
+
+from ..constants import CRAWL_JOURNAL_MAX_AGE_SECONDS
+from ..jobinfo import JobInfo
+from ..utility import getSimpleModuleName
+
+# Where an interrupted crawl of one search stopped: the last page it finished, what it had to load next
+# and every job it had loaded up to that point.
+class CrawlCheckpoint:
+    pageNumber: int
+    nextPageUrl: str
+    limit: int
+    loadedCount: int
+    jobs: list[JobInfo]
+
+    def __init__(self, pageNumber: int, nextPageUrl: str, limit: int, loadedCount: int, jobs: list[JobInfo]):
+        self.pageNumber = pageNumber
+        self.nextPageUrl = nextPageUrl
+        self.limit = limit
+        self.loadedCount = loadedCount
+        self.jobs = jobs
+
+    def __repr__(self):
+        return str({ 'pageNumber': self.pageNumber, 'nextPageUrl': self.nextPageUrl, 'limit': self.limit, 'loadedCount': self.loadedCount })
+
+
+# Page level journal of crawls in progress, one json lines file per search, one line per finished page.
+# A search's journal is deleted when its crawl finishes, so a journal that is still there belongs to a crawl
+# that was interrupted and the next crawl of the same search picks up where it stopped. Journals older than maxAgeSeconds are ignored.
+class CrawlJournal:
+    __folderPath: str
+    __maxAgeSeconds: float
+    __clock: Callable[[], float]
+    __logger: Logger
+
+    def __init__(self, folderPath: str, maxAgeSeconds: float = CRAWL_JOURNAL_MAX_AGE_SECONDS, clock: Callable[[], float] = time.time):
+        self.__folderPath = folderPath
+        self.__maxAgeSeconds = maxAgeSeconds
+        self.__clock = clock
+        self.__logger = getLogger(getSimpleModuleName(__name__))
+
+    def __getFilePath(self, searchKey: str) -> str:
+        return os.path.join(self.__folderPath, hashlib.sha256(searchKey.encode('utf-8')).hexdigest() + '.jsonl')
+
+    @staticmethod
+    def __jobToDict(job: JobInfo) -> dict:
+        return { 'title': job.title, 'company': job.company, 'jobLink': job.jobLink, 'location': job.location, 'salary': job.salary,
+                 'datePosted': job.datePosted.isoformat() if job.datePosted else None }
+
+    @staticmethod
+    def __jobFromDict(d: dict) -> JobInfo:
+        return JobInfo(d['title'], d['company'], d['jobLink'], d['location'], d['salary'],
+                       datetime.fromisoformat(d['datePosted']) if d['datePosted'] else None)
+
+    # returns None if there's nothing to resume
+    def getCheckpoint(self, searchKey: str) -> CrawlCheckpoint | None:
+        entries = []
+        try:
+            with open(self.__getFilePath(searchKey), encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entries.append(json.loads(line))
+                    except ValueError:
+                        break # line that was being written when the crawl died, everything after it is lost anyway
+        except FileNotFoundError:
+            return None
+
+        entries = [ entry for entry in entries if entry.get('searchKey') == searchKey ]
+        if not entries:
+            return None
+        lastEntry = entries[-1]
+        if self.__clock() - lastEntry['recordedAt'] > self.__maxAgeSeconds:
+            self.__logger.info('Journal of interrupted crawl "%s" is too old to resume from, discarding it', searchKey)
+            self.discard(searchKey)
+            return None
+        jobs = [ self.__jobFromDict(job) for entry in entries for job in entry['jobs'] ]
+        return CrawlCheckpoint(lastEntry['pageNumber'], lastEntry['nextPageUrl'], lastEntry['limit'], lastEntry['loadedCount'], jobs)
+
+    def recordPage(self, searchKey: str, pageNumber: int, nextPageUrl: str, limit: int, loadedCount: int, jobs: list[JobInfo]) -> None:
+        Path(self.__folderPath).mkdir(parents=True, exist_ok=True)
+        entry = { 'searchKey': searchKey, 'recordedAt': self.__clock(), 'pageNumber': pageNumber, 'nextPageUrl': nextPageUrl, 'limit': limit, 'loadedCount': loadedCount,
+                  'jobs': [ self.__jobToDict(job) for job in jobs ] }
+        with open(self.__getFilePath(searchKey), 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + '\n')
+
+    def discard(self, searchKey: str) -> None:
+        Path(self.__getFilePath(searchKey)).unlink(missing_ok = True)
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+
+import asyncio
+import queue
+import threading
+from contextlib import contextmanager
+from logging import getLogger, Logger
+from typing import Callable, Iterator, TYPE_CHECKING
+
+from ..utility import getSimpleModuleName
+
+if TYPE_CHECKING:
+    from selenium.webdriver.chrome.webdriver import WebDriver
+
+# Hands out browser instances to job loaders. Each lease gives the loader exclusive use of a driver,
+# so loaders running in different threads never have to share a browser (or switch its tabs) under a lock.
+# Drivers are started lazily, one at a time, up to the pool size; when all of them are leased, callers wait.
+class DriverPool:
+    __driverFactory: Callable[[], 'WebDriver']
+    __size: int
+    __idleDrivers: queue.Queue
+    __startedDrivers: list['WebDriver']
+    __lock: threading.Lock
+    __leaseSemaphore: tuple[asyncio.AbstractEventLoop, asyncio.Semaphore] | None
+    __logger: Logger
+
+    def __init__(self, driverFactory: Callable[[], 'WebDriver'], size: int = 1):
+        if size < 1:
+            raise ValueError('Driver pool size must be at least 1.')
+        self.__driverFactory = driverFactory
+        self.__size = size
+        self.__idleDrivers = queue.Queue()
+        self.__startedDrivers = []
+        self.__lock = threading.Lock()
+        self.__leaseSemaphore = None
+        self.__logger = getLogger(getSimpleModuleName(__name__))
+
+    @property
+    def size(self) -> int:
+        return self.__size
+
+    def __acquire(self) -> 'WebDriver':
+        try:
+            return self.__idleDrivers.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self.__lock: # drivers are started one at a time, undetected_chromedriver does not like parallel patching
+            if len(self.__startedDrivers) < self.__size:
+                driver = self.__driverFactory()
+                self.__startedDrivers.append(driver)
+                self.__logger.info('Started browser %d out of %d', len(self.__startedDrivers), self.__size)
+                return driver
+
+        return self.__idleDrivers.get() # pool is exhausted, wait for another loader to give its driver back
+
+    # A lease waits for a free driver in whatever thread takes it, so async callers that lease in worker threads acquire this
+    # on the event loop first: otherwise callers waiting for drivers could take up all worker threads and leave none to
+    # those that have drivers. It is shared by everyone on the running event loop (searches and job detail loads alike).
+    def getLeaseSemaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self.__leaseSemaphore is None or self.__leaseSemaphore[0] is not loop:
+            self.__leaseSemaphore = (loop, asyncio.Semaphore(self.__size))
+        return self.__leaseSemaphore[1]
+
+    @contextmanager
+    def lease(self) -> Iterator['WebDriver']:
+        driver = self.__acquire()
+        try:
+            yield driver
+        finally:
+            self.__idleDrivers.put(driver)
+
+    # Drops idle drivers whose browsers stopped responding (crashed, or were closed), new ones are started on demand instead.
+    # Meant for long running processes, between crawls.
+    def discardDeadDrivers(self) -> None:
+        with self.__lock:
+            idleDrivers = []
+            while not self.__idleDrivers.empty():
+                idleDrivers.append(self.__idleDrivers.get_nowait())
+            for driver in idleDrivers:
+                try:
+                    driver.current_window_handle # any round trip to the browser will do
+                    self.__idleDrivers.put(driver)
+                except Exception:
+                    self.__logger.warning('Browser stopped responding, will start a new one when needed')
+                    self.__startedDrivers.remove(driver)
+                    try:
+                        driver.quit()
+                    except Exception:
+                        pass # it's dead anyway
+
+    def quit(self) -> None:
+        with self.__lock:
+            for driver in self.__startedDrivers:
+                try:
+                    driver.quit()
+                except Exception:
+                    self.__logger.exception('Exception on stopping browser')
+            self.__startedDrivers.clear()
+            self.__idleDrivers = queue.Queue()
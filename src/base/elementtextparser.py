@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+
+from html.parser import HTMLParser
+
+# Pulls the text of the first element with the given id or class out of an html page, the way a browser's
+# querySelector(...).textContent would, with whitespace collapsed. Used where pages are loaded without a browser.
+class ElementTextParser(HTMLParser):
+    __voidElements: frozenset = frozenset([ 'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'track', 'wbr' ])
+    __blockElements: frozenset = frozenset([ 'p', 'div', 'li', 'ul', 'ol', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'tr', 'td', 'th', 'section', 'article', 'blockquote', 'pre' ])
+    __elementId: str | None
+    __elementClass: str | None
+    __openTags: list[str]
+    __capturedDepth: int | None
+    __capturedText: list[str] | None
+
+    def __init__(self, elementId: str = None, elementClass: str = None):
+        super().__init__(convert_charrefs = True)
+        self.__elementId = elementId
+        self.__elementClass = elementClass
+        self.__openTags = []
+        self.__capturedDepth = None
+        self.__capturedText = None
+
+    # returns None if there is no such element
+    @staticmethod
+    def getElementText(html: str, elementId: str = None, elementClass: str = None) -> str | None:
+        parser = ElementTextParser(elementId, elementClass)
+        parser.feed(html)
+        parser.close()
+        return ' '.join(''.join(parser.__capturedText).split()) if parser.__capturedText is not None else None
+
+    def __isWanted(self, attributes: dict) -> bool:
+        if self.__elementId is not None and attributes.get('id') == self.__elementId:
+            return True
+        return self.__elementClass is not None and self.__elementClass in (attributes.get('class') or '').split()
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if self.__capturedText is None and self.__isWanted(dict(attrs)): # first matching element wins
+            self.__capturedDepth = len(self.__openTags)
+            self.__capturedText = []
+        if tag not in self.__voidElements:
+            self.__openTags.append(tag)
+        elif self.__capturedDepth is not None and tag == 'br':
+            self.__capturedText.append(' ')
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag not in self.__openTags:
+            return # stray end tag, ignore it like browsers do
+        while self.__openTags:
+            openTag = self.__openTags.pop()
+            if len(self.__openTags) == self.__capturedDepth:
+                self.__capturedDepth = None
+            elif self.__capturedDepth is not None and openTag in self.__blockElements:
+                self.__capturedText.append(' ') # paragraphs and list items shouldn't glue words together
+            if openTag == tag:
+                break
+
+    def handle_data(self, data: str) -> None:
+        if self.__capturedDepth is not None:
+            self.__capturedText.append(data)
@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+
+import asyncio
+import urllib.parse
+
+from ..constants import MAX_CONCURRENT_PAGE_LOADS_PER_HOST
+
+# Limits how many pages can be loaded from the same host at the same time, no matter how many searches are running against it.
+class HostSemaphores:
+    __limitPerHost: int
+    __semaphores: dict[str, asyncio.Semaphore]
+
+    def __init__(self, limitPerHost: int = MAX_CONCURRENT_PAGE_LOADS_PER_HOST):
+        if limitPerHost < 1:
+            raise ValueError('Concurrent page load limit must be at least 1.')
+        self.__limitPerHost = limitPerHost
+        self.__semaphores = {}
+
+    def forUrl(self, url: str) -> asyncio.Semaphore:
+        host = urllib.parse.urlsplit(url).netloc.lower()
+        if host not in self.__semaphores:
+            self.__semaphores[host] = asyncio.Semaphore(self.__limitPerHost)
+        return self.__semaphores[host]
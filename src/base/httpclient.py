@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+
+import gzip
+import http.client
+import threading
+import urllib.parse
+import zlib
+from logging import getLogger, Logger
+
+from ..constants import HTTP_TIMEOUT_SECONDS, HTTP_MAX_IDLE_CONNECTIONS_PER_HOST, HTTP_USER_AGENT
+from ..utility import getSimpleModuleName
+
+class HttpResponse:
+    url: str
+    status: int
+    headers: dict
+    body: str
+
+    def __init__(self, url: str, status: int, headers: dict, body: str):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 300
+
+    def toDict(self) -> dict:
+        return { 'url': self.url, 'status': self.status, 'headers': self.headers, 'body': self.body }
+
+    @staticmethod
+    def fromDict(d: dict) -> 'HttpResponse':
+        return HttpResponse(d['url'], d['status'], d['headers'], d['body'])
+
+    def __repr__(self):
+        return str({ 'url': self.url, 'status': self.status })
+
+# Minimal thread safe HTTP client that keeps connections alive and reuses them between requests to the same host.
+# Each request takes an idle connection for its host (or opens a new one) and gives it back when the response is read.
+class HttpClient:
+    __timeout: float
+    __maxIdleConnectionsPerHost: int
+    __defaultHeaders: dict
+    __idleConnections: dict[tuple[str, str], list[http.client.HTTPConnection]]
+    __lock: threading.Lock
+    __logger: Logger
+
+    def __init__(self, timeout: float = HTTP_TIMEOUT_SECONDS, maxIdleConnectionsPerHost: int = HTTP_MAX_IDLE_CONNECTIONS_PER_HOST, headers: dict = None):
+        self.__timeout = timeout
+        self.__maxIdleConnectionsPerHost = maxIdleConnectionsPerHost
+        self.__defaultHeaders = {
+            'User-Agent': HTTP_USER_AGENT,
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.9',
+            'Accept-Encoding': 'gzip, deflate',
+            'Connection': 'keep-alive',
+            **(headers or {})
+        }
+        self.__idleConnections = {}
+        self.__lock = threading.Lock()
+        self.__logger = getLogger(getSimpleModuleName(__name__))
+
+    def __takeConnection(self, hostKey: tuple[str, str]) -> tuple[http.client.HTTPConnection, bool]:
+        with self.__lock:
+            connections = self.__idleConnections.get(hostKey)
+            if connections:
+                return (connections.pop(), True)
+
+        scheme, netloc = hostKey
+        connectionClass = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+        return (connectionClass(netloc, timeout = self.__timeout), False)
+
+    def __giveConnectionBack(self, hostKey: tuple[str, str], connection: http.client.HTTPConnection) -> None:
+        with self.__lock:
+            connections = self.__idleConnections.setdefault(hostKey, [])
+            if len(connections) < self.__maxIdleConnectionsPerHost:
+                connections.append(connection)
+                return
+        connection.close()
+
+    @staticmethod
+    def __decodeBody(response: http.client.HTTPResponse, body: bytes) -> str:
+        encoding = (response.getheader('Content-Encoding') or '').lower()
+        if encoding == 'gzip':
+            body = gzip.decompress(body)
+        elif encoding == 'deflate':
+            body = zlib.decompress(body)
+        return body.decode(response.headers.get_content_charset() or 'utf-8', errors = 'replace')
+
+    def get(self, url: str, headers: dict = None) -> HttpResponse:
+        urlParts = urllib.parse.urlsplit(url)
+        hostKey = (urlParts.scheme, urlParts.netloc)
+        path = urllib.parse.urlunsplit(('', '', urlParts.path or '/', urlParts.query, ''))
+        requestHeaders = { **self.__defaultHeaders, **(headers or {}) }
+
+        while True:
+            connection, isReused = self.__takeConnection(hostKey)
+            try:
+                connection.request('GET', path, headers = requestHeaders)
+                response = connection.getresponse()
+                body = response.read()
+            except (http.client.RemoteDisconnected, http.client.BadStatusLine, ConnectionResetError, BrokenPipeError):
+                connection.close()
+                if isReused: # server dropped a kept alive connection while it was idle, that's normal, try again with a new one
+                    self.__logger.debug('Kept alive connection to "%s" was closed by server, reconnecting', urlParts.netloc)
+                    continue
+                raise
+            except Exception:
+                connection.close()
+                raise
+
+            if response.will_close:
+                connection.close()
+            else:
+                self.__giveConnectionBack(hostKey, connection)
+
+            return HttpResponse(url, response.status, dict(response.getheaders()), self.__decodeBody(response, body))
+
+    def close(self) -> None:
+        with self.__lock:
+            for connections in self.__idleConnections.values():
+                for connection in connections:
+                    connection.close()
+            self.__idleConnections.clear()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+
+import gzip
+import hashlib
+import os
+import threading
+from pathlib import Path
+from logging import getLogger, Logger
+
+from ..utility import getSimpleModuleName
+
+# Content addressed on-disk cache of job descriptions. Every description is stored once, gzipped, under the sha256 of its text,
+# and every job id points at the description it had. Postings are never loaded twice, and reposts of the same job
+# (new id, same text) take no extra space. Descriptions don't expire: a posting that changed is a new posting.
+class JobDetailCache:
+    __folderPath: str
+    __logger: Logger
+
+    def __init__(self, folderPath: str):
+        self.__folderPath = folderPath
+        self.__logger = getLogger(getSimpleModuleName(__name__))
+
+    def __getJobFilePath(self, jobId: str) -> str:
+        return os.path.join(self.__folderPath, 'jobs', hashlib.sha256(jobId.encode('utf-8')).hexdigest())
+
+    def __getContentFilePath(self, contentHash: str) -> str:
+        return os.path.join(self.__folderPath, 'content', contentHash + '.txt.gz')
+
+    @staticmethod
+    def __replace(filePath: str, write) -> None:
+        Path(filePath).parent.mkdir(parents=True, exist_ok=True)
+        temporaryFilePath = '%s.%d.%d.tmp' % (filePath, os.getpid(), threading.get_ident()) # workers in other processes share the folder
+        write(temporaryFilePath)
+        os.replace(temporaryFilePath, filePath) # readers never see a half written file
+
+    # returns None if the job's description is not cached
+    def get(self, jobId: str) -> str | None:
+        try:
+            with open(self.__getJobFilePath(jobId), encoding='utf-8') as f:
+                contentHash = f.read().strip()
+            with gzip.open(self.__getContentFilePath(contentHash), 'rt', encoding='utf-8') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError, ValueError):
+            self.__logger.warning('Job detail cache entry for job "%s" is damaged, ignoring it', jobId)
+            return None
+
+    def put(self, jobId: str, description: str) -> None:
+        contentHash = hashlib.sha256(description.encode('utf-8')).hexdigest()
+        contentFilePath = self.__getContentFilePath(contentHash)
+        if not os.path.exists(contentFilePath):
+            def writeContent(filePath: str) -> None:
+                with gzip.open(filePath, 'wt', encoding='utf-8') as f:
+                    f.write(description)
+            self.__replace(contentFilePath, writeContent)
+
+        def writeJob(filePath: str) -> None:
+            with open(filePath, 'w', encoding='utf-8') as f:
+                f.write(contentHash)
+        self.__replace(self.__getJobFilePath(jobId), writeJob)
@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+
+from typing import TYPE_CHECKING
+
+from ..constants import LEAN_BROWSER_BLOCKED_URL_PATTERNS
+
+if TYPE_CHECKING:
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chrome.webdriver import WebDriver
+
+# Job loaders only read the DOM and json inlined in it, so everything else pages pull in (images, fonts, stylesheets,
+# analytics) is wasted time and bandwidth. A lean browser doesn't load any of that and hands the page over as soon as
+# its DOM is parsed instead of waiting for every last resource.
+
+def makeBrowserOptionsLean(options: 'Options') -> None:
+    options.page_load_strategy = 'eager' # driver.get returns on DOMContentLoaded
+    options.add_experimental_option('prefs', { 'profile.managed_default_content_settings.images': 2 })
+
+# must be called on every started browser, blocked urls are set through the DevTools protocol, not options
+def blockUnneededResources(driver: 'WebDriver') -> None:
+    driver.execute_cdp_cmd('Network.enable', {})
+    driver.execute_cdp_cmd('Network.setBlockedURLs', { 'urls': LEAN_BROWSER_BLOCKED_URL_PATTERNS })
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from enum import Enum
+from pathlib import Path
+from logging import getLogger, Logger
+from typing import Callable
+
+from ..constants import PAGE_CACHE_TTL_SECONDS, PAGE_CACHE_MAX_SIZE_BYTES
+from ..utility import getSimpleModuleName
+
+class PageCacheMode(Enum):
+    ReadThrough = 'readthrough' # serve fresh pages from cache, load and store the rest
+    Record = 'record' # always load pages and store them, e.g. to refresh a cache for replaying
+    Replay = 'replay' # serve pages from cache only, regardless of age, never touch a browser or the network
+
+
+# Url keyed on-disk cache for loaded pages, one gzipped json file per url. Entries older than ttlSeconds are not served
+# (except in Replay mode, so replays stay reproducible), and the oldest entries are evicted once the cache grows over maxSizeBytes.
+# Every entry says what format its payload is in: loaders that store pages differently (a browser's extracted page, an http response)
+# can load the same urls, and an entry in the wrong format is a miss.
+class PageCache:
+    __evictToShare: float = 0.9 # eviction makes some room, so that every write after it doesn't have to evict again
+    __folderPath: str
+    __mode: PageCacheMode
+    __ttlSeconds: float
+    __maxSizeBytes: int
+    __sizeBytes: int | None # size of the cache folder as far as this instance knows, None until it's needed
+    __clock: Callable[[], float]
+    __lock: threading.Lock
+    __logger: Logger
+
+    def __init__(self, folderPath: str, mode: PageCacheMode = PageCacheMode.ReadThrough, ttlSeconds: float = PAGE_CACHE_TTL_SECONDS,
+                 maxSizeBytes: int = PAGE_CACHE_MAX_SIZE_BYTES, clock: Callable[[], float] = time.time):
+        self.__folderPath = folderPath
+        self.__mode = mode
+        self.__ttlSeconds = ttlSeconds
+        self.__maxSizeBytes = maxSizeBytes
+        self.__sizeBytes = None
+        self.__clock = clock
+        self.__lock = threading.Lock()
+        self.__logger = getLogger(getSimpleModuleName(__name__))
+
+    @property
+    def mode(self) -> PageCacheMode:
+        return self.__mode
+
+    def __getFilePath(self, url: str) -> str:
+        return os.path.join(self.__folderPath, hashlib.sha256(url.encode('utf-8')).hexdigest() + '.json.gz')
+
+    # returns stored payload or None if the url is not cached, its entry has expired or its payload is in another format
+    def get(self, url: str, payloadFormat: str = None) -> any:
+        filePath = self.__getFilePath(url)
+        try:
+            with gzip.open(filePath, 'rt', encoding='utf-8') as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError, ValueError):
+            self.__logger.warning('Page cache entry for url = "%s" is damaged, ignoring it', url)
+            return None
+
+        if entry.get('url') != url or entry.get('format') != payloadFormat:
+            return None
+        if self.__mode != PageCacheMode.Replay and self.__clock() - entry['storedAt'] > self.__ttlSeconds:
+            return None
+        return entry['payload']
+
+    # payload must be json serializable
+    def put(self, url: str, payload: any, payloadFormat: str = None) -> None:
+        Path(self.__folderPath).mkdir(parents=True, exist_ok=True)
+        filePath = self.__getFilePath(url)
+        temporaryFilePath = '%s.%d.%d.tmp' % (filePath, os.getpid(), threading.get_ident()) # workers in other processes share the folder
+        with gzip.open(temporaryFilePath, 'wt', encoding='utf-8') as f:
+            json.dump({ 'url': url, 'storedAt': self.__clock(), 'format': payloadFormat, 'payload': payload }, f)
+        with self.__lock:
+            sizeBytes = os.path.getsize(temporaryFilePath)
+            try:
+                sizeBytes -= os.path.getsize(filePath) # replaced entry
+            except OSError:
+                pass
+            os.replace(temporaryFilePath, filePath) # readers never see a half written entry
+            if self.__sizeBytes is not None:
+                self.__sizeBytes += sizeBytes
+            else:
+                self.__sizeBytes = sum(path.stat().st_size for path in Path(self.__folderPath).glob('*.json.gz'))
+            if self.__sizeBytes > self.__maxSizeBytes:
+                self.__evictOldEntries()
+
+    # The folder is only looked through when the cache has grown too big, and then its size is counted anew
+    # (other processes may be writing to it too).
+    def __evictOldEntries(self) -> None:
+        files = [ (path, path.stat()) for path in Path(self.__folderPath).glob('*.json.gz') ]
+        self.__sizeBytes = sum(stat.st_size for path, stat in files)
+        files.sort(key = lambda file: file[1].st_mtime) # oldest first
+        for path, stat in files:
+            if self.__sizeBytes <= self.__maxSizeBytes * self.__evictToShare:
+                break
+            path.unlink(missing_ok = True)
+            self.__sizeBytes -= stat.st_size
+            self.__logger.debug('Evicted page cache entry "%s"', path.name)
+
+    def clear(self) -> None:
+        with self.__lock:
+            for path in Path(self.__folderPath).glob('*.json.gz'):
+                path.unlink(missing_ok = True)
+            self.__sizeBytes = 0
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+
+from enum import Enum
+
+class PageFailure(Enum):
+    Timeout = 'timeout'
+    EmptyPage = 'empty page' # page that should have had jobs but came back without them
+    BlockPage = 'block page' # captcha, error status and the like
+    Error = 'error' # any other exception
+
+
+# Counts page load attempts and failures of one loader (or, combined, of a whole crawl).
+class PageLoadStats:
+    attempts: int
+    failures: dict[PageFailure, int]
+    searchesGivenUp: int
+
+    def __init__(self):
+        self.attempts = 0
+        self.failures = { failure: 0 for failure in PageFailure }
+        self.searchesGivenUp = 0
+
+    @staticmethod
+    def combine(stats: list['PageLoadStats']) -> 'PageLoadStats':
+        combined = PageLoadStats()
+        for s in stats:
+            combined.attempts += s.attempts
+            combined.searchesGivenUp += s.searchesGivenUp
+            for failure, count in s.failures.items():
+                combined.failures[failure] += count
+        return combined
+
+    @property
+    def failureCount(self) -> int:
+        return sum(self.failures.values())
+
+    def __str__(self):
+        failures = ', '.join('%s: %d' % (failure.value, count) for failure, count in self.failures.items())
+        return ('%d page load attempts, %d failed (%s), %d searches gave up and returned partial results' %
+                (self.attempts, self.failureCount, failures, self.searchesGivenUp))
+
+    def __repr__(self):
+        return str(self)
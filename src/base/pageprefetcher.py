@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable
+
+# Fetches one page in the background for loaders that don't have a browser tab to do it in.
+# Only one page can be in flight: starting a new prefetch discards the previous one.
+class PagePrefetcher:
+    __executor: ThreadPoolExecutor | None
+    __url: str | None
+    __future: Future | None
+
+    def __init__(self):
+        self.__executor = None
+        self.__url = None
+        self.__future = None
+
+    def start(self, url: str, fetchPage: Callable[[str], any]) -> None:
+        self.discard()
+        self.__executor = ThreadPoolExecutor(max_workers = 1, thread_name_prefix = 'prefetch')
+        self.__url = url
+        self.__future = self.__executor.submit(fetchPage, url)
+
+    # returns the fetched page, or raises whatever fetching it raised
+    def take(self, url: str, fetchPage: Callable[[str], any]) -> any:
+        future = self.__future if self.__url == url else None
+        self.discard(waitForPage = future is not None)
+        return future.result() if future else fetchPage(url)
+
+    def discard(self, waitForPage: bool = False) -> None:
+        if self.__executor:
+            self.__executor.shutdown(wait = waitForPage)
+        self.__executor = None
+        self.__url = None
+        self.__future = None
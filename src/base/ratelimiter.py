@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+
+import threading
+import time
+import urllib.parse
+from random import uniform
+from logging import getLogger, Logger
+from typing import Callable
+
+from ..constants import RATE_LIMITS, DEFAULT_RATE_LIMIT, RATE_LIMIT_SPEEDUP_FACTOR, RATE_LIMIT_BACKOFF_FACTOR, RATE_LIMIT_JITTER
+from ..utility import getSimpleModuleName
+
+# Token bucket that spaces out requests to one host. Every request reserves a token and waits for as long as the
+# bucket is in debt, so everybody sharing the limiter shares the same budget. The refill interval adapts to the site:
+# it shrinks towards minSeconds while pages come back fine and doubles towards maxSeconds every time we get throttled.
+class HostRateLimiter:
+    __host: str
+    __minSeconds: float
+    __maxSeconds: float
+    __burst: int
+    __secondsPerToken: float
+    __tokens: float
+    __lastRefillTime: float
+    __clock: Callable[[], float]
+    __lock: threading.Lock
+    __logger: Logger
+
+    def __init__(self, host: str, rateLimit: dict, clock: Callable[[], float] = time.monotonic):
+        self.__host = host
+        self.__minSeconds = rateLimit['minSeconds']
+        self.__maxSeconds = rateLimit['maxSeconds']
+        self.__burst = rateLimit['burst']
+        self.__secondsPerToken = rateLimit['initialSeconds']
+        self.__tokens = self.__burst
+        self.__clock = clock
+        self.__lastRefillTime = clock()
+        self.__lock = threading.Lock()
+        self.__logger = getLogger(getSimpleModuleName(__name__))
+
+    @property
+    def secondsPerToken(self) -> float:
+        return self.__secondsPerToken
+
+    # returns how many seconds the caller has to wait before making its request
+    def reserve(self) -> float:
+        with self.__lock:
+            now = self.__clock()
+            self.__tokens = min(self.__burst, self.__tokens + (now - self.__lastRefillTime) / self.__secondsPerToken)
+            self.__lastRefillTime = now
+            self.__tokens -= 1
+            if self.__tokens >= 0:
+                return 0
+            secondsToWait = -self.__tokens * self.__secondsPerToken
+            return secondsToWait + uniform(0, RATE_LIMIT_JITTER * self.__secondsPerToken) # don't look like a metronome
+
+    def reportSuccess(self) -> None:
+        with self.__lock:
+            self.__secondsPerToken = max(self.__minSeconds, self.__secondsPerToken * RATE_LIMIT_SPEEDUP_FACTOR)
+
+    def reportThrottled(self) -> None:
+        with self.__lock:
+            self.__secondsPerToken = min(self.__maxSeconds, self.__secondsPerToken * RATE_LIMIT_BACKOFF_FACTOR)
+            self.__tokens = min(self.__tokens, 0) # no more bursts until the bucket refills at the slower pace
+            self.__logger.warning('Looks like "%s" is throttling us, backing off to one page every %.1f seconds', self.__host, self.__secondsPerToken)
+
+
+# One limiter per host, shared by all loaders that use this object. Limits are configured per site in RATE_LIMITS.
+class RateLimiters:
+    __rateLimits: dict[str, dict]
+    __defaultRateLimit: dict
+    __limiters: dict[str, HostRateLimiter]
+    __clock: Callable[[], float]
+    __lock: threading.Lock
+
+    def __init__(self, rateLimits: dict[str, dict] = RATE_LIMITS, defaultRateLimit: dict = DEFAULT_RATE_LIMIT, clock: Callable[[], float] = time.monotonic):
+        self.__rateLimits = { RateLimiters.__getHost(url): rateLimit for url, rateLimit in rateLimits.items() }
+        self.__defaultRateLimit = defaultRateLimit
+        self.__limiters = {}
+        self.__clock = clock
+        self.__lock = threading.Lock()
+
+    @staticmethod
+    def __getHost(url: str) -> str:
+        return urllib.parse.urlsplit(url).netloc.lower()
+
+    def forUrl(self, url: str) -> HostRateLimiter:
+        host = RateLimiters.__getHost(url)
+        with self.__lock:
+            if host not in self.__limiters:
+                self.__limiters[host] = HostRateLimiter(host, self.__rateLimits.get(host, self.__defaultRateLimit), self.__clock)
+            return self.__limiters[host]
+
+
+# all loaders in the process share one budget per host unless they are given their own RateLimiters
+sharedRateLimiters = RateLimiters()
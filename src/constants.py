@@ -2,9 +2,46 @@
 
 CHROME_DRIVER_PATH = 'C:\Path\To\Your\chromedriver.exe'
 MAX_THREADS = 3
+MAX_BROWSERS = 2 # every job loader leases its own browser, loaders wait when all browsers are busy
+MAX_CONCURRENT_PAGE_LOADS_PER_HOST = 2 # across all searches running against the same site
+PREFETCH_NEXT_PAGE = False # load the next page (one page ahead at most) in a second tab or connection while the current one is parsed
+PAGE_LOAD_TIMEOUT_SECONDS = 60
+LEAN_BROWSER = True # don't load images, fonts, stylesheets and trackers, and don't wait for them to start reading a page
+LEAN_BROWSER_BLOCKED_URL_PATTERNS = [ '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico', '*.woff', '*.woff2', '*.ttf', '*.otf', '*.css',
+                                      '*.mp4', '*.webm', '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*', '*connect.facebook.net*',
+                                      '*bat.bing.com*', '*px.ads.linkedin.com*', '*hotjar.com*', '*quantserve.com*' ]
+PAGE_LOAD_ATTEMPTS = 3 # a page that times out, comes back empty or blocked is retried this many times in total before its search gives up
+PAGE_RETRY_BASE_SECONDS = 10 # wait before the first retry, doubles with every next one
+PAGE_RETRY_MAX_SECONDS = 120
+PAGE_RETRY_JITTER = 0.5 # up to this share of the wait is added to it at random
+LOAD_JOBS_OVER_HTTP = False # use plain http requests instead of a browser for sites that allow it
+HTTP_TIMEOUT_SECONDS = 30
+HTTP_MAX_IDLE_CONNECTIONS_PER_HOST = 4
+HTTP_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+PAGE_CACHE_MODE = None # None - no cache, 'readthrough' - reuse pages loaded recently, 'record' - store every loaded page, 'replay' - load pages from cache only
+PAGE_CACHE_FOLDER_NAME = 'pagecache'
+PAGE_CACHE_TTL_SECONDS = 12 * 60 * 60 # readthrough mode loads pages older than this again
+PAGE_CACHE_MAX_SIZE_BYTES = 200 * 1024 * 1024 # oldest pages are evicted when cache grows bigger, down to 90% of this
+INCREMENTAL_CRAWL = False # stop loading pages of a search once a whole page consists of jobs loaded on previous runs
+CRAWL_HISTORY_FILE_NAME = 'crawlhistory.json'
+CRAWL_HISTORY_RETENTION_DAYS = 30 # jobs not seen for this long are forgotten
+RESUME_INTERRUPTED_CRAWLS = True # keep a journal of loaded pages so that a search that failed half way continues from where it stopped next time
+CRAWL_JOURNAL_FOLDER_NAME = 'journal'
+CRAWL_JOURNAL_MAX_AGE_SECONDS = 24 * 60 * 60 # older interrupted crawls start over
+LOAD_JOB_DETAILS = False # load every job's own page for its full description, once per job ever
+JOB_DETAIL_CACHE_FOLDER_NAME = 'jobdetails'
+MAX_CONCURRENT_JOB_DETAIL_LOADS = 2 # at most one per browser makes sense when loading with a browser
+WORK_QUEUE_FILE_NAME = 'workqueue.sqlite' # crawl shared by worker processes, see 'python main.py work'
+WORK_QUEUE_LEASE_SECONDS = 10 * 60 # a search whose worker hasn't finished a page for this long is taken over by another worker
+WORK_QUEUE_MAX_ATTEMPTS = 3 # a search is given up on after this many workers failed to finish it
+WORK_QUEUE_POLL_SECONDS = 10 # idle workers check this often whether a search of another worker can be taken over
+DAEMON_INTERVAL_MINUTES = 120 # daemon mode starts a crawl this often
+DAEMON_HOST_STAGGER_SECONDS = 60 # in daemon mode, searches against the same site start this far apart
 LOG_CONFIG_FILE_NAME = 'logging.conf'
 STOPLIST_FILE_NAME = 'stoplist.csv'
+STOPLIST_INDEX_FILE_NAME = 'stoplist.index' # stoplist compiled for matching, compiled again whenever stoplist changes
 REPORT_FOLDER_NAME = 'reports'
+LAST_RESULTS_FILE_NAME = 'lastresults.json' # processed jobs of the last crawl, for rendering the report again
 KEEP_NEWEST_REPORTS_COUNT = 10
 
 INDEED_HOST = 'https://www.indeed.com/'
@@ -16,6 +53,7 @@ LINKEDIN_NORMAL_SEARCH_PATH = 'jobs/search'; # returns normally rendered page
 LINKEDIN_PARTIAL_SEARCH_PATH = 'jobs-guest/jobs/api/seeMoreJobPostings/search'; # returns only html for job list
 LINKEDIN_PAGE_SIZE = 25
 LINKEDIN_JOB_LOADING_LIMIT = 500
+SHARD_OVERFLOWING_SEARCHES = True # split searches that find more jobs than loading limits allow by job type, then by experience level
 
 GLASSDOOR_HOST = 'https://www.glassdoor.com'
 GLASSDOOR_SEARCH_PAGE = 'Search/results.htm'
@@ -24,4 +62,16 @@ GLASSDOOR_SEARCH_PARAM = 'keyword'
 MIN_SECONDS_TO_SLEEP = 5
 MAX_SECONDS_TO_SLEEP = 15
 
+# Politeness, per host, shared by all searches against it: at first pages are loaded one every 'initialSeconds',
+# speeding up to one every 'minSeconds' while the site responds fine and backing off exponentially up to one every 'maxSeconds'
+# when it starts blocking us. 'burst' pages can go out without waiting after a quiet period.
+DEFAULT_RATE_LIMIT = { 'minSeconds': MIN_SECONDS_TO_SLEEP, 'initialSeconds': MAX_SECONDS_TO_SLEEP, 'maxSeconds': 300, 'burst': 1 }
+RATE_LIMITS = {
+    INDEED_HOST: { 'minSeconds': 3, 'initialSeconds': 10, 'maxSeconds': 300, 'burst': 2 },
+    LINKEDIN_HOST: { 'minSeconds': 2, 'initialSeconds': 8, 'maxSeconds': 300, 'burst': 2 }
+}
+RATE_LIMIT_SPEEDUP_FACTOR = 0.8
+RATE_LIMIT_BACKOFF_FACTOR = 2
+RATE_LIMIT_JITTER = 0.25 # up to this share of the current interval is added to every wait at random
+
 DEROGATORY_MARK_WEIGHT_HANDICAP = -10
\ No newline at end of file
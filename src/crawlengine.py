@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+
+import asyncio
+import concurrent.futures as f
+import urllib.parse
+from logging import getLogger, Logger
+from typing import AsyncIterator, Awaitable, Callable, TypeVar
+
+from .base.basejobloader import BaseJobLoader
+from .base.basesearchparams import BaseSearchParams
+from .base.hostsemaphores import HostSemaphores
+from .base.pageloadstats import PageLoadStats
+from .jobinfo import JobInfo
+from .constants import MAX_THREADS, MAX_CONCURRENT_PAGE_LOADS_PER_HOST, SHARD_OVERFLOWING_SEARCHES
+from .utility import canonicalizeUrl, getSimpleModuleName
+
+T = TypeVar('T')
+
+# Runs any number of searches on one event loop. Searches wait between pages without holding a thread,
+# only actual page loads take one of maxThreads worker threads, and no host gets more than
+# maxConcurrentPageLoadsPerHost page loads at a time. With hostStaggerSeconds, searches against the same host
+# don't all start at once: each one starts that many seconds after the previous one. With shardOverflowingSearches,
+# named searches (crawlSearches, streamSearchesAsync) that find more jobs than can be loaded are split into shards.
+class CrawlEngine:
+    __maxThreads: int
+    __maxConcurrentPageLoadsPerHost: int
+    __hostStaggerSeconds: float
+    __shardOverflowingSearches: bool
+    __pageLoadStats: PageLoadStats
+    __logger: Logger
+
+    def __init__(self, maxThreads: int = MAX_THREADS, maxConcurrentPageLoadsPerHost: int = MAX_CONCURRENT_PAGE_LOADS_PER_HOST, hostStaggerSeconds: float = 0,
+                 shardOverflowingSearches: bool = SHARD_OVERFLOWING_SEARCHES):
+        self.__maxThreads = maxThreads
+        self.__maxConcurrentPageLoadsPerHost = maxConcurrentPageLoadsPerHost
+        self.__hostStaggerSeconds = hostStaggerSeconds
+        self.__shardOverflowingSearches = shardOverflowingSearches
+        self.__pageLoadStats = PageLoadStats()
+        self.__logger = getLogger(getSimpleModuleName(__name__))
+
+    # page load attempts, failures and searches that gave up during the last crawl
+    @property
+    def pageLoadStats(self) -> PageLoadStats:
+        return self.__pageLoadStats
+
+    async def __loadJobs(self, loader: BaseJobLoader, searchParams: BaseSearchParams, shouldSleep: bool, hostSemaphores: HostSemaphores,
+                         onJobs: Callable[[list[JobInfo]], None] | None, startDelaySeconds: float,
+                         createJobLoader: Callable[[BaseSearchParams], BaseJobLoader] | None, startedLoaders: list[BaseJobLoader]) -> list[JobInfo]:
+        if startDelaySeconds > 0:
+            self.__logger.info('Search for "%s" starts in %.1f seconds', loader.getSearchKey(searchParams), startDelaySeconds)
+            await asyncio.sleep(startDelaySeconds)
+
+        jobs = await loader.loadJobsAsync(searchParams, shouldSleep, hostSemaphores, onJobs) # waits for a free browser without holding a thread
+
+        if not loader.shards:
+            return jobs
+        # shards run in parallel like any other searches, their jobs count as jobs of the search they were split from
+        shardLoaders = [ self.__createShardLoader(createJobLoader, shard) for shard in loader.shards ]
+        startedLoaders.extend(shardLoaders)
+        shardResults = await asyncio.gather(*[self.__loadJobs(shardLoader, shard, shouldSleep, hostSemaphores, onJobs, 0, createJobLoader, startedLoaders)
+                                              for shardLoader, shard in zip(shardLoaders, loader.shards)])
+        return jobs + [ job for result in shardResults for job in result ]
+
+    @staticmethod
+    def __createShardLoader(createJobLoader: Callable[[BaseSearchParams], BaseJobLoader], searchParams: BaseSearchParams) -> BaseJobLoader:
+        loader = createJobLoader(searchParams)
+        loader.shardOverflowingSearches = True # a shard that finds too many jobs is split further
+        return loader
+
+    async def crawlAsync(self, loaders: list[BaseJobLoader], searchParams: list[BaseSearchParams], shouldSleep: bool = True) -> list[JobInfo]:
+        results = await self.__crawlEachAsync(loaders, searchParams, shouldSleep)
+        jobs = [job for result in results for job in result]
+        self.__logger.info('Finished %d searches, loaded %d jobs', len(loaders), len(jobs))
+        return jobs
+
+    # Returns jobs of every search separately, in the order of loaders, unless they go to the search's onJobs as they are loaded.
+    # Searches are only split into shards if there is createJobLoader to create loaders for shards with.
+    async def __crawlEachAsync(self, loaders: list[BaseJobLoader], searchParams: list[BaseSearchParams], shouldSleep: bool,
+                               onJobs: list[Callable[[list[JobInfo]], None]] = None,
+                               createJobLoader: Callable[[BaseSearchParams], BaseJobLoader] = None) -> list[list[JobInfo]]:
+        hostSemaphores = HostSemaphores(self.__maxConcurrentPageLoadsPerHost)
+        for loader in loaders:
+            loader.shardOverflowingSearches = self.__shardOverflowingSearches and createJobLoader is not None
+
+        self.__logger.info('Running %d searches', len(loaders))
+        startDelays = self.__getStartDelays(loaders, searchParams)
+        startedLoaders = list(loaders)
+        results = await asyncio.gather(*[self.__loadJobs(loader, params, shouldSleep, hostSemaphores, onSearchJobs, startDelay, createJobLoader, startedLoaders)
+                                         for loader, params, onSearchJobs, startDelay in zip(loaders, searchParams, onJobs or [ None ] * len(loaders), startDelays)])
+        self.__pageLoadStats = PageLoadStats.combine([ loader.pageLoadStats for loader in startedLoaders ])
+        self.__logger.info('Page loads: %s', self.__pageLoadStats)
+        return results
+
+    # the first search against every host starts right away, the next ones hostStaggerSeconds apart
+    def __getStartDelays(self, loaders: list[BaseJobLoader], searchParams: list[BaseSearchParams]) -> list[float]:
+        if not self.__hostStaggerSeconds:
+            return [ 0 ] * len(loaders)
+        searchesPerHost: dict[str, int] = {}
+        startDelays = []
+        for loader, params in zip(loaders, searchParams):
+            host = urllib.parse.urlsplit(loader.getSearchKey(params)).netloc
+            startDelays.append(searchesPerHost.get(host, 0) * self.__hostStaggerSeconds)
+            searchesPerHost[host] = searchesPerHost.get(host, 0) + 1
+        return startDelays
+
+    # searches that would load the same pages (same canonical first page url) are loaded once
+    def __collapseSearches(self, searches: dict[str, BaseSearchParams], 
+                           createJobLoader: Callable[[BaseSearchParams], BaseJobLoader]) -> list[tuple[BaseJobLoader, BaseSearchParams, list[str]]]:
+        uniqueSearches: dict[str, tuple[BaseJobLoader, BaseSearchParams, list[str]]] = {} # search key -> (loader, params, search names)
+        for name, params in searches.items():
+            loader = createJobLoader(params)
+            searchKey = loader.getSearchKey(params)
+            if searchKey in uniqueSearches:
+                self.__logger.info('Search "%s" loads the same pages as search "%s", will load them once', name, uniqueSearches[searchKey][2][0])
+                uniqueSearches[searchKey][2].append(name)
+            else:
+                uniqueSearches[searchKey] = (loader, params, [ name ])
+        return list(uniqueSearches.values())
+
+    # Streaming batch crawl: searches are given by name, like { 'Drivers in LA': params, ... }, and jobs come out page by page
+    # as soon as any search loads them. Searches that would load the same pages are loaded once, jobs found by several searches
+    # come out once, and every job is tagged with the names of all searches that found it (names of searches that find it later
+    # are added to its searchLabels after it came out).
+    async def streamSearchesAsync(self, searches: dict[str, BaseSearchParams], createJobLoader: Callable[[BaseSearchParams], BaseJobLoader],
+                                  shouldSleep: bool = True) -> AsyncIterator[list[JobInfo]]:
+        uniqueSearches = self.__collapseSearches(searches, createJobLoader)
+        batches: asyncio.Queue[tuple[list[str], list[JobInfo]] | None] = asyncio.Queue()
+        onJobs = [ (lambda jobs, names = names: batches.put_nowait((names, jobs))) for loader, params, names in uniqueSearches ]
+        crawl = asyncio.ensure_future(self.__crawlEachAsync([ loader for loader, params, names in uniqueSearches ],
+                                                            [ params for loader, params, names in uniqueSearches ], shouldSleep, onJobs, createJobLoader))
+        crawl.add_done_callback(lambda crawl: batches.put_nowait(None))
+
+        searchLabelsByLink: dict[str, list[str]] = {} # only links are kept, not jobs
+        jobCount = 0
+        try:
+            while (batch := await batches.get()) is not None:
+                names, jobs = batch
+                newJobs = []
+                for job in jobs:
+                    jobLink = canonicalizeUrl(job.jobLink) if job.jobLink else None
+                    searchLabels = searchLabelsByLink.get(jobLink) if jobLink else None
+                    if searchLabels is None:
+                        job.searchLabels = list(names)
+                        if jobLink:
+                            searchLabelsByLink[jobLink] = job.searchLabels
+                        newJobs.append(job)
+                    else:
+                        searchLabels.extend(name for name in names if name not in searchLabels)
+                if newJobs:
+                    jobCount += len(newJobs)
+                    yield newJobs
+            await crawl # rethrows whatever went wrong
+        finally:
+            crawl.cancel()
+
+        self.__logger.info('Finished %d searches (%d unique), loaded %d unique jobs', len(searches), len(uniqueSearches), jobCount)
+
+    async def crawlSearchesAsync(self, searches: dict[str, BaseSearchParams], createJobLoader: Callable[[BaseSearchParams], BaseJobLoader],
+                                 shouldSleep: bool = True) -> list[JobInfo]:
+        return [ job async for batch in self.streamSearchesAsync(searches, createJobLoader, shouldSleep) for job in batch ]
+
+    async def __runWithOwnExecutor(self, work: Awaitable[T]) -> T:
+        asyncio.get_running_loop().set_default_executor(f.ThreadPoolExecutor(max_workers=self.__maxThreads))
+        return await work
+
+    # runs a crawl (or anything that consumes one, like a streaming crawl that feeds job processing) to completion
+    def run(self, work: Awaitable[T]) -> T:
+        return asyncio.run(self.__runWithOwnExecutor(work))
+
+    def crawl(self, loaders: list[BaseJobLoader], searchParams: list[BaseSearchParams], shouldSleep: bool = True) -> list[JobInfo]:
+        return self.run(self.crawlAsync(loaders, searchParams, shouldSleep))
+
+    def crawlSearches(self, searches: dict[str, BaseSearchParams], createJobLoader: Callable[[BaseSearchParams], BaseJobLoader],
+                      shouldSleep: bool = True) -> list[JobInfo]:
+        return self.run(self.crawlSearchesAsync(searches, createJobLoader, shouldSleep))
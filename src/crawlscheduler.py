@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+
+import threading
+import time
+from logging import getLogger, Logger
+from typing import Callable
+
+from .constants import DAEMON_INTERVAL_MINUTES
+from .utility import getSimpleModuleName
+
+# Runs a crawl cycle every intervalSeconds, counted from the start of the previous cycle, until stopped.
+# A cycle that takes longer than the interval is followed by the next one right away; a cycle that fails
+# is logged and the schedule goes on.
+class CrawlScheduler:
+    __intervalSeconds: float
+    __clock: Callable[[], float]
+    __stopEvent: threading.Event
+    __logger: Logger
+
+    def __init__(self, intervalSeconds: float = DAEMON_INTERVAL_MINUTES * 60, clock: Callable[[], float] = time.monotonic):
+        self.__intervalSeconds = intervalSeconds
+        self.__clock = clock
+        self.__stopEvent = threading.Event()
+        self.__logger = getLogger(getSimpleModuleName(__name__))
+
+    # can be called from any thread, a cycle that is running is finished first
+    def stop(self) -> None:
+        self.__stopEvent.set()
+
+    # runCycle gets the number of the cycle, starting with 1; returns how many cycles were run
+    def run(self, runCycle: Callable[[int], None], maxCycles: int | None = None) -> int:
+        cycle = 0
+        while not self.__stopEvent.is_set() and (maxCycles is None or cycle < maxCycles):
+            cycle += 1
+            cycleStart = self.__clock()
+            self.__logger.info('Starting crawl cycle %d', cycle)
+            try:
+                runCycle(cycle)
+            except Exception:
+                self.__logger.exception('Exception in crawl cycle %d', cycle)
+
+            if maxCycles is not None and cycle >= maxCycles:
+                break
+            secondsToWait = max(0, cycleStart + self.__intervalSeconds - self.__clock())
+            self.__logger.info('Crawl cycle %d took %.1f seconds, next one starts in %.1f seconds', cycle, self.__clock() - cycleStart, secondsToWait)
+            self.__stopEvent.wait(secondsToWait)
+        return cycle
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+
+import os
+import socket
+import threading
+from logging import getLogger, Logger
+from typing import Callable
+
+from .base.basejobloader import BaseJobLoader, SearchGivenUpError
+from .base.basesearchparams import BaseSearchParams
+from .workqueue import WorkQueue, WorkTask, LeaseLostError
+from .constants import WORK_QUEUE_POLL_SECONDS, SHARD_OVERFLOWING_SEARCHES
+from .utility import getSimpleModuleName
+
+# One worker of a crawl shared through a WorkQueue: leases searches one at a time and loads them until the crawl is finished.
+# While other workers still hold leases, it checks every pollSeconds whether one of them ran out.
+class CrawlWorker:
+    __workQueue: WorkQueue
+    __createJobLoader: Callable[[BaseSearchParams], BaseJobLoader]
+    __workerId: str
+    __shouldSleep: bool
+    __pollSeconds: float
+    __shardOverflowingSearches: bool
+    __stopEvent: threading.Event
+    __logger: Logger
+
+    def __init__(self, workQueue: WorkQueue, createJobLoader: Callable[[BaseSearchParams], BaseJobLoader], workerId: str = None, shouldSleep: bool = True,
+                 pollSeconds: float = WORK_QUEUE_POLL_SECONDS, shardOverflowingSearches: bool = SHARD_OVERFLOWING_SEARCHES):
+        self.__workQueue = workQueue
+        self.__createJobLoader = createJobLoader
+        self.__workerId = workerId or '%s:%d' % (socket.gethostname(), os.getpid())
+        self.__shouldSleep = shouldSleep
+        self.__pollSeconds = pollSeconds
+        self.__shardOverflowingSearches = shardOverflowingSearches
+        self.__stopEvent = threading.Event()
+        self.__logger = getLogger(getSimpleModuleName(__name__))
+
+    # can be called from any thread, a search that is being loaded is finished first
+    def stop(self) -> None:
+        self.__stopEvent.set()
+
+    # returns how many searches this worker loaded
+    def run(self, maxTasks: int | None = None) -> int:
+        taskCount = 0
+        while not self.__stopEvent.is_set() and (maxTasks is None or taskCount < maxTasks):
+            task = self.__workQueue.lease(self.__workerId)
+            if task is None:
+                if self.__workQueue.isCrawlFinished():
+                    break
+                self.__stopEvent.wait(self.__pollSeconds)
+                continue
+            self.__runTask(task)
+            taskCount += 1
+        self.__logger.info('Worker "%s" loaded %d searches, queue: %s', self.__workerId, taskCount, self.__workQueue.getProgress())
+        return taskCount
+
+    def __runTask(self, task: WorkTask) -> None:
+        self.__logger.info('Loading search "%s", attempt %d', task.searchKey, task.attempt)
+        try:
+            loader = self.__createJobLoader(task.searchParams)
+            loader.crawlJournal = self.__workQueue.getJournal(task)
+            loader.shardOverflowingSearches = self.__shardOverflowingSearches
+            jobs = loader.loadJobsOrRaise(task.searchParams, self.__shouldSleep)
+            if loader.shards:
+                self.__workQueue.addShards(task, loader.shards, loader.getSearchKey)
+            self.__workQueue.complete(task, jobs)
+        except LeaseLostError:
+            self.__logger.warning('Search "%s" took too long and was taken over by another worker', task.searchKey)
+        except Exception as e:
+            if isinstance(e, SearchGivenUpError):
+                self.__logger.warning('Search "%s" could not load a page, handing it back', task.searchKey)
+            else:
+                self.__logger.exception('Exception on loading search "%s"', task.searchKey)
+            try:
+                self.__workQueue.release(task) # pages it finished stay with the task, whoever tries it next resumes from them
+            except LeaseLostError:
+                pass # someone else has it already
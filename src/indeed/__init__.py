@@ -3,4 +3,5 @@
 from .searchparams import SearchParams, Location
 from .indeedjobloader import JobLoader
 from . import enums as Enums
-from .urlbuilder import UrlBuilder
\ No newline at end of file
+from .urlbuilder import UrlBuilder
+from .indeedhttpjobloader import HttpJobLoader
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+
+import re
+import html
+from contextlib import contextmanager
+from typing import Iterator
+from urllib.parse import urljoin
+
+from ..constants import INDEED_HOST
+from ..base.httpclient import HttpClient, HttpResponse
+from ..base.pageprefetcher import PagePrefetcher
+from ..base.elementtextparser import ElementTextParser
+from ..utility import extractAssignedJson
+from .indeedjobloader import JobLoader
+
+# Loads jobs from Indeed search pages without a browser. Everything the browser loader reads from the page
+# (job count and job cards) is inlined in the page source as json, so it is pulled straight out of the raw html.
+class HttpJobLoader(JobLoader):
+    _rawPageFormat: str = 'httpresponse' # see HttpResponse.toDict
+    __nextPageLinkRegex: re.Pattern = re.compile(r'<a\b[^>]*\bdata-testid="pagination-page-next"[^>]*>', re.IGNORECASE)
+    __hrefRegex: re.Pattern = re.compile(r'\bhref="([^"]*)"', re.IGNORECASE)
+    __httpClient: HttpClient
+    __prefetcher: PagePrefetcher
+    __lastPageSource: str
+
+    def __init__(self, httpClient: HttpClient, host: str = INDEED_HOST):
+        super().__init__(None, host, __name__)
+        self.__httpClient = httpClient
+        self.__prefetcher = PagePrefetcher()
+        self.__lastPageSource = ''
+
+    @contextmanager
+    def _openSession(self) -> Iterator[None]:
+        yield # no browser needed
+
+    def _getPageSource(self) -> str:
+        return self.__lastPageSource
+
+    def __getNextPageUrl(self, pageSource: str, url: str) -> str | None:
+        nextPageLink = self.__nextPageLinkRegex.search(pageSource)
+        href = self.__hrefRegex.search(nextPageLink.group()) if nextPageLink else None
+        return urljoin(url, html.unescape(href.group(1))) if href else None
+
+    def _fetchPage(self, url: str) -> HttpResponse:
+        return self.__httpClient.get(url)
+
+    def _startPrefetch(self, url: str) -> None:
+        self.__prefetcher.start(url, self._fetchPage)
+
+    def _takePrefetchedPage(self, url: str) -> HttpResponse:
+        return self.__prefetcher.take(url, self._fetchPage)
+
+    def _discardPrefetchedPage(self) -> None:
+        self.__prefetcher.discard()
+
+    def _encodeRawPage(self, response: HttpResponse) -> dict:
+        return response.toDict()
+
+    def _decodeRawPage(self, payload: dict) -> HttpResponse:
+        return HttpResponse.fromDict(payload)
+
+    def _parsePage(self, url: str, response: HttpResponse) -> dict:
+        self.__lastPageSource = response.body
+        if not response.ok:
+            self._logger.warning('Got http status %d from url = "%s"', response.status, url)
+            return { 'jobs': [], 'count': None, 'next': None, 'blocked': True }
+
+        initialData = extractAssignedJson(response.body, 'window._initialData')
+        jobCardsData = extractAssignedJson(response.body, 'window.mosaic.providerData["mosaic-provider-jobcards"]')
+        try:
+            jobs = jobCardsData['metaData']['mosaicProviderJobCardsModel']['results']
+        except (KeyError, TypeError):
+            jobs = None
+
+        return { 'jobs': jobs or [], 
+                 'count': initialData.get('uniqueJobsCount') if isinstance(initialData, dict) else None,
+                 'next': self.__getNextPageUrl(response.body, url) }
+
+    def _fetchJobDescription(self, jobLink: str) -> str | None:
+        response = self.__httpClient.get(jobLink)
+        if not response.ok:
+            self._logger.warning('Got http status %d from url = "%s"', response.status, jobLink)
+            return None
+        return ElementTextParser.getElementText(response.body, elementId = 'jobDescriptionText')
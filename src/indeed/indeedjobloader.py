@@ -1,81 +1,80 @@
 #!/usr/bin/env python3
 
-from selenium.webdriver.chrome.webdriver import WebDriver
-from selenium.webdriver.common.by import By
-from selenium.common.exceptions import NoSuchElementException
 from datetime import datetime
-import re
-from multiprocessing.managers import AcquirerProxy
+from urllib.parse import urljoin, urlsplit, parse_qs
 
 from ..constants import INDEED_HOST, INDEED_JOB_LOADING_LIMIT
 from ..base.basejobloader import BaseJobLoader
+from ..base.driverpool import DriverPool
 from ..jobinfo import JobInfo
 from ..base.basesearchparams import BaseSearchParams
 from .urlbuilder import UrlBuilder
+from .enums import JobType, ExperienceLevel
 
 class JobLoader(BaseJobLoader):
-    def __init__(self, driver: WebDriver, lock: AcquirerProxy, tabNumber: int):
-        super().__init__(driver, lock, tabNumber, __name__)
+    _host: str
+    _pageExtractionScript: str = '''
+        var page = { jobs: null, count: null, next: null };
+        try { page.count = window._initialData.uniqueJobsCount; } catch(e) { }
+        try { page.jobs = window.mosaic.providerData["mosaic-provider-jobcards"].metaData.mosaicProviderJobCardsModel.results; } catch(e) { }
+        var nextPageLink = document.querySelector('a[data-testid="pagination-page-next"]');
+        page.next = nextPageLink ? nextPageLink.href : null;
+        return page;'''
+    _jobDescriptionScript: str = '''
+        var descriptionElement = document.getElementById('jobDescriptionText');
+        return descriptionElement ? (descriptionElement.innerText || descriptionElement.textContent) : null;'''
+    # NoExperienceRequired is not an experience level filter of its own, it overlaps with the rest
+    _shardFacets: list[tuple[str, list]] = [ ('jobType', list(JobType)),
+                                             ('experienceLevel', [ ExperienceLevel.EntryLevel, ExperienceLevel.MidLevel, ExperienceLevel.SeniorLevel ]) ]
+
+    def __init__(self, driverPool: DriverPool, host: str = INDEED_HOST, loggerName: str = __name__):
+        super().__init__(driverPool, loggerName)
+        self._host = host
         
     def __mapJsonJobToJobInfo(self, jsonJob: dict) -> JobInfo:
         return JobInfo(
                 jsonJob.get('displayTitle'),
                 jsonJob.get('company'),
-                re.sub('/{2,}', '/', '/'.join([ INDEED_HOST, jsonJob.get('link') ])), # take care of slashes when joining url parts
+                urljoin(self._host, jsonJob.get('link')), # take care of slashes when joining url parts
                 jsonJob.get('formattedLocation'),
                 jsonJob.get('salarySnippet').get('text') if jsonJob.get('salarySnippet') else '',
                 datetime.fromtimestamp(jsonJob.get('pubDate') / 1000.0)) # jsonJob['pubDate'] is in milliseconds
 
+    # job links look like https://www.indeed.com/rc/clk?jk=0123456789abcdef&fccid=..., jk is the job key
+    def getJobId(self, jobLink: str) -> str:
+        jobKey = parse_qs(urlsplit(jobLink).query).get('jk')
+        return 'indeed:' + jobKey[0] if jobKey else super().getJobId(jobLink)
 
-    def __threadSafeGetNextPageUrl(self) -> str | None:
-        try:
-            with self._lock:
-                self._switchToProperTab()
-                nextPageLinkElement = self._driver.find_element(By.CSS_SELECTOR, 'a[data-testid="pagination-page-next"]')
-                return nextPageLinkElement.get_attribute('href')
-        except NoSuchElementException:
-            return None
+    def _getPageSource(self) -> str:
+        return self._driver.page_source
 
-    def _loadJobsInner(self, searchParams: BaseSearchParams, shouldSleep: bool = True) -> list[JobInfo]:
-        results = []
-        limit = 0
-        url = UrlBuilder.buildUrl(searchParams)
+    def _getFirstPageUrl(self, searchParams: BaseSearchParams) -> str:
+        return UrlBuilder.buildUrl(searchParams, host = self._host)
 
-        while True: # do-while imitation
-            self._logger.info('Loading jobs from url = "%s"...', url)
-            self._threadSafeGet(url)
+    def _getJobCountLimit(self, page: dict) -> int:
+        limit = page['count']
+        if limit is None:
+            self._logger.warning('Could not determine how many jobs to load, will exit without loading jobs')
+            return 0
+        
+        limit = min(limit, INDEED_JOB_LOADING_LIMIT)
+        if limit == 0:
+            self._logger.warning('No jobs found with given search criteria')
+        return limit
 
-            if not results: # nothing is loaded yet - get loading limit
-                limit = self._threadSafeExecuteScript('return window._initialData ? window._initialData.uniqueJobsCount : null')
-                if limit is None:
-                    self._logger.warning('Could not determine how many jobs to load, will exit without loading jobs')
-                    break
-                else:
-                    limit = min(limit, INDEED_JOB_LOADING_LIMIT)
-                    if limit == 0:
-                        self._logger.warning('No jobs found with given search criteria')
-                        break
-                    else:
-                        self._logger.info('Will attempt to load %d jobs', limit)
+    def _getTotalJobCount(self, page: dict) -> int | None:
+        return page['count']
 
-            jsonJobs = self._threadSafeExecuteScript('try { return window.mosaic.providerData["mosaic-provider-jobcards"].metaData.mosaicProviderJobCardsModel.results } catch(e) { return null }')
-            if not jsonJobs:
-                self._logger.error('Could not load any jobs from url = "%s", its html was "%s"', url, self._driver.page_source)
-            else:
-                results.extend(map(lambda jsonJob: self.__mapJsonJobToJobInfo(jsonJob), jsonJobs))
-                self._logger.info('Loaded %d out of %d jobs', len(results), limit)
+    def _getJobsFromPage(self, url: str, page: dict) -> list[JobInfo]:
+        if not page['jobs']:
+            self._logger.error('Could not load any jobs from url = "%s", its html was "%s"', url, self._getPageSource())
+            return []
+        return list(map(lambda jsonJob: self.__mapJsonJobToJobInfo(jsonJob), page['jobs']))
 
-            nextPageUrl = self.__threadSafeGetNextPageUrl()
-            if not nextPageUrl:
-                self._logger.info('Next page does not exist, there are no more jobs, process finished')
-                break
-            elif len(results) >= limit:
-                self._logger.info('Loaded equal to or more jobs (%d) than discovered limit (%d), won\'t be loading more, process finished', len(results), limit)
-                break
-            else:
-                url = nextPageUrl
-                self._sleep(shouldSleep)
+    def _getNextPageUrl(self, searchParams: BaseSearchParams, pageNumber: int, page: dict, jobsOnPage: list[JobInfo]) -> str | None:
+        if not page['next']:
+            self._logger.info('Next page does not exist, there are no more jobs, process finished')
+        return page['next']
 
-        finalResults = results[0:limit]
-        self._logger.info('Loaded a total of %d jobs', len(finalResults))
-        return finalResults
\ No newline at end of file
+    def _predictNextPageUrl(self, searchParams: BaseSearchParams, pageNumber: int, page: dict | None) -> str | None:
+        return page['next'] if page else None # only the page itself knows where the next one is
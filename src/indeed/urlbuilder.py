@@ -48,7 +48,7 @@ class UrlBuilder:
             return ''
 
     @staticmethod
-    def buildUrl(searchParams: SearchParams, extraParams: dict = {}) -> str:
+    def buildUrl(searchParams: SearchParams, extraParams: dict = {}, host: str = INDEED_HOST) -> str:
         if isNullOrWhiteSpace(searchParams.query):
             raise ValueError('Query string cannot be null or white space.')
         if isNullOrWhiteSpace(searchParams.location):
@@ -68,4 +68,4 @@ class UrlBuilder:
         # remove keys with values == ''
         filteredQueryStringDict = {key:value for (key,value) in mergedDict.items() if value}
 
-        return buildUrl(INDEED_HOST, INDEED_SEARCH_PATH, filteredQueryStringDict)
\ No newline at end of file
+        return buildUrl(host, INDEED_SEARCH_PATH, filteredQueryStringDict)
\ No newline at end of file
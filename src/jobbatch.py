@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+
+from array import array
+from datetime import datetime, timedelta
+from typing import Iterable, Iterator
+
+from .jobinfo import JobInfo
+
+# Column of strings stored once each: every row is a code pointing at its value. Titles, companies, locations and salaries
+# repeat a lot across postings, so columns of them take little more memory than their distinct values, and anything computed
+# from a value (casefolding, regex matches) can be computed once per distinct value instead of once per row.
+class StringColumn:
+    __values: list[str]
+    __codes: array
+    __codesByValue: dict[str, int]
+
+    def __init__(self):
+        self.__values = []
+        self.__codes = array('l')
+        self.__codesByValue = {}
+
+    # distinct values, in order of appearance
+    @property
+    def values(self) -> list[str]:
+        return self.__values
+
+    # a code (index into values) per row
+    @property
+    def codes(self) -> array:
+        return self.__codes
+
+    def append(self, value: str) -> None:
+        code = self.__codesByValue.get(value)
+        if code is None:
+            code = self.__codesByValue[value] = len(self.__values)
+            self.__values.append(value)
+        self.__codes.append(code)
+
+    def __getitem__(self, row: int) -> str:
+        return self.__values[self.__codes[row]]
+
+    def __len__(self) -> int:
+        return len(self.__codes)
+
+
+# Jobs stored column by column, for processing large numbers of postings (a whole archive) at once: string columns are
+# dictionary encoded (see StringColumn), links are kept as they are (they are all different) and posting dates are stored
+# as numbers, microseconds since 1970-01-01 (see toDateNumber), with NO_DATE for jobs without one.
+class JobBatch:
+    NO_DATE: int = 2 ** 63 - 1 # later than any date, so it never is the earliest date of a group
+    __epoch: datetime = datetime(1970, 1, 1)
+    titles: StringColumn
+    companies: StringColumn
+    links: list[str]
+    locations: StringColumn
+    salaries: StringColumn
+    datesPosted: array
+    descriptions: StringColumn # None for jobs without details
+    searchLabels: list[list[str]] # the jobs' own lists, names of searches that find them later still get added to them
+
+    def __init__(self):
+        self.titles = StringColumn()
+        self.companies = StringColumn()
+        self.links = []
+        self.locations = StringColumn()
+        self.salaries = StringColumn()
+        self.datesPosted = array('q')
+        self.descriptions = StringColumn()
+        self.searchLabels = []
+
+    @staticmethod
+    def fromJobs(jobs: Iterable[JobInfo]) -> 'JobBatch':
+        batch = JobBatch()
+        batch.extend(jobs)
+        return batch
+
+    @staticmethod
+    def toDateNumber(date: datetime | None) -> int:
+        return JobBatch.NO_DATE if date is None else (date - JobBatch.__epoch) // timedelta(microseconds = 1)
+
+    @staticmethod
+    def fromDateNumber(dateNumber: int) -> datetime | None:
+        return None if dateNumber == JobBatch.NO_DATE else JobBatch.__epoch + timedelta(microseconds = dateNumber)
+
+    def append(self, title: str, company: str, link: str, location: str, salary: str, datePosted: datetime | None, description: str = None,
+               searchLabels: list[str] = None) -> None:
+        self.titles.append(title)
+        self.companies.append(company)
+        self.links.append(link)
+        self.locations.append(location)
+        self.salaries.append(salary)
+        self.datesPosted.append(self.toDateNumber(datePosted))
+        self.descriptions.append(description)
+        self.searchLabels.append(searchLabels if searchLabels is not None else [])
+
+    def extend(self, jobs: Iterable[JobInfo]) -> None:
+        for job in jobs:
+            self.append(job.title, job.company, job.jobLink, job.location, job.salary, job.datePosted, job.description, job.searchLabels)
+
+    def getJob(self, row: int) -> JobInfo:
+        return JobInfo(self.titles[row], self.companies[row], self.links[row], self.locations[row], self.salaries[row],
+                       self.fromDateNumber(self.datesPosted[row]), self.searchLabels[row], self.descriptions[row])
+
+    def __iter__(self) -> Iterator[JobInfo]:
+        return (self.getJob(row) for row in range(len(self)))
+
+    def __len__(self) -> int:
+        return len(self.links)
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+
+import asyncio
+from logging import getLogger, Logger
+from typing import AsyncIterable, AsyncIterator, Callable
+
+from .base.basejobloader import BaseJobLoader
+from .base.hostsemaphores import HostSemaphores
+from .base.jobdetailcache import JobDetailCache
+from .jobinfo import JobInfo
+from .constants import MAX_CONCURRENT_JOB_DETAIL_LOADS, MAX_CONCURRENT_PAGE_LOADS_PER_HOST
+from .utility import getSimpleModuleName
+
+# Optional crawl stage that sets descriptions of jobs from their own pages. Descriptions come from the cache when they can,
+# at most maxConcurrentLoads job pages are loaded at a time (and no more than maxConcurrentPageLoadsPerHost from one site),
+# and whatever was loaded goes to the cache so that no job page is ever loaded twice. createJobLoader gives the loader
+# for a job link, None for jobs whose pages can't be loaded; those jobs, and jobs whose pages fail to load, go on without descriptions.
+class JobDetailEnricher:
+    __cache: JobDetailCache
+    __createJobLoader: Callable[[str], BaseJobLoader | None]
+    __maxConcurrentLoads: int
+    __maxConcurrentPageLoadsPerHost: int
+    __shouldSleep: bool
+    __loadedCount: int
+    __cachedCount: int
+    __logger: Logger
+
+    def __init__(self, cache: JobDetailCache, createJobLoader: Callable[[str], BaseJobLoader | None], maxConcurrentLoads: int = MAX_CONCURRENT_JOB_DETAIL_LOADS,
+                 maxConcurrentPageLoadsPerHost: int = MAX_CONCURRENT_PAGE_LOADS_PER_HOST, shouldSleep: bool = True):
+        if maxConcurrentLoads < 1:
+            raise ValueError('At least one job page must be allowed to load at a time.')
+        self.__cache = cache
+        self.__createJobLoader = createJobLoader
+        self.__maxConcurrentLoads = maxConcurrentLoads
+        self.__maxConcurrentPageLoadsPerHost = maxConcurrentPageLoadsPerHost
+        self.__shouldSleep = shouldSleep
+        self.__loadedCount = 0
+        self.__cachedCount = 0
+        self.__logger = getLogger(getSimpleModuleName(__name__))
+
+    async def __enrichJob(self, job: JobInfo, loadSemaphore: asyncio.Semaphore, hostSemaphores: HostSemaphores) -> None:
+        loader = self.__createJobLoader(job.jobLink) if job.jobLink else None
+        if loader is None:
+            return
+        jobId = loader.getJobId(job.jobLink)
+        job.description = await asyncio.to_thread(self.__cache.get, jobId)
+        if job.description is not None:
+            self.__cachedCount += 1
+            return
+
+        async with loadSemaphore:
+            job.description = await loader.loadJobDescriptionAsync(job.jobLink, self.__shouldSleep, hostSemaphores)
+        if job.description is not None:
+            self.__loadedCount += 1
+            await asyncio.to_thread(self.__cache.put, jobId, job.description)
+
+    async def __enrich(self, jobs: list[JobInfo], loadSemaphore: asyncio.Semaphore, hostSemaphores: HostSemaphores) -> None:
+        await asyncio.gather(*[ self.__enrichJob(job, loadSemaphore, hostSemaphores) for job in jobs ])
+
+    async def enrichAsync(self, jobs: list[JobInfo]) -> list[JobInfo]:
+        return [ job async for batch in self.enrichBatchesAsync(self.__once(jobs)) for job in batch ]
+
+    @staticmethod
+    async def __once(jobs: list[JobInfo]) -> AsyncIterator[list[JobInfo]]:
+        yield jobs
+
+    # Sits between a streaming crawl and job processing: every batch comes out once all of its jobs have their details
+    async def enrichBatchesAsync(self, batches: AsyncIterable[list[JobInfo]]) -> AsyncIterator[list[JobInfo]]:
+        loadSemaphore = asyncio.Semaphore(self.__maxConcurrentLoads)
+        hostSemaphores = HostSemaphores(self.__maxConcurrentPageLoadsPerHost)
+        self.__loadedCount = self.__cachedCount = 0
+        async for batch in batches:
+            await self.__enrich(batch, loadSemaphore, hostSemaphores)
+            yield batch
+        self.__logger.info('Loaded details of %d jobs, %d more came from cache', self.__loadedCount, self.__cachedCount)
@@ -1,88 +1,146 @@
 #!/usr/bin/env python3
 
+import sys
 from functools import total_ordering
 from datetime import datetime
 
+from .salary import Salary, parseSalary
+
+# Job models are created by the hundred thousand, so they have no per-instance __dict__, strings that repeat a lot across jobs
+# (titles, company names, locations, salaries) are kept once in memory, and comparison keys are casefolded only once.
+def _intern(s: str) -> str:
+    return sys.intern(s) if isinstance(s, str) else s
+
+def _casefold(s: str) -> str:
+    return s.casefold() if s else ''
+
 @total_ordering
 class JobKey:
-    title: str
-    company: str
+    __slots__ = ('__title', '__company', '__key')
+    __title: str
+    __company: str
+    __key: tuple[str, str]
+
+    # title and company can't be changed, jobs are grouped, compared and hashed by them;
+    # key can be given if it's known already (see key), so that it isn't computed again
+    def __init__(self, title: str, company: str, key: tuple[str, str] = None):
+        self.__title = _intern(title)
+        self.__company = _intern(company)
+        self.__key = key or (_casefold(title), _casefold(company))
 
-    def __init__(self, title: str, company: str):
-        self.title = title
-        self.company = company
+    @property
+    def title(self) -> str:
+        return self.__title
+
+    @property
+    def company(self) -> str:
+        return self.__company
+
+    # casefolded title and company, equal for jobs that are grouped together
+    @property
+    def key(self) -> tuple[str, str]:
+        return self.__key
 
-    def __is_valid_operand(self, other):
-        return (hasattr(other, 'title') and hasattr(other, 'company'))
-    
     def __eq__(self, other):
-        if not self.__is_valid_operand(other):
+        if not isinstance(other, JobKey):
             return NotImplemented
-        return ((self.title.casefold(), self.company.casefold()) == (other.title.casefold(), other.company.casefold()))
+        return self.__key == other.__key
 
     def __lt__(self, other):
-        if not self.__is_valid_operand(other):
+        if not isinstance(other, JobKey):
             return NotImplemented
-        return ((self.title.casefold(), self.company.casefold()) < (other.title.casefold(), other.company.casefold()))
-    
+        return self.__key < other.__key
+
     def __hash__(self):
-        return hash((self.title, self.company))
-    
+        return hash(self.__key)
+
     def __repr__(self):
-        return str(self.__dict__)
+        return str({ 'title': self.__title, 'company': self.__company })
 
 class JobInfo(JobKey):
+    __slots__ = ('jobLink', 'location', 'salary', 'datePosted', 'searchLabels', 'description')
     jobLink: str
     location: str
     salary: str
     datePosted: datetime
+    searchLabels: list[str] # names of searches that found this job, set by batch crawls
+    description: str | None # full job description, set by job detail enrichment
 
-    def __init__(self, title: str, company: str, jobLink: str, location: str, salary: str, datePosted: datetime):
+    def __init__(self, title: str, company: str, jobLink: str, location: str, salary: str, datePosted: datetime, searchLabels: list[str] = None,
+                 description: str = None):
         super().__init__(title, company)
         self.jobLink = jobLink
-        self.location = location
-        self.salary = salary
+        self.location = _intern(location)
+        self.salary = _intern(salary)
         self.datePosted = datePosted
+        self.searchLabels = searchLabels or []
+        self.description = description
 
     def __repr__(self):
-        return str(self.__dict__)
+        return str({ 'title': self.title, 'company': self.company, 'jobLink': self.jobLink, 'location': self.location, 'salary': self.salary,
+                     'datePosted': self.datePosted, 'searchLabels': self.searchLabels })
 
 class JobLocation:
-    link: str
-    name: str
+    __slots__ = ('__link', '__name', '__key')
+    __link: str
+    __name: str
+    __key: tuple[str, str] | None
 
     def __init__(self, name: str, link: str):
-        self.link = link
-        self.name = name
+        self.__link = link
+        self.__name = _intern(name)
+        self.__key = None # most locations are never compared, it's computed when first needed
+
+    @property
+    def link(self) -> str:
+        return self.__link
+
+    @property
+    def name(self) -> str:
+        return self.__name
+
+    def __getKey(self) -> tuple[str, str]:
+        if self.__key is None:
+            self.__key = (_casefold(self.__link), _casefold(self.__name))
+        return self.__key
 
-    def __is_valid_operand(self, other):
-        return (hasattr(other, 'link') and hasattr(other, 'name'))
-    
     def __eq__(self, other):
-        if not self.__is_valid_operand(other):
+        if not isinstance(other, JobLocation):
             return NotImplemented
-        return ((self.link.casefold(), self.name.casefold()) == (other.link.casefold(), other.name.casefold()))
-    
+        return self.__getKey() == other.__getKey()
+
     def __hash__(self):
-        return hash((self.link, self.name))
-    
+        return hash(self.__getKey())
+
     def __repr__(self):
-        return str(self.__dict__)
+        return str({ 'link': self.__link, 'name': self.__name })
 
 class Job(JobKey):
+    __slots__ = ('locations', 'salaries', 'datePosted', 'weight', 'derogatoryMarks', 'description', 'searchLabels')
     locations: list[JobLocation]
     salaries: list[str]
     datePosted: datetime
     weight: int
     derogatoryMarks: list[str]
+    description: str | None
+    searchLabels: list[str] # names of searches that found any of the grouped jobs
 
-    def __init__(self, title: str, company: str, datePosted: datetime, locations: list[JobLocation], salaries: list[str]):
-        super().__init__(title, company)
+    def __init__(self, title: str, company: str, datePosted: datetime, locations: list[JobLocation], salaries: list[str], description: str = None,
+                 searchLabels: list[str] = None, key: tuple[str, str] = None):
+        super().__init__(title, company, key)
         self.datePosted = datePosted
         self.locations = locations
         self.salaries = salaries
         self.weight = 0
         self.derogatoryMarks = []
+        self.description = description
+        self.searchLabels = searchLabels or []
+
+    # salaries that could be parsed, for comparing amounts; parsing is cached, this is cheap
+    @property
+    def parsedSalaries(self) -> list[Salary]:
+        return [ salary for salary in map(parseSalary, self.salaries) if salary is not None ]
 
     def __repr__(self):
-        return str(self.__dict__)
\ No newline at end of file
+        return str({ 'title': self.title, 'company': self.company, 'datePosted': self.datePosted, 'locations': self.locations, 'salaries': self.salaries,
+                     'weight': self.weight, 'derogatoryMarks': self.derogatoryMarks, 'searchLabels': self.searchLabels })
@@ -1,17 +1,38 @@
 #!/usr/bin/env python3
 
+import urllib.parse
+
+from .constants import INDEED_HOST, LINKEDIN_HOST
 from .base import basesearchparams, basejobloader
-from .indeed import JobLoader as IndeedJobLoader, SearchParams as IndeedSearchParams
-from .linkedin import JobLoader as LinkedinJobLoader, SearchParams as LinkedinSearchParams
-from selenium.webdriver.chrome.webdriver import WebDriver
-from multiprocessing.managers import AcquirerProxy
+from .base.driverpool import DriverPool
+from .base.httpclient import HttpClient
+from .base.pagecache import PageCache
+from .base.crawlhistory import CrawlHistory
+from .base.crawljournal import CrawlJournal
+from .indeed import JobLoader as IndeedJobLoader, HttpJobLoader as IndeedHttpJobLoader, SearchParams as IndeedSearchParams
+from .linkedin import JobLoader as LinkedinJobLoader, HttpJobLoader as LinkedinHttpJobLoader, SearchParams as LinkedinSearchParams
 
 class JobLoaderFactory:
-    def createJobLoader(self, searchParams: basesearchparams.BaseSearchParams,
-                        driver: WebDriver, lock: AcquirerProxy, tabNumber: int) -> basejobloader.BaseJobLoader:
+    # if httpClient is provided, sites that can be scraped without a browser will be loaded with it
+    def createJobLoader(self, searchParams: basesearchparams.BaseSearchParams, driverPool: DriverPool,
+                        httpClient: HttpClient = None, pageCache: PageCache = None, crawlHistory: CrawlHistory = None,
+                        crawlJournal: CrawlJournal = None) -> basejobloader.BaseJobLoader:
         if isinstance(searchParams, IndeedSearchParams):
-            return IndeedJobLoader(driver, lock, tabNumber = tabNumber)
+            jobLoader = IndeedHttpJobLoader(httpClient) if httpClient else IndeedJobLoader(driverPool)
         elif isinstance(searchParams, LinkedinSearchParams):
-            return LinkedinJobLoader(driver, lock, tabNumber = tabNumber)
+            jobLoader = LinkedinHttpJobLoader(httpClient) if httpClient else LinkedinJobLoader(driverPool)
         else:
-            raise TypeError("Unknown search parameters type: '%s'" % type(searchParams).__name__)
\ No newline at end of file
+            raise TypeError("Unknown search parameters type: '%s'" % type(searchParams).__name__)
+        jobLoader.pageCache = pageCache
+        jobLoader.crawlHistory = crawlHistory
+        jobLoader.crawlJournal = crawlJournal
+        return jobLoader
+
+    # loads job details from a job's own page, returns None for jobs of sites it doesn't know
+    def createJobDetailLoader(self, jobLink: str, driverPool: DriverPool, httpClient: HttpClient = None) -> basejobloader.BaseJobLoader | None:
+        host = urllib.parse.urlsplit(jobLink).netloc.casefold()
+        if host == urllib.parse.urlsplit(INDEED_HOST).netloc:
+            return IndeedHttpJobLoader(httpClient) if httpClient else IndeedJobLoader(driverPool)
+        if host == urllib.parse.urlsplit(LINKEDIN_HOST).netloc:
+            return LinkedinHttpJobLoader(httpClient) if httpClient else LinkedinJobLoader(driverPool)
+        return None
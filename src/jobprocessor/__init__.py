@@ -1,4 +1,4 @@
 #!/usr/bin/env python3
 
 from .jobprocessor import JobProcessor
-from .filteringweight import RegexFilteringWeight, SalaryFilteringWeight
\ No newline at end of file
+from .filteringweight import RegexFilteringWeight, KeywordFilteringWeight, SalaryFilteringWeight
\ No newline at end of file
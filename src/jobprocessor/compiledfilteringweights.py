@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+
+import re
+
+from .filteringweight import BaseFilteringWeight, RegexFilteringWeight
+from ..jobinfo import Job
+from ..utility import isNullOrWhiteSpace
+
+# Regexes of RegexFilteringWeights for the same field fused into one alternation of named groups, one per rule
+# ('(?P<r0>diesel|loader)|(?P<r1>class a|local)'), so that a value is scanned once to tell which rules can match it at all.
+# Most values match none, and those are done with after that one scan. The scan only finds matches that don't overlap,
+# and a rule whose match overlaps that of a rule tried before it isn't seen, so the rules that weren't seen are scanned for
+# again, together, until a scan finds nothing. Rules that were seen then weigh the value with their own regexes, which gives
+# the same weights and marks as matching every rule on its own.
+class _FusedRegex:
+    __rules: list[tuple[int, RegexFilteringWeight]] # (position among all filtering weights, weight)
+    __regexes: dict[tuple[int, ...], re.Pattern] # fused regexes by rules (indexes into __rules) they are made of
+
+    def __init__(self, rules: list[tuple[int, RegexFilteringWeight]]):
+        self.__rules = rules
+        self.__regexes = {}
+
+    def __getRegex(self, ruleIndexes: tuple[int, ...]) -> re.Pattern:
+        regex = self.__regexes.get(ruleIndexes)
+        if regex is None:
+            regex = self.__regexes[ruleIndexes] = re.compile('|'.join('(?P<r%d>%s)' % (i, self.__rules[i][1].regex) for i in ruleIndexes), re.IGNORECASE)
+        return regex
+
+    # returns (position, weight to add, derogatory mark or None) of every rule that found something in value
+    def weigh(self, value: str) -> list[tuple[int, int, str | None]]:
+        matchingRules = []
+        ruleIndexes = tuple(range(len(self.__rules)))
+        while ruleIndexes:
+            # rule groups enclose groups of their regexes, they close last
+            seenRules = { int(match.lastgroup[1:]) for match in self.__getRegex(ruleIndexes).finditer(value) if match.lastgroup }
+            if not seenRules:
+                break
+            matchingRules.extend(seenRules)
+            ruleIndexes = tuple(i for i in ruleIndexes if i not in seenRules)
+
+        results = []
+        for i in sorted(matchingRules):
+            position, rule = self.__rules[i]
+            results.append((position, *rule.weighMatches(rule.findWords(value, rule.weight < 0))))
+        return results
+
+
+# Filtering weights compiled for weighing many jobs at once: RegexFilteringWeights are fused by field (see _FusedRegex), and
+# every distinct value of a field is scanned for all of them at once, however many there are. Their marks come in the order
+# the weights are listed in. Other weights weigh jobs themselves, after that, and so do regexes that don't work inside
+# an alternation (those with backreferences, named groups or global flags like '(?x)').
+# Weights are compiled as they are when this is created.
+class CompiledFilteringWeights:
+    __unfusableRegexRegex: re.Pattern = re.compile(r'\\[1-9]|\(\?P[<=]|\(\?\(')
+    __fusedRegexes: dict[str, _FusedRegex] # by name of the field they test
+    __otherWeights: list[BaseFilteringWeight]
+
+    def __init__(self, filteringWeights: list[BaseFilteringWeight]):
+        rulesByField: dict[str, list[tuple[int, RegexFilteringWeight]]] = {}
+        self.__otherWeights = []
+        for position, filteringWeight in enumerate(filteringWeights):
+            if isinstance(filteringWeight, RegexFilteringWeight):
+                if isNullOrWhiteSpace(filteringWeight.regex):
+                    continue # nothing to weigh
+                if self.__canBeFused(filteringWeight.regex):
+                    rulesByField.setdefault(filteringWeight.fieldNameToTest, []).append((position, filteringWeight))
+                    continue
+            self.__otherWeights.append(filteringWeight)
+        self.__fusedRegexes = { fieldName: _FusedRegex(rules) for fieldName, rules in rulesByField.items() }
+
+    @staticmethod
+    def __canBeFused(regex: str) -> bool:
+        if CompiledFilteringWeights.__unfusableRegexRegex.search(regex):
+            return False
+        try:
+            re.compile(regex) # a fragment like 'a)|(b' only compiles inside a group
+            re.compile('(?:)(?P<r0>%s)' % regex) # global flags are only allowed at the start of a regex
+            return True
+        except re.error:
+            return False
+
+    def assignWeightsAndDerogatoryMarksToJobs(self, jobs: list[Job]) -> None:
+        if self.__fusedRegexes:
+            resultsByField: dict[str, dict[str, list[tuple[int, int, str | None]]]] = { fieldName: {} for fieldName in self.__fusedRegexes }
+            for job in jobs:
+                jobResults = []
+                for fieldName, fusedRegex in self.__fusedRegexes.items():
+                    propertyValue = getattr(job, fieldName)
+                    results = resultsByField[fieldName].get(propertyValue)
+                    if results is None:
+                        results = resultsByField[fieldName][propertyValue] = fusedRegex.weigh(propertyValue)
+                    jobResults.extend(results)
+                jobResults.sort(key = lambda result: result[0])
+                for _, weight, derogatoryMark in jobResults:
+                    if derogatoryMark:
+                        job.derogatoryMarks.append(derogatoryMark)
+                    job.weight += weight
+
+        for filteringWeight in self.__otherWeights:
+            filteringWeight.assignWeightsAndDerogatoryMarksToJobs(jobs)
@@ -2,10 +2,12 @@
 
 import abc
 import re
-import locale
+from itertools import chain
+from logging import getLogger, Logger
 
+from .keywordmatcher import KeywordMatcher
 from ..jobinfo import Job
-from ..utility import isNullOrWhiteSpace
+from ..utility import isNullOrWhiteSpace, getSimpleModuleName
 
 class BaseFilteringWeight(abc.ABC):
     fieldNameToTest: str
@@ -20,52 +22,122 @@ class BaseFilteringWeight(abc.ABC):
     def assignWeightAndDerogatoryMarkToJob(self, job: Job) -> None:
         pass
 
+    # same as weighing jobs one by one, weights that can do it faster for many jobs at once override it
+    def assignWeightsAndDerogatoryMarksToJobs(self, jobs: list[Job]) -> None:
+        for job in jobs:
+            self.assignWeightAndDerogatoryMarkToJob(job)
 
 
-class RegexFilteringWeight(BaseFilteringWeight):
+
+# Weights that look for words in a field: undesirable words (negative weight) lower the job once and give it a derogatory mark,
+# desirable ones (non-negative weight) raise it for every time they are found.
+class BaseWordFilteringWeight(BaseFilteringWeight):
+
+    # returns words found in value, in order; with firstOnly, only the first one is needed
+    @abc.abstractmethod
+    def findWords(self, propertyValue: str, firstOnly: bool) -> list[str]:
+        pass
+
+    # returns weight to add and derogatory mark to set (or None) given words found in a value of the tested field, in order
+    def weighMatches(self, matches: list[str]) -> tuple[int, str | None]:
+        if not matches:
+            return (0, None)
+        if self.weight < 0:
+            return (self.weight, 'Undesirable word in %s: \'%s\'' % ( self.fieldNameToTest, matches[0] ))
+        return (len(matches) * self.weight, None)
+
+    def __weigh(self, propertyValue: str) -> tuple[int, str | None]:
+        return self.weighMatches(self.findWords(propertyValue, self.weight < 0))
+
+    @staticmethod
+    def __apply(job: Job, weight: int, derogatoryMark: str | None) -> None:
+        if derogatoryMark:
+            job.derogatoryMarks.append(derogatoryMark)
+        job.weight += weight
+
+    def assignWeightAndDerogatoryMarkToJob(self, job: Job) -> None:
+        self.__apply(job, *self.__weigh(getattr(job, self.fieldNameToTest)))
+
+    # titles and company names repeat across jobs, every distinct one is matched once
+    def assignWeightsAndDerogatoryMarksToJobs(self, jobs: list[Job]) -> None:
+        results: dict[str, tuple[int, str | None]] = {}
+        for job in jobs:
+            propertyValue = getattr(job, self.fieldNameToTest)
+            result = results.get(propertyValue)
+            if result is None:
+                result = results[propertyValue] = self.__weigh(propertyValue)
+            self.__apply(job, *result)
+
+
+class RegexFilteringWeight(BaseWordFilteringWeight):
     regex: str
+    __compiledRegex: tuple[str, re.Pattern | None] # regex as it was when compiled, compiled regex
 
     def __init__(self, fieldNameToTest: str, weight: int, regex: str):
         super().__init__(fieldNameToTest, weight)
         self.regex = regex
+        self.__compiledRegex = (None, None)
+
+
+    # compiled once (and again if regex is changed), None if regex is blank
+    def getCompiledRegex(self) -> re.Pattern | None:
+        if self.__compiledRegex[0] != self.regex:
+            self.__compiledRegex = (self.regex, None if isNullOrWhiteSpace(self.regex) else re.compile(self.regex, re.IGNORECASE))
+        return self.__compiledRegex[1]
+
+    def findWords(self, propertyValue: str, firstOnly: bool) -> list[str]:
+        regex = self.getCompiledRegex()
+        if regex is None:
+            return []
+        if firstOnly:
+            match = regex.search(propertyValue)
+            return [ match.group() ] if match else []
+        return [ match.group() for match in regex.finditer(propertyValue) ]
+
+
+# Keywords listed in text files, one keyword or phrase per line (blank lines and lines starting with '#' are skipped),
+# for lists too long for a regex, such as thousands of staffing agency names. Keywords are matched as whole words, ignoring
+# case, and all of them at once (see KeywordMatcher), so matching costs the same however long the lists are.
+class KeywordFilteringWeight(BaseWordFilteringWeight):
+    keywordFilePaths: list[str]
+    __matcher: KeywordMatcher
+    __logger: Logger
+
+    # keywords can also be listed right here
+    def __init__(self, fieldNameToTest: str, weight: int, keywordFilePaths: list[str] = None, keywords: list[str] = None):
+        super().__init__(fieldNameToTest, weight)
+        self.keywordFilePaths = keywordFilePaths or []
+        self.__logger = getLogger(getSimpleModuleName(__name__))
+        self.__matcher = KeywordMatcher(chain(keywords or [], *map(self.__loadKeywords, self.keywordFilePaths)))
 
 
-    def assignWeightAndDerogatoryMarkToJob(self, job: Job) -> None:
-        if isNullOrWhiteSpace(self.regex):
-            return
-        
-        propertyValue = getattr(job, self.fieldNameToTest)
-        if self.weight < 0:
-            match = re.search(self.regex, propertyValue, re.IGNORECASE)
-            if match:
-                job.derogatoryMarks.append('Undesirable word in %s: \'%s\'' % ( self.fieldNameToTest, match.group() ) )
-                job.weight += self.weight
-        else:
-            matches = re.findall(self.regex, propertyValue, re.IGNORECASE)
-            job.weight += len(matches) * self.weight
+    def __loadKeywords(self, keywordFilePath: str) -> list[str]:
+        try:
+            with open(keywordFilePath, encoding='utf-8') as f:
+                return [ line for line in map(str.strip, f) if line and not line.startswith('#') ]
+        except OSError:
+            self.__logger.exception('Error reading keyword file at "%s". Jobs will not be weighed by keywords from it.', keywordFilePath)
+            return []
+
+    def findWords(self, propertyValue: str, firstOnly: bool) -> list[str]:
+        return self.__matcher.findAll(propertyValue)
 
 
 class SalaryFilteringWeight(BaseFilteringWeight):
-    __moneyRegex: str = r'[\d,\.]+'
     salaryMustBeNoLessThan: float
+    currency: str | None
 
-    def __init__(self, weight: int, salaryMustBeNoLessThan: float):
+    # salaryMustBeNoLessThan is annual; with currency, salaries in other currencies don't count (those that don't say which do)
+    def __init__(self, weight: int, salaryMustBeNoLessThan: float, currency: str = None):
         super().__init__('salaries', weight)
         self.salaryMustBeNoLessThan = salaryMustBeNoLessThan
+        self.currency = currency
 
 
     def assignWeightAndDerogatoryMarkToJob(self, job: Job) -> None:
-        salaryList = getattr(job, self.fieldNameToTest)
-        if salaryList:
-            for salaryRange in salaryList:
-                salaryLimitStrings = re.findall(self.__moneyRegex, salaryRange, re.IGNORECASE)
-                if salaryLimitStrings:
-                    higherSalaryLimitString = salaryLimitStrings[-1] # salary range is usually "$50,000.00 - $65,000.00 a year", we're getting "65,000.00"
-                    try:
-                        locale.setlocale(locale.LC_NUMERIC, 'en_US.UTF-8')
-                        higherSalaryLimit = locale.atof(higherSalaryLimitString)
-                        if higherSalaryLimit >= self.salaryMustBeNoLessThan:
-                            job.weight += self.weight
-                            break
-                    except (ValueError, locale.Error):
-                        pass
+        for salary in job.parsedSalaries: # "$59,108 - $75,652 a year" and "$30 - $40 an hour" both compare by what they pay in a year at most
+            if self.currency is not None and salary.currency is not None and salary.currency != self.currency:
+                continue
+            if salary.annualTopAmount >= self.salaryMustBeNoLessThan:
+                job.weight += self.weight
+                break
@@ -1,36 +1,47 @@
 #!/usr/bin/env python3
 
 import csv
+import gc
+from contextlib import contextmanager
 from pathlib import Path
-import itertools
 from datetime import datetime
+from typing import AsyncIterable, Callable, Iterable, Iterator
 from logging import getLogger, Logger
 
 from .filteringweight import BaseFilteringWeight
+from .compiledfilteringweights import CompiledFilteringWeights
+from .stoplistindex import StoplistIndex
 from ..jobinfo import *
+from ..jobbatch import JobBatch
+from ..salary import parseSalary
 from ..utility import isNullOrWhiteSpace, getTrimmedStringValueOrEmptyString, getSimpleModuleName
 from ..constants import DEROGATORY_MARK_WEIGHT_HANDICAP
 
 
 class JobProcessor:
     __stopListPath: str
-    __filteringWeights: list[BaseFilteringWeight]
+    __stoplistIndexPath: str | None
+    __filteringWeights: CompiledFilteringWeights | None
     __logAfterLines: int
     __logger: Logger
 
-    def __init__(self, stopListPath: str = None, filteringWeights: list[BaseFilteringWeight] = None):
+    # stoplistIndexPath is where stoplist compiled for matching is kept between runs, None to compile it every time
+    def __init__(self, stopListPath: str = None, filteringWeights: list[BaseFilteringWeight] = None, stoplistIndexPath: str = None):
         self.__stopListPath = stopListPath
-        self.__filteringWeights = filteringWeights
+        self.__stoplistIndexPath = stoplistIndexPath
+        self.__filteringWeights = CompiledFilteringWeights(filteringWeights) if filteringWeights else None
         self.__logAfterLines = 500
         self.__logger = getLogger(getSimpleModuleName(__name__))
 
-    def __setDerogatoryMarksAndWeightsByStoplist(self, jobs: list[Job]) -> None:
+    # returns stoplist entries as (title, company, reason), None if there is no stoplist to process jobs against
+    def __loadStoplist(self) -> list[tuple[str, str, str]] | None:
         if not self.__stopListPath or not Path(self.__stopListPath).is_file():
             self.__logger.warning('Expected to find stoplist at "%s" but it was not there. Jobs will not be processed against stoplist.', self.__stopListPath)
-            return
+            return None
 
         try:
             self.__logger.info('Processing jobs against stoplist at "%s"...', self.__stopListPath)
+            stoplist = []
             with open(self.__stopListPath, newline='', encoding='utf-8') as f:
                 reader = csv.DictReader(f)
                 lineCounter = 1
@@ -40,56 +51,213 @@ class JobProcessor:
                     if isNullOrWhiteSpace(t) and isNullOrWhiteSpace(c):
                         self.__logger.warning('Encountered stoplist entry where both job title and company name are blank, skipping it.')
                         continue
-
-                    for job in jobs:
-                        if ((isNullOrWhiteSpace(t) or t.casefold() == job.title.casefold()) and 
-                            (isNullOrWhiteSpace(c) or c.casefold() == job.company.casefold())):
-                            # 'Stoplist entry found for job title = "A" and company name = "B" with reason: C'
-                            stoplistObjectArray = [ ('job title', t), ('company name', c) ]
-                            stoplistObjectString = ' and '.join(map(lambda elem: '%s = \'%s\'' % (elem[0], elem[1]), filter(lambda elem: elem[1], stoplistObjectArray)))
-                            job.derogatoryMarks.append('Stoplist entry found for %s with reason: %s' % (stoplistObjectString, stoplistObject.get('reason')))
-                            job.weight += DEROGATORY_MARK_WEIGHT_HANDICAP
+                    stoplist.append((t, c, stoplistObject.get('reason')))
 
                     if not lineCounter % self.__logAfterLines:
                         self.__logger.info('Processed %d items of stoplist...', lineCounter)
                     lineCounter += 1
-
-            self.__logger.info('Finished processing jobs against stoplist at "%s".', self.__stopListPath)
+            return stoplist
         except csv.Error:
             self.__logger.exception('Error processing stoplist file at "%s".', self.__stopListPath)
         except OSError:
             self.__logger.exception('Error reading stoplist file at "%s".', self.__stopListPath)
-        
+        return None
 
-    def processJobs(self, jobs: list[JobInfo]) -> list[Job]:
-        groupedJobs = []
-        
-        if jobs:
-            # group jobs by title and company
-            lmbdGroup = lambda job: JobKey(job.title, job.company)
-            for key, value in itertools.groupby(sorted(jobs, key=lmbdGroup), lmbdGroup):
-                minDatePosted = datetime.now()
-                locations = set()
-                salaries = set()
-                for job in value:
-                    if job.datePosted < minDatePosted:
-                        minDatePosted = job.datePosted
-                    locations.add(JobLocation(job.location, job.jobLink))
-                    if job.salary:
-                        salaries.add(job.salary)
-                groupedJobs.append(Job(key.title, key.company, minDatePosted, list(locations), list(salaries)))
-
-            # process jobs against stoplist:
-            self.__setDerogatoryMarksAndWeightsByStoplist(groupedJobs)
+    # stoplist compiled on a previous run is used as long as the stoplist file stays the same
+    def __loadStoplistIndex(self) -> StoplistIndex | None:
+        if self.__stoplistIndexPath and self.__stopListPath and Path(self.__stopListPath).is_file():
+            stoplistIndex = StoplistIndex.loadCached(self.__stoplistIndexPath, self.__stopListPath)
+            if stoplistIndex is not None:
+                self.__logger.info('Processing jobs against stoplist at "%s" (%d entries, compiled before)...', self.__stopListPath, len(stoplistIndex))
+                return stoplistIndex
+
+        stoplist = self.__loadStoplist()
+        if stoplist is None:
+            return None
+        stoplistIndex = StoplistIndex(stoplist)
+        if self.__stoplistIndexPath:
+            try:
+                stoplistIndex.saveCached(self.__stoplistIndexPath, self.__stopListPath)
+            except OSError:
+                self.__logger.exception('Error saving compiled stoplist to "%s".', self.__stoplistIndexPath)
+        return stoplistIndex
+
+    @staticmethod
+    def __setDerogatoryMarksAndWeightsByStoplist(stoplistIndex: StoplistIndex, job: Job) -> None:
+        for t, c, reason in stoplistIndex.getMatches(job.key):
+            # 'Stoplist entry found for job title = "A" and company name = "B" with reason: C'
+            stoplistObjectArray = [ ('job title', t), ('company name', c) ]
+            stoplistObjectString = ' and '.join(map(lambda elem: '%s = \'%s\'' % (elem[0], elem[1]), filter(lambda elem: elem[1], stoplistObjectArray)))
+            job.derogatoryMarks.append('Stoplist entry found for %s with reason: %s' % (stoplistObjectString, reason))
+            job.weight += DEROGATORY_MARK_WEIGHT_HANDICAP
+
+    # returns how many usable entries the stoplist has, None if it can't be used; problems with entries are logged
+    def validateStoplist(self) -> int | None:
+        stoplist = self.__loadStoplist()
+        if stoplist is not None:
+            self.__logger.info('Stoplist at "%s" has %d usable entries', self.__stopListPath, len(stoplist))
+        return None if stoplist is None else len(stoplist)
+
+    # jobs can also be a JobBatch, the cheapest way to process a lot of them at once
+    def processJobs(self, jobs: list[JobInfo] | JobBatch) -> list[Job]:
+        return self.processJobBatches([ jobs ])
+
+    # Jobs can come in batches (e.g. page by page, while they are still being loaded): every batch is grouped and checked against
+    # stoplist right away, only filtering weights (which may depend on all locations and salaries of a group) and sorting are left
+    # for the end. Job infos themselves are not kept once they are added to their groups. Batches can be lists or JobBatches.
+    def processJobBatches(self, batches: Iterable[list[JobInfo] | JobBatch]) -> list[Job]:
+        grouping = _JobGrouping(self.__loadStoplistIndex, self.__setDerogatoryMarksAndWeightsByStoplist, pauseGarbageCollection = True)
+        for batch in batches:
+            grouping.add(batch)
+        return self.__finishProcessing(grouping)
+
+    # garbage collection is left alone here, it's the whole process's and the crawl is still running in it
+    async def processJobBatchesAsync(self, batches: AsyncIterable[list[JobInfo] | JobBatch]) -> list[Job]:
+        import asyncio # takes a while to import (ssl with it), commands that only process jobs don't need it
+        grouping = _JobGrouping(self.__loadStoplistIndex, self.__setDerogatoryMarksAndWeightsByStoplist)
+        async for batch in batches:
+            await asyncio.to_thread(grouping.add, batch) # don't hold up the event loop that is loading the next batches
+        return self.__finishProcessing(grouping)
+
+    def __finishProcessing(self, grouping: '_JobGrouping') -> list[Job]:
+        groupedJobs = grouping.finish()
+        if groupedJobs:
+            if grouping.isStoplistLoaded:
+                self.__logger.info('Finished processing jobs against stoplist at "%s".', self.__stopListPath)
 
             # process jobs against regexes:
             if self.__filteringWeights:
-                for groupedJob in groupedJobs:
-                    for filteringWeight in self.__filteringWeights:
-                        filteringWeight.assignWeightAndDerogatoryMarkToJob(groupedJob)
+                self.__filteringWeights.assignWeightsAndDerogatoryMarksToJobs(groupedJobs)
 
             groupedJobs.sort(key = lambda groupedJob: (groupedJob.weight, groupedJob.datePosted), reverse = True)
 
-            self.__logger.info('Processed %d jobs and grouped them into %d groups', len(jobs), len(groupedJobs))
+            self.__logger.info('Processed %d jobs and grouped them into %d groups', grouping.jobCount, len(groupedJobs))
+
+        return groupedJobs
+
+
+# Groups jobs by title and company as they come. New groups are checked against stoplist as soon as they appear
+# (title and company of a group never change), the stoplist itself is loaded when the first job comes.
+# Jobs are grouped by keys that are casefolded once: job infos have theirs already, and for JobBatches they are casefolded once
+# per distinct title and company. Earliest posting dates are kept as numbers until the end, and a group none of whose jobs
+# tell when they were posted gets the time grouping finished as its date. Search labels of a group are put together at the end
+# too: the jobs' own lists are kept until then, names of searches that find a job after it was grouped are added to them
+# (see CrawlEngine.streamSearchesAsync).
+class _JobGrouping:
+    __loadStoplist: Callable[[], StoplistIndex | None]
+    __applyStoplist: Callable[[StoplistIndex, Job], None]
+    __stoplist: StoplistIndex | None
+    # key -> [ grouped job, locations by key, salaries (as dict keys, to keep their order), earliest date number, search label lists by id ]
+    __groups: dict[tuple[str, str], list]
+    __pauseGarbageCollection: bool
+    isStoplistLoaded: bool
+    jobCount: int
 
-        return groupedJobs
\ No newline at end of file
+    def __init__(self, loadStoplist: Callable[[], StoplistIndex | None], applyStoplist: Callable[[StoplistIndex, Job], None],
+                 pauseGarbageCollection: bool = False):
+        self.__loadStoplist = loadStoplist
+        self.__applyStoplist = applyStoplist
+        self.__stoplist = None
+        self.__groups = {}
+        self.__pauseGarbageCollection = pauseGarbageCollection
+        self.isStoplistLoaded = False
+        self.jobCount = 0
+
+    def __addGroup(self, key: tuple[str, str], title: str, company: str) -> list:
+        groupedJob = Job(title, company, None, [], [], key = key)
+        if self.__stoplist: # three lookups whatever the size of stoplist, see StoplistIndex
+            self.__applyStoplist(self.__stoplist, groupedJob)
+        group = self.__groups[key] = [ groupedJob, {}, {}, JobBatch.NO_DATE, {} ]
+        return group
+
+    # Grouping creates a few objects per job, none of them in reference cycles: with hundreds of thousands of jobs,
+    # garbage collections it would set off go through every job there is time and again and find nothing to collect.
+    # Garbage collection is the whole process's, it's only paused for callers that have the process to themselves.
+    @contextmanager
+    def __pausedGarbageCollection(self) -> Iterator[None]:
+        if not self.__pauseGarbageCollection:
+            yield
+            return
+        wasEnabled = gc.isenabled()
+        gc.disable()
+        try:
+            yield
+        finally:
+            if wasEnabled:
+                gc.enable()
+
+    def add(self, jobs: list[JobInfo] | JobBatch) -> None:
+        if not len(jobs):
+            return
+        if self.jobCount == 0:
+            self.__stoplist = self.__loadStoplist()
+            self.isStoplistLoaded = self.__stoplist is not None
+
+        with self.__pausedGarbageCollection():
+            if isinstance(jobs, JobBatch):
+                self.__addRows(self.__getBatchRows(jobs))
+            else:
+                for salary in { job.salary for job in jobs }:
+                    parseSalary(salary) # while pages are still loading, filtering weights will get parsed salaries from cache
+                self.__addRows(self.__getJobRows(jobs))
+        self.jobCount += len(jobs)
+
+    # Rows of a batch are read straight from its columns: keys are casefolded once per distinct title and company,
+    # strings come from the values of their columns by code.
+    @staticmethod
+    def __getBatchRows(batch: JobBatch) -> Iterator[tuple]:
+        for salary in batch.salaries.values:
+            parseSalary(salary)
+        titleKeys = [ title.casefold() if title else '' for title in batch.titles.values ]
+        companyKeys = [ company.casefold() if company else '' for company in batch.companies.values ]
+        keys = map(lambda titleCode, companyCode: (titleKeys[titleCode], companyKeys[companyCode]), batch.titles.codes, batch.companies.codes)
+        return zip(keys, map(batch.titles.values.__getitem__, batch.titles.codes), map(batch.companies.values.__getitem__, batch.companies.codes),
+                   batch.links, map(batch.locations.values.__getitem__, batch.locations.codes), map(batch.salaries.values.__getitem__, batch.salaries.codes),
+                   batch.datesPosted, map(batch.descriptions.values.__getitem__, batch.descriptions.codes), batch.searchLabels)
+
+    # job infos have their keys already, posting dates are turned into numbers once per distinct date
+    @staticmethod
+    def __getJobRows(jobs: list[JobInfo]) -> Iterator[tuple]:
+        dateNumbers: dict[datetime | None, int] = {}
+        for job in jobs:
+            dateNumber = dateNumbers.get(job.datePosted)
+            if dateNumber is None:
+                dateNumber = dateNumbers[job.datePosted] = JobBatch.toDateNumber(job.datePosted)
+            yield job.key, job.title, job.company, job.jobLink, job.location, job.salary, dateNumber, job.description, job.searchLabels
+
+    # rows are (key, title, company, link, location, salary, date number, description, search labels)
+    def __addRows(self, rows: Iterator[tuple]) -> None:
+        groups = self.__groups
+        locationKeys: dict[str, str] = {} # casefolded once per distinct location
+        for key, title, company, link, location, salary, datePosted, description, searchLabels in rows:
+            group = groups.get(key)
+            if group is None:
+                group = self.__addGroup(key, title, company)
+
+            if datePosted < group[3]:
+                group[3] = datePosted
+            locationKey = locationKeys.get(location)
+            if locationKey is None:
+                locationKey = locationKeys[location] = location.casefold() if location else ''
+            locationKey = (link.casefold() if link else '', locationKey)
+            if locationKey not in group[1]:
+                group[1][locationKey] = JobLocation(location, link)
+            if salary:
+                group[2][salary] = None
+            if description and not group[0].description:
+                group[0].description = description
+            if searchLabels:
+                group[4][id(searchLabels)] = searchLabels
+
+    def finish(self) -> list[Job]:
+        groupedJobs = []
+        now = datetime.now()
+        with self.__pausedGarbageCollection():
+            for key in sorted(self.__groups): # same order as grouping all jobs at once
+                groupedJob, locations, salaries, datePosted, searchLabels = self.__groups[key]
+                groupedJob.locations = list(locations.values())
+                groupedJob.salaries = list(salaries)
+                groupedJob.datePosted = JobBatch.fromDateNumber(datePosted) or now
+                groupedJob.searchLabels = list(dict.fromkeys(name for labels in searchLabels.values() for name in labels))
+                groupedJobs.append(groupedJob)
+        return groupedJobs
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+
+from typing import Iterable
+
+# Finds whole words and phrases from a list of keywords in a text, ignoring case and differences in whitespace.
+# Keywords are compiled into an Aho-Corasick automaton: a text is read once, a character at a time, however many keywords
+# there are, so lists of thousands of agency names cost about as much to match as a list of ten.
+class KeywordMatcher:
+    __transitions: list[dict[str, int]] # by state: next state by character; state 0 is the start
+    __failures: list[int] # by state: state for the longest suffix of what was read that is also a prefix of some keyword
+    __lengths: list[int] # by state: length of the keyword it completes, 0 if none
+    __outputs: list[int] # by state: nearest state down its failure chain that completes a keyword, -1 if none
+    __keywordCount: int
+
+    def __init__(self, keywords: Iterable[str]):
+        self.__transitions = [ {} ]
+        self.__lengths = [ 0 ]
+        self.__keywordCount = 0
+        for keyword in keywords:
+            foldedKeyword = self.__fold(keyword.strip())[0]
+            if not foldedKeyword:
+                continue
+            state = 0
+            for c in foldedKeyword:
+                nextState = self.__transitions[state].get(c)
+                if nextState is None:
+                    nextState = self.__transitions[state][c] = len(self.__transitions)
+                    self.__transitions.append({})
+                    self.__lengths.append(0)
+                state = nextState
+            if not self.__lengths[state]:
+                self.__keywordCount += 1
+            self.__lengths[state] = len(foldedKeyword)
+        self.__buildFailures()
+
+    # breadth first, so that failures of shorter prefixes are there when longer ones need them
+    def __buildFailures(self) -> None:
+        self.__failures = [ 0 ] * len(self.__transitions)
+        self.__outputs = [ -1 ] * len(self.__transitions)
+        queue = list(self.__transitions[0].values())
+        for state in queue:
+            for c, nextState in self.__transitions[state].items():
+                failure = self.__failures[state]
+                while failure and c not in self.__transitions[failure]:
+                    failure = self.__failures[failure]
+                failure = self.__transitions[failure].get(c, 0)
+                self.__failures[nextState] = failure
+                self.__outputs[nextState] = failure if self.__lengths[failure] else self.__outputs[failure]
+                queue.append(nextState)
+
+    # casefolded text with runs of whitespace made single spaces, and where every character of it came from in text
+    @staticmethod
+    def __fold(text: str) -> tuple[str, list[int]]:
+        foldedCharacters = []
+        positions = []
+        isAfterSpace = False
+        for i, c in enumerate(text):
+            if c.isspace():
+                if isAfterSpace:
+                    continue
+                c = ' '
+            isAfterSpace = c == ' '
+            for foldedCharacter in c.casefold(): # 'ß' is 'ss'
+                foldedCharacters.append(foldedCharacter)
+                positions.append(i)
+        return ''.join(foldedCharacters), positions
+
+    @staticmethod
+    def __isWordCharacter(c: str) -> bool:
+        return c.isalnum() or c == '_'
+
+    def __len__(self) -> int:
+        return self.__keywordCount
+
+    # Returns keywords found in text, as they are written there, in order. A keyword is only found where it doesn't start or end
+    # in the middle of a word ('hire' is not in 'Hired Hands'), and found keywords don't overlap: of keywords that start at the same place
+    # the longest one is taken ('talent partners' rather than 'talent').
+    def findAll(self, text: str) -> list[str]:
+        if not text or not self.__keywordCount:
+            return []
+        foldedText, positions = self.__fold(text)
+        spans = []
+        state = 0
+        for end, c in enumerate(foldedText, 1):
+            while state and c not in self.__transitions[state]:
+                state = self.__failures[state]
+            state = self.__transitions[state].get(c, 0)
+            output = state if self.__lengths[state] else self.__outputs[state]
+            while output != -1:
+                start = end - self.__lengths[output]
+                if self.__isWholeWords(foldedText, start, end):
+                    spans.append((start, end))
+                output = self.__outputs[output]
+
+        found = []
+        foundEnd = 0
+        for start, end in sorted(spans, key = lambda span: (span[0], -span[1])):
+            if start >= foundEnd:
+                found.append(text[positions[start]:positions[end - 1] + 1])
+                foundEnd = end
+        return found
+
+    def __isWholeWords(self, foldedText: str, start: int, end: int) -> bool:
+        return ((start == 0 or not (self.__isWordCharacter(foldedText[start - 1]) and self.__isWordCharacter(foldedText[start]))) and
+                (end == len(foldedText) or not (self.__isWordCharacter(foldedText[end - 1]) and self.__isWordCharacter(foldedText[end]))))
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+
+import hashlib
+import os
+import pickle
+from pathlib import Path
+from logging import getLogger
+
+from ..utility import isNullOrWhiteSpace, getSimpleModuleName
+
+# Stoplist entries (title, company, reason) indexed by casefolded title, company, or both, whichever the entry has,
+# so that a job is checked against the whole stoplist with three dictionary lookups.
+class StoplistIndex:
+    __cacheFormatVersion: int = 1
+    __entries: list[tuple[str, str, str]]
+    __byTitle: dict[str, list[int]] # entries by position in stoplist
+    __byCompany: dict[str, list[int]]
+    __byTitleAndCompany: dict[tuple[str, str], list[int]]
+
+    def __init__(self, entries: list[tuple[str, str, str]]):
+        self.__entries = entries
+        self.__byTitle = {}
+        self.__byCompany = {}
+        self.__byTitleAndCompany = {}
+        for i, (t, c, reason) in enumerate(entries):
+            if isNullOrWhiteSpace(c):
+                self.__byTitle.setdefault(t.casefold(), []).append(i)
+            elif isNullOrWhiteSpace(t):
+                self.__byCompany.setdefault(c.casefold(), []).append(i)
+            else:
+                self.__byTitleAndCompany.setdefault((t.casefold(), c.casefold()), []).append(i)
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    # jobKey is casefolded (title, company) of a job, see JobKey.key; entries come in stoplist order
+    def getMatches(self, jobKey: tuple[str, str]) -> list[tuple[str, str, str]]:
+        positions = self.__byTitle.get(jobKey[0], []) + self.__byCompany.get(jobKey[1], []) + self.__byTitleAndCompany.get(jobKey, [])
+        return [ self.__entries[i] for i in sorted(positions) ]
+
+    @staticmethod
+    def __getFileHash(filePath: str) -> str:
+        with open(filePath, 'rb') as f:
+            return hashlib.file_digest(f, 'sha256').hexdigest()
+
+    # Returns the index compiled from the stoplist before, None if there is none or the stoplist changed since.
+    # A stoplist that was touched but not changed (same hash, new modification time) doesn't need compiling again.
+    @staticmethod
+    def loadCached(cacheFilePath: str, stoplistPath: str) -> 'StoplistIndex | None':
+        try:
+            with open(cacheFilePath, 'rb') as f:
+                cache = pickle.load(f)
+            if cache.get('version') != StoplistIndex.__cacheFormatVersion:
+                return None
+            stat = os.stat(stoplistPath)
+            if (cache['stoplistModifiedAt'], cache['stoplistSize']) == (stat.st_mtime_ns, stat.st_size):
+                return cache['index']
+            if cache['stoplistHash'] != StoplistIndex.__getFileHash(stoplistPath):
+                return None
+            cache['index'].saveCached(cacheFilePath, stoplistPath, cache['stoplistHash']) # don't hash it again next time
+            return cache['index']
+        except FileNotFoundError:
+            return None
+        except Exception: # unpickling can fail in all sorts of ways
+            getLogger(getSimpleModuleName(__name__)).warning('Compiled stoplist at "%s" is damaged, compiling stoplist again', cacheFilePath)
+            return None
+
+    def saveCached(self, cacheFilePath: str, stoplistPath: str, stoplistHash: str = None) -> None:
+        stat = os.stat(stoplistPath)
+        cache = { 'version': StoplistIndex.__cacheFormatVersion, 'stoplistModifiedAt': stat.st_mtime_ns, 'stoplistSize': stat.st_size,
+                  'stoplistHash': stoplistHash or self.__getFileHash(stoplistPath), 'index': self }
+        Path(cacheFilePath).parent.mkdir(parents=True, exist_ok=True)
+        temporaryFilePath = cacheFilePath + '.tmp'
+        with open(temporaryFilePath, 'wb') as f:
+            pickle.dump(cache, f, protocol = pickle.HIGHEST_PROTOCOL)
+        os.replace(temporaryFilePath, cacheFilePath)
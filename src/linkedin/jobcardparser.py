@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+
+from html.parser import HTMLParser
+
+# Parses job cards out of the html that Linkedin's guest job api returns (a list of <li> elements, no <html> around them).
+# Produces the same job card dictionaries as JobLoader's page extraction script does in the browser,
+# so both loaders map them to JobInfo in exactly the same way.
+class JobCardParser(HTMLParser):
+    __voidElements: frozenset = frozenset([ 'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'track', 'wbr' ])
+    __jobCardClass: str = 'base-search-card--link'
+    __commonFieldClasses: dict = { 'location': 'job-search-card__location', 'salary': 'job-search-card__salary-info' }
+    # Every once in a while Linkedin would try and generate a weird job element that looks normal but its html is nothing like standard.
+    # It's an <a> with title and company in different elements, but we'll parse it nonetheless
+    __linkCardFieldClasses: dict = { 'title': 'base-search-card__title', 'company': 'base-search-card__subtitle' }
+    __standardCardFieldClasses: dict = { 'title': 'base-card__full-link', 'company': 'hidden-nested-link' }
+
+    __jobCards: list[dict]
+    __openTags: list[str]
+    __currentCard: dict | None
+    __currentCardDepth: int
+    __currentCardFieldClasses: dict
+    __capturedFields: dict[str, int] # field name -> depth of element whose text is being captured
+    __capturedText: dict[str, list[str]]
+
+    def __init__(self):
+        super().__init__(convert_charrefs = True)
+        self.__jobCards = []
+        self.__openTags = []
+        self.__currentCard = None
+        self.__currentCardDepth = 0
+        self.__currentCardFieldClasses = {}
+        self.__capturedFields = {}
+        self.__capturedText = {}
+
+    @staticmethod
+    def parseJobCards(html: str) -> list[dict]:
+        parser = JobCardParser()
+        parser.feed(html)
+        parser.close()
+        return parser.__jobCards
+
+    def __startCard(self, tag: str, attributes: dict) -> None:
+        self.__currentCard = { 'title': '', 'company': '', 'link': '', 'location': '', 'salary': '', 'datePosted': '' }
+        self.__currentCardDepth = len(self.__openTags)
+        if tag == 'a':
+            self.__currentCardFieldClasses = { **self.__linkCardFieldClasses, **self.__commonFieldClasses }
+            self.__currentCard['link'] = attributes.get('href') or ''
+        else:
+            self.__currentCardFieldClasses = { **self.__standardCardFieldClasses, **self.__commonFieldClasses }
+        self.__capturedFields = {}
+        self.__capturedText = {}
+
+    def __finishCard(self) -> None:
+        for field, textParts in self.__capturedText.items():
+            self.__currentCard[field] = ' '.join(''.join(textParts).split())
+        self.__jobCards.append(self.__currentCard)
+        self.__currentCard = None
+
+    def __startElementInCard(self, tag: str, attributes: dict, classes: list[str]) -> None:
+        for field, fieldClass in self.__currentCardFieldClasses.items():
+            if fieldClass in classes and field not in self.__capturedText: # first matching element wins, like querySelector
+                self.__capturedFields[field] = len(self.__openTags)
+                self.__capturedText[field] = []
+                if field == 'title' and not self.__currentCard['link']: # standard card: title element is the job link
+                    self.__currentCard['link'] = attributes.get('href') or ''
+
+        if tag == 'time' and not self.__currentCard['datePosted']:
+            self.__currentCard['datePosted'] = attributes.get('datetime') or '' # <time class="job-search-card__listdate--new" datetime="2023-06-19">
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        attributes = dict(attrs)
+        classes = (attributes.get('class') or '').split()
+
+        if self.__currentCard is None:
+            if self.__jobCardClass in classes:
+                self.__startCard(tag, attributes)
+        else:
+            self.__startElementInCard(tag, attributes, classes)
+
+        if tag not in self.__voidElements:
+            self.__openTags.append(tag)
+
+    def handle_startendtag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        self.handle_starttag(tag, attrs)
+        if tag not in self.__voidElements:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag not in self.__openTags:
+            return # stray end tag, ignore it like browsers do
+
+        # pop everything up to the matching start tag, this also closes elements whose end tags were omitted
+        while self.__openTags:
+            openTag = self.__openTags.pop()
+            depth = len(self.__openTags)
+            for field in [ field for field, fieldDepth in self.__capturedFields.items() if fieldDepth == depth ]:
+                del self.__capturedFields[field]
+            if self.__currentCard is not None and depth == self.__currentCardDepth:
+                self.__finishCard()
+            if openTag == tag:
+                break
+
+    def handle_data(self, data: str) -> None:
+        for field in self.__capturedFields:
+            self.__capturedText[field].append(data)
+
+    def close(self) -> None:
+        super().close()
+        if self.__currentCard is not None: # fragment ended before the card was closed
+            self.__finishCard()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+
+from contextlib import contextmanager
+from typing import Iterator
+
+from ..constants import LINKEDIN_HOST, LINKEDIN_JOB_LOADING_LIMIT
+from ..base.httpclient import HttpClient, HttpResponse
+from ..base.pageprefetcher import PagePrefetcher
+from ..base.elementtextparser import ElementTextParser
+from ..base.basesearchparams import BaseSearchParams
+from .linkedinjobloader import JobLoader
+from .jobcardparser import JobCardParser
+from .urlbuilder import UrlBuilder
+
+# Loads jobs from Linkedin's guest job api without a browser: every page is a plain html fragment with job cards
+# that is fetched over a kept alive http connection and parsed with JobCardParser.
+class HttpJobLoader(JobLoader):
+    _rawPageFormat: str = 'httpresponse' # see HttpResponse.toDict
+    __httpClient: HttpClient
+    __prefetcher: PagePrefetcher
+
+    def __init__(self, httpClient: HttpClient, host: str = LINKEDIN_HOST):
+        super().__init__(None, host, __name__)
+        self.__httpClient = httpClient
+        self.__prefetcher = PagePrefetcher()
+
+    @contextmanager
+    def _openSession(self) -> Iterator[None]:
+        yield # no browser needed
+
+    def _getFirstPageUrl(self, searchParams: BaseSearchParams) -> str:
+        return UrlBuilder.buildUrl(searchParams, { 'partial': True }, self._host)
+
+    def _getJobCountLimit(self, page: dict) -> int:
+        if page['count'] is None: # job api pages don't tell how many jobs were found, load until they run out
+            return LINKEDIN_JOB_LOADING_LIMIT
+        return super()._getJobCountLimit(page)
+
+    def _fetchPage(self, url: str) -> HttpResponse:
+        return self.__httpClient.get(url)
+
+    def _startPrefetch(self, url: str) -> None:
+        self.__prefetcher.start(url, self._fetchPage)
+
+    def _takePrefetchedPage(self, url: str) -> HttpResponse:
+        return self.__prefetcher.take(url, self._fetchPage)
+
+    def _discardPrefetchedPage(self) -> None:
+        self.__prefetcher.discard()
+
+    def _encodeRawPage(self, response: HttpResponse) -> dict:
+        return response.toDict()
+
+    def _decodeRawPage(self, payload: dict) -> HttpResponse:
+        return HttpResponse.fromDict(payload)
+
+    def _parsePage(self, url: str, response: HttpResponse) -> dict:
+        if not response.ok:
+            self._logger.warning('Got http status %d from url = "%s"', response.status, url)
+            return { 'jobs': [], 'count': None, 'next': None, 'blocked': True }
+        jobCards = JobCardParser.parseJobCards(response.body)
+        if not jobCards:
+            # the api answers a search that found nothing (or a page past the last one) with an empty body, that's a healthy page;
+            # a page that has something in it but no job cards (a sign in wall, a captcha) is a block page, whichever page it is
+            if not response.body.strip():
+                return { 'jobs': [], 'count': '0', 'next': None }
+            self._logger.warning('Got a page without job cards from url = "%s"', url)
+            return { 'jobs': [], 'count': None, 'next': None, 'blocked': True }
+        return { 'jobs': jobCards, 'count': None, 'next': None }
+
+    def _fetchJobDescription(self, jobLink: str) -> str | None:
+        response = self.__httpClient.get(jobLink)
+        if not response.ok:
+            self._logger.warning('Got http status %d from url = "%s"', response.status, jobLink)
+            return None
+        return (ElementTextParser.getElementText(response.body, elementClass = 'show-more-less-html__markup')
+                or ElementTextParser.getElementText(response.body, elementClass = 'description__text'))
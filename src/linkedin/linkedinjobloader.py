@@ -1,117 +1,114 @@
 from datetime import datetime
-from selenium.webdriver.chrome.webdriver import WebDriver
-from selenium.webdriver.remote.webelement import WebElement
-from selenium.webdriver.common.by import By
-from selenium.common.exceptions import NoSuchElementException
 import re
-from multiprocessing.managers import AcquirerProxy
 
-from ..constants import LINKEDIN_JOB_LOADING_LIMIT, LINKEDIN_PAGE_SIZE
+from ..constants import LINKEDIN_HOST, LINKEDIN_JOB_LOADING_LIMIT, LINKEDIN_PAGE_SIZE
 from ..base.basejobloader import BaseJobLoader
+from ..base.driverpool import DriverPool
 from ..utility import getTrimmedStringValueOrEmptyString
 from ..jobinfo import JobInfo
 from ..base.basesearchparams import BaseSearchParams
 from .urlbuilder import UrlBuilder
+from .enums import JobType, ExperienceLevel
 
 class JobLoader(BaseJobLoader):
-    def __init__(self, driver: WebDriver, lock: AcquirerProxy, tabNumber: int):
-        super().__init__(driver, lock, tabNumber, __name__)
-
-    def __getElementTextOrEmptyString(self, element: WebElement) -> str:
-        return getTrimmedStringValueOrEmptyString(element.text) if element else ''
-    
-    def __getElementAttributeOrEmptyString(self, element: WebElement, attributeName: str) -> str:
-        return getTrimmedStringValueOrEmptyString(element.get_attribute(attributeName)) if element else ''
-        
-    def __findElementInElementWithoutException(self, element: WebElement, by: By, selector: str):
-        try:
-            return element.find_element(by, selector)
-        except NoSuchElementException:
-            return None
+    _host: str
+    _pageExtractionScript: str = '''
+        function getText(element) { return element ? (element.innerText || element.textContent || '') : ''; }
+        function getAttribute(element, name) { return element ? (element[name] || element.getAttribute(name) || '') : ''; }
+
+        var jobElements = Array.from(document.getElementsByClassName('base-search-card--link'));
+        var jobs = jobElements.map(function(jobElement) {
+            var titleElement, companyElement, jobLinkElement;
+            if (jobElement.tagName.toLowerCase() === 'a') {
+                // Every once in a while Linkedin would try and generate a weird job element that looks normal but its html is nothing like standard.
+                // But we'll parse it nonetheless
+                titleElement = jobElement.querySelector('.base-search-card__title');
+                companyElement = jobElement.querySelector('.base-search-card__subtitle');
+                jobLinkElement = jobElement;
+            } else {
+                // Normal standard boring job element
+                titleElement = jobElement.querySelector('.base-card__full-link');
+                companyElement = jobElement.querySelector('.hidden-nested-link');
+                jobLinkElement = titleElement;
+            }
+            return {
+                title: getText(titleElement),
+                company: getText(companyElement),
+                link: getAttribute(jobLinkElement, 'href'),
+                location: getText(jobElement.querySelector('.job-search-card__location')),
+                salary: getText(jobElement.querySelector('.job-search-card__salary-info')),
+                datePosted: getAttribute(jobElement.querySelector('time'), 'dateTime') // <time class="job-search-card__listdate--new" datetime="2023-06-19">
+            };
+        });
+
+        var countElement = document.querySelector('.results-context-header__job-count');
+        return { jobs: jobs, count: countElement ? getText(countElement) : null, next: null };'''
+
+    _jobDescriptionScript: str = '''
+        var descriptionElement = document.querySelector('.show-more-less-html__markup') || document.querySelector('.description__text');
+        return descriptionElement ? (descriptionElement.innerText || descriptionElement.textContent) : null;'''
 
-    def __parseJob(self, jobElement: WebElement) -> JobInfo:
-        if jobElement.tag_name == 'a':
-            # Every once in a while Linkedin would try and generate a weird job element that looks normal but its html is nothing like standard.
-            # But we'll parse it nonetheless
-            titleElement = self.__findElementInElementWithoutException(jobElement, By.CLASS_NAME, 'base-search-card__title')
-            companyElement = self.__findElementInElementWithoutException(jobElement, By.CLASS_NAME, 'base-search-card__subtitle')
-            joblinkElement = jobElement
-        else:
-            # Normal standard boring job element
-            titleElement = self.__findElementInElementWithoutException(jobElement, By.CLASS_NAME, 'base-card__full-link')
-            companyElement = self.__findElementInElementWithoutException(jobElement, By.CLASS_NAME, 'hidden-nested-link')
-            joblinkElement = titleElement
-
-        locationElement = self.__findElementInElementWithoutException(jobElement, By.CLASS_NAME, 'job-search-card__location')
-        salaryElement = self.__findElementInElementWithoutException(jobElement, By.CLASS_NAME, 'job-search-card__salary-info')
-        dateElement = self.__findElementInElementWithoutException(jobElement, By.TAG_NAME, 'time') # <time class="job-search-card__listdate--new" datetime="2023-06-19">
-
-        postedDateString = self.__getElementAttributeOrEmptyString(dateElement, 'datetime')
+    _shardFacets: list[tuple[str, list]] = [ ('jobType', list(JobType)), ('experienceLevel', list(ExperienceLevel)) ]
+
+    def __init__(self, driverPool: DriverPool, host: str = LINKEDIN_HOST, loggerName: str = __name__):
+        super().__init__(driverPool, loggerName)
+        self._host = host
+
+    def __mapJobCardToJobInfo(self, jobCard: dict) -> JobInfo:
+        postedDateString = getTrimmedStringValueOrEmptyString(jobCard.get('datePosted'))
         
-        return JobInfo(self.__getElementTextOrEmptyString(titleElement),
-            self.__getElementTextOrEmptyString(companyElement),
-            re.sub(r'\?.+', '', (self.__getElementAttributeOrEmptyString(joblinkElement, 'href'))), # cut off useless url tracking parameters
-            self.__getElementTextOrEmptyString(locationElement),
-            self.__getElementTextOrEmptyString(salaryElement),
-            datetime.now() if not postedDateString else datetime.strptime(postedDateString, '%Y-%m-%d')
+        return JobInfo(getTrimmedStringValueOrEmptyString(jobCard.get('title')),
+            getTrimmedStringValueOrEmptyString(jobCard.get('company')),
+            re.sub(r'\?.+', '', getTrimmedStringValueOrEmptyString(jobCard.get('link'))), # cut off useless url tracking parameters
+            getTrimmedStringValueOrEmptyString(jobCard.get('location')),
+            getTrimmedStringValueOrEmptyString(jobCard.get('salary')),
+            None if not postedDateString else datetime.strptime(postedDateString, '%Y-%m-%d') # not the time of the crawl, see CrawlHistory
         )
+
+    def _getFirstPageUrl(self, searchParams: BaseSearchParams) -> str:
+        return UrlBuilder.buildUrl(searchParams, host = self._host)
+
+    # job links look like https://www.linkedin.com/jobs/view/truck-driver-at-some-company-3612345678
+    def getJobId(self, jobLink: str) -> str:
+        match = re.search(r'/jobs/view/(?:[^/?#]*-)?(\d+)/?(?:[?#]|$)', jobLink)
+        return 'linkedin:' + match.group(1) if match else super().getJobId(jobLink)
         
-    def __threadSafeGetJobCountLimit(self) -> int:
-        try:
-            with self._lock:
-                self._switchToProperTab()
-                totalJobsFoundElement = self._driver.find_element(By.CLASS_NAME, 'results-context-header__job-count')
-                return min(int(totalJobsFoundElement.text), LINKEDIN_JOB_LOADING_LIMIT)
-        except NoSuchElementException:
+    def _getJobCountLimit(self, page: dict) -> int:
+        limit = None
+        if page['count'] is not None:
+            try:
+                limit = min(self.__parseJobCount(page['count']), LINKEDIN_JOB_LOADING_LIMIT)
+            except ValueError:
+                self._logger.error('Error parsing job count')
+
+        if limit is None:
+            self._logger.warning('Could not determine how many jobs to load, will exit without loading jobs')
             return 0
+        if not limit:
+            self._logger.info('Search found no jobs')
+        return limit
+
+    @staticmethod
+    def __parseJobCount(count: str) -> int:
+        return int(re.sub(r'[\s,+]', '', count)) # "1,000+" -> 1000
+
+    def _getTotalJobCount(self, page: dict) -> int | None:
+        try:
+            return self.__parseJobCount(page['count']) if page['count'] is not None else None
         except ValueError:
-            self._logger.error('Error parsing job count')
-            return 0
-        
-    def __threadSafeGetJobElements(self) -> list[JobInfo]:
-        jobsOnPage = []
-        with self._lock:
-            self._switchToProperTab()
-            jobElements = self._driver.find_elements(By.CLASS_NAME, 'base-search-card--link')
-            for jobElement in jobElements:
-                job = self.__parseJob(jobElement)
-                jobsOnPage.append(job)
-            return jobsOnPage
-
-
-    def _loadJobsInner(self, searchParams: BaseSearchParams, shouldSleep: bool = True) -> list[JobInfo]:
-        results = []
-        startFrom = 0
-        limit = 0
-        url = UrlBuilder.buildUrl(searchParams)
-
-        while True: # do-while imitation
-            self._logger.info('Loading jobs from url = "%s"...', url)
-            self._threadSafeGet(url)
-
-            if startFrom == 0:
-                limit = self.__threadSafeGetJobCountLimit()
-                if not limit:
-                    self._logger.warning('Could not determine how many jobs to load, will exit without loading jobs')
-                    break
-                self._logger.info('Will attempt to load %d jobs', limit)
-
-            jobsOnPage = self.__threadSafeGetJobElements()
-            results.extend(jobsOnPage)
-
-            self._logger.info('Loaded %d out of %d jobs', len(results), limit)
-
-            if len(jobsOnPage) == 0:
-                self._logger.info('Found zero jobs on page, looks like there are no more jobs, process finished')
-                break
-            elif len(results) >= limit:
-                self._logger.info('Loaded equal to or more jobs (%d) than discovered limit (%d), won\'t be loading more, process finished', len(results), limit)
-                break
-            else:
-                startFrom += LINKEDIN_PAGE_SIZE
-                url = UrlBuilder.buildUrl(searchParams, { 'start': startFrom, 'partial': True })
-                self._sleep(shouldSleep)
-
-        finalResults = results[0:limit]
-        self._logger.info('Loaded a total of %d jobs', len(finalResults))
-        return finalResults
\ No newline at end of file
+            return None
+
+    def _getJobsFromPage(self, url: str, page: dict) -> list[JobInfo]:
+        return list(map(lambda jobCard: self.__mapJobCardToJobInfo(jobCard), page['jobs']))
+
+    def _getNextPageUrl(self, searchParams: BaseSearchParams, pageNumber: int, page: dict, jobsOnPage: list[JobInfo]) -> str | None:
+        if len(jobsOnPage) == 0:
+            self._logger.info('Found zero jobs on page, looks like there are no more jobs, process finished')
+            return None
+        return self.__buildPageUrl(searchParams, pageNumber + 1)
+
+    def _predictNextPageUrl(self, searchParams: BaseSearchParams, pageNumber: int, page: dict | None) -> str | None:
+        return self.__buildPageUrl(searchParams, pageNumber + 1) # pages are numbered, no need to wait for this one to be parsed
+
+    def __buildPageUrl(self, searchParams: BaseSearchParams, pageNumber: int) -> str:
+        return UrlBuilder.buildUrl(searchParams, { 'start': pageNumber * LINKEDIN_PAGE_SIZE, 'partial': True }, self._host)
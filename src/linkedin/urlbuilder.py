@@ -7,7 +7,7 @@ from .searchparams import *
 class UrlBuilder:
 
     @staticmethod
-    def buildUrl(searchParams: SearchParams, extraParams: dict = {}) -> str:
+    def buildUrl(searchParams: SearchParams, extraParams: dict = {}, host: str = LINKEDIN_HOST) -> str:
         if isNullOrWhiteSpace(searchParams.query):
             raise ValueError('Query string cannot be null or white space.')
         if isNullOrWhiteSpace(searchParams.location):
@@ -35,4 +35,4 @@ class UrlBuilder:
         # remove keys with values == ''
         filteredQueryStringDict = {key:value for (key,value) in mergedDict.items() if value}
 
-        return buildUrl(LINKEDIN_HOST, searchPath, filteredQueryStringDict)
\ No newline at end of file
+        return buildUrl(host, searchPath, filteredQueryStringDict)
\ No newline at end of file
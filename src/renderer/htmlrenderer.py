@@ -36,6 +36,16 @@ class HtmlRenderer:
             if i != count - 1:
                 a.tail = ', '
 
+    def __setJobName(self, tJobName: SubElement, groupedJob: Job):
+        if not groupedJob.description:
+            tJobName.text = groupedJob.title
+        else:
+            details = SubElement(tJobName, 'details') # descriptions are long, they stay folded until clicked
+            SubElement(details, 'summary').text = groupedJob.title
+            SubElement(details, 'div').text = groupedJob.description
+        if groupedJob.searchLabels:
+            SubElement(SubElement(tJobName, 'div'), 'small').text = 'Found by: %s' % ', '.join(groupedJob.searchLabels)
+
     def __setDerogatoryMarks(self, tDerogatoryMarks: SubElement, groupedJob: Job):
         for dm in groupedJob.derogatoryMarks:
             SubElement(tDerogatoryMarks, 'div').text = dm
@@ -91,7 +101,8 @@ class HtmlRenderer:
             for i, groupedJob in enumerate(groupedJobs):
                 tRow = SubElement(table, 'tr')
                 SubElement(tRow, 'td').text = str(i + 1)
-                SubElement(tRow, 'td').text = groupedJob.title
+                tJobName = SubElement(tRow, 'td')
+                self.__setJobName(tJobName, groupedJob)
                 tCompany = SubElement(tRow, 'td')
                 a = SubElement(tCompany, 'a', { 'href': buildUrl(GLASSDOOR_HOST, GLASSDOOR_SEARCH_PAGE, { GLASSDOOR_SEARCH_PARAM: groupedJob.company }) })
                 a.text = groupedJob.company
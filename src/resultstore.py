@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from logging import getLogger, Logger
+
+from .jobinfo import Job, JobLocation
+from .utility import getSimpleModuleName
+
+# Keeps processed jobs of the last crawl, so that the report can be rendered again without crawling
+class ResultStore:
+    __filePath: str
+    __logger: Logger
+
+    def __init__(self, filePath: str):
+        self.__filePath = filePath
+        self.__logger = getLogger(getSimpleModuleName(__name__))
+
+    @staticmethod
+    def __jobToDict(job: Job) -> dict:
+        return { 'title': job.title, 'company': job.company, 'datePosted': job.datePosted.isoformat(),
+                 'locations': [ { 'name': location.name, 'link': location.link } for location in job.locations ],
+                 'salaries': job.salaries, 'weight': job.weight, 'derogatoryMarks': job.derogatoryMarks, 'description': job.description,
+                 'searchLabels': job.searchLabels }
+
+    @staticmethod
+    def __jobFromDict(d: dict) -> Job:
+        job = Job(d['title'], d['company'], datetime.fromisoformat(d['datePosted']),
+                  [ JobLocation(location['name'], location['link']) for location in d['locations'] ], d['salaries'],
+                  d.get('description'), d.get('searchLabels')) # results saved before job details or search labels were there have none
+        job.weight = d['weight']
+        job.derogatoryMarks = d['derogatoryMarks']
+        return job
+
+    def save(self, groupedJobs: list[Job], date: datetime) -> None:
+        Path(self.__filePath).parent.mkdir(parents=True, exist_ok=True)
+        temporaryFilePath = self.__filePath + '.tmp'
+        with open(temporaryFilePath, 'w', encoding='utf-8') as f:
+            json.dump({ 'date': date.isoformat(), 'jobs': [ self.__jobToDict(job) for job in groupedJobs ] }, f)
+        os.replace(temporaryFilePath, self.__filePath)
+        self.__logger.info('Saved %d jobs into file = "%s"', len(groupedJobs), self.__filePath)
+
+    # returns jobs and the date they were crawled on, None if there are no results to load
+    def load(self) -> tuple[list[Job], datetime] | None:
+        try:
+            with open(self.__filePath, encoding='utf-8') as f:
+                results = json.load(f)
+            return [ self.__jobFromDict(job) for job in results['jobs'] ], datetime.fromisoformat(results['date'])
+        except FileNotFoundError:
+            self.__logger.warning('There are no saved results at "%s", crawl first', self.__filePath)
+        except (OSError, ValueError, KeyError, TypeError):
+            self.__logger.exception('Error reading saved results at "%s"', self.__filePath)
+        return None
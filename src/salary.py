@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+
+import re
+from enum import Enum
+from functools import lru_cache
+
+class SalaryPeriod(Enum):
+    Hour = 2080 # values are how many of the period there are in a year: 40 hours a week, 52 weeks
+    Day = 260
+    Week = 52
+    Month = 12
+    Year = 1
+
+
+# Salary as posted, normalized: amounts are per period, annual amounts are what they make in a year.
+# Parsed salaries are shared between all jobs with the same salary text, they are not to be changed.
+class Salary:
+    __slots__ = ('minAmount', 'maxAmount', 'currency', 'period')
+    minAmount: float | None # None for 'up to ...' salaries
+    maxAmount: float | None # None for 'from ...' salaries
+    currency: str | None # ISO code, None if the salary doesn't say
+    period: SalaryPeriod
+
+    def __init__(self, minAmount: float | None, maxAmount: float | None, currency: str | None, period: SalaryPeriod):
+        self.minAmount = minAmount
+        self.maxAmount = maxAmount
+        self.currency = currency
+        self.period = period
+
+    @property
+    def annualMinAmount(self) -> float | None:
+        return None if self.minAmount is None else self.minAmount * self.period.value
+
+    @property
+    def annualMaxAmount(self) -> float | None:
+        return None if self.maxAmount is None else self.maxAmount * self.period.value
+
+    # the most the job can pay in a year, as far as the salary tells
+    @property
+    def annualTopAmount(self) -> float:
+        return self.annualMaxAmount if self.maxAmount is not None else self.annualMinAmount
+
+    def __eq__(self, other):
+        if not isinstance(other, Salary):
+            return NotImplemented
+        return (self.minAmount, self.maxAmount, self.currency, self.period) == (other.minAmount, other.maxAmount, other.currency, other.period)
+
+    def __hash__(self):
+        return hash((self.minAmount, self.maxAmount, self.currency, self.period))
+
+    def __repr__(self):
+        return str({ 'minAmount': self.minAmount, 'maxAmount': self.maxAmount, 'currency': self.currency, 'period': self.period.name })
+
+
+_amountRegex = re.compile(r'(\d[\d,]*(?:\.\d+)?)\s*([kK]\b)?')
+_currencyRegex = re.compile(r'\b(USD|CAD|AUD|EUR|GBP|INR)\b|(CA\$|C\$|A\$|\$|€|£|₹)')
+_currencySymbols = { 'CA$': 'CAD', 'C$': 'CAD', 'A$': 'AUD', '$': 'USD', '€': 'EUR', '£': 'GBP', '₹': 'INR' }
+_periodRegexes = [ (re.compile(r'\b(hour|hourly|hr|hrs)\b', re.IGNORECASE), SalaryPeriod.Hour),
+                   (re.compile(r'\b(day|daily)\b', re.IGNORECASE), SalaryPeriod.Day),
+                   (re.compile(r'\b(week|weekly|wk)\b', re.IGNORECASE), SalaryPeriod.Week),
+                   (re.compile(r'\b(month|monthly|mo)\b', re.IGNORECASE), SalaryPeriod.Month),
+                   (re.compile(r'\b(year|yearly|yr|annual|annually|annum)\b', re.IGNORECASE), SalaryPeriod.Year) ]
+
+# Parses salary texts the way Indeed (salarySnippet) and Linkedin (job-search-card__salary-info) show them:
+# '$59,108 - $75,652 a year', '$25 an hour', 'From $20 an hour', 'Up to $80,000 a year', '$50-60 an hour', '$80K/yr - $100K/yr'.
+# Salaries that don't say what period they are for are taken to be annual. Returns None if there is no amount in the text.
+# Every distinct text is parsed once.
+@lru_cache(maxsize = 65536)
+def parseSalary(text: str) -> Salary | None:
+    if not text:
+        return None
+    amounts = [ float(number.replace(',', '')) * (1000 if thousands else 1) for number, thousands in _amountRegex.findall(text) ]
+    if not amounts:
+        return None
+
+    currencyMatch = _currencyRegex.search(text)
+    currency = (currencyMatch.group(1) or _currencySymbols[currencyMatch.group(2)]) if currencyMatch else None
+    period = next((period for regex, period in _periodRegexes if regex.search(text)), SalaryPeriod.Year)
+    if len(amounts) > 1:
+        return Salary(min(amounts), max(amounts), currency, period)
+    if text.strip().lower().startswith('up to'):
+        return Salary(None, amounts[0], currency, period)
+    if text.strip().lower().startswith('from'):
+        return Salary(amounts[0], None, currency, period)
+    return Salary(amounts[0], amounts[0], currency, period)
@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 
 import urllib
+import json
+import re
 from enum import Enum
 import os
 
@@ -14,6 +16,12 @@ def buildUrl(baseUrl: str, path: str, queryParams: dict) -> str:
     url_parts[4] = urllib.parse.urlencode(queryParams)
     return urllib.parse.urlunparse(url_parts)
 
+# Same page, same string: lowercases scheme and host, sorts query parameters and drops the fragment
+def canonicalizeUrl(url: str) -> str:
+    urlParts = urllib.parse.urlsplit(url.strip())
+    query = urllib.parse.urlencode(sorted(urllib.parse.parse_qsl(urlParts.query, keep_blank_values = True)))
+    return urllib.parse.urlunsplit((urlParts.scheme.lower(), urlParts.netloc.lower(), urlParts.path or '/', query, ''))
+
 def getTrimmedStringValueOrEmptyString(s: str) -> str:
     return '' if isNullOrWhiteSpace(s) else s.strip()
         
@@ -27,4 +35,21 @@ def getSimpleModuleName(name: str) -> str:
     if not name:
         return ''
     lastNameElement = name.split('.')[-1]
-    return lastNameElement.strip('_')
\ No newline at end of file
+    return lastNameElement.strip('_')
+
+# Finds "<assignmentTarget> = {...}" in html/javascript and decodes the value that follows it.
+# Only the value itself is parsed (json.JSONDecoder.raw_decode stops where the value ends), the rest of the text is never touched.
+def extractAssignedJson(text: str, assignmentTarget: str) -> any:
+    decoder = json.JSONDecoder()
+    assignmentRegex = re.compile(r'\s*=(?!=)\s*')
+    position = text.find(assignmentTarget)
+    while position != -1:
+        position += len(assignmentTarget)
+        assignment = assignmentRegex.match(text, position)
+        if assignment:
+            try:
+                return decoder.raw_decode(text, assignment.end())[0]
+            except json.JSONDecodeError:
+                pass
+        position = text.find(assignmentTarget, position) # not an assignment, maybe a later occurrence is
+    return None
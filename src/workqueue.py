@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+
+import json
+import pickle
+import sqlite3
+import time
+from collections import Counter
+from contextlib import closing, contextmanager
+from datetime import datetime
+from logging import getLogger, Logger
+from typing import Callable, Iterator
+
+from .base.basesearchparams import BaseSearchParams
+from .base.crawljournal import CrawlCheckpoint
+from .jobinfo import JobInfo
+from .constants import WORK_QUEUE_LEASE_SECONDS, WORK_QUEUE_MAX_ATTEMPTS
+from .utility import canonicalizeUrl, getSimpleModuleName
+
+# the task was taken over by another worker because its lease ran out
+class LeaseLostError(Exception):
+    pass
+
+
+# A search leased to one worker
+class WorkTask:
+    taskId: int
+    searchKey: str
+    searchNames: list[str]
+    searchParams: BaseSearchParams
+    attempt: int
+    workerId: str
+
+    def __init__(self, taskId: int, searchKey: str, searchNames: list[str], searchParams: BaseSearchParams, attempt: int, workerId: str):
+        self.taskId = taskId
+        self.searchKey = searchKey
+        self.searchNames = searchNames
+        self.searchParams = searchParams
+        self.attempt = attempt
+        self.workerId = workerId
+
+    def __repr__(self):
+        return str({ 'taskId': self.taskId, 'searchKey': self.searchKey, 'attempt': self.attempt, 'workerId': self.workerId })
+
+
+# Crawl shared by any number of worker processes through one SQLite file (in WAL mode, so that readers don't wait for writers).
+# WAL mode needs memory shared between processes, so all workers must run on the same machine, with the file on a local disk:
+# on a network share locking doesn't work, and workers could corrupt the queue or take over each other's leases.
+# Every search is a task; a worker leases it, loads its pages and writes every finished page (its jobs and where the search goes next)
+# back in one transaction that also extends the lease. A worker that dies stops extending its lease, and once the lease runs out
+# another worker takes the search over from the last finished page. Tasks leased maxAttempts times without finishing are given up on,
+# the jobs they loaded are kept. Searches that load the same pages are one task, shards of a search are tasks of their own.
+class WorkQueue:
+    __filePath: str
+    __leaseSeconds: float
+    __maxAttempts: int
+    __clock: Callable[[], float]
+    __logger: Logger
+
+    def __init__(self, filePath: str, leaseSeconds: float = WORK_QUEUE_LEASE_SECONDS, maxAttempts: int = WORK_QUEUE_MAX_ATTEMPTS,
+                 clock: Callable[[], float] = time.time):
+        self.__filePath = filePath
+        self.__leaseSeconds = leaseSeconds
+        self.__maxAttempts = maxAttempts
+        self.__clock = clock
+        self.__logger = getLogger(getSimpleModuleName(__name__))
+        with closing(self.__connect()) as connection:
+            connection.execute('PRAGMA journal_mode=WAL') # sticks to the file, every connection gets it
+            connection.executescript('''
+                CREATE TABLE IF NOT EXISTS tasks (
+                    id INTEGER PRIMARY KEY,
+                    searchKey TEXT NOT NULL UNIQUE,
+                    searchNames TEXT NOT NULL, -- json list
+                    searchParams BLOB NOT NULL, -- pickled
+                    state TEXT NOT NULL, -- pending, leased, done or failed
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    workerId TEXT,
+                    leaseExpiresAt REAL,
+                    pageNumber INTEGER, -- last finished page of a search in progress, and where to go from it
+                    nextPageUrl TEXT,
+                    jobLimit INTEGER,
+                    loadedCount INTEGER);
+                CREATE TABLE IF NOT EXISTS jobs (
+                    taskId INTEGER NOT NULL,
+                    job TEXT NOT NULL); -- json
+                CREATE INDEX IF NOT EXISTS jobsByTask ON jobs (taskId);''')
+
+    # Connections are short lived and never shared between threads. Writers wait for each other for up to a minute.
+    def __connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.__filePath, timeout = 60, isolation_level = None)
+        connection.execute('PRAGMA synchronous=NORMAL') # safe in WAL mode, a power cut can only lose the last pages
+        return connection
+
+    @contextmanager
+    def __transaction(self) -> Iterator[sqlite3.Connection]:
+        with closing(self.__connect()) as connection:
+            connection.execute('BEGIN IMMEDIATE') # take the write lock up front, so that two workers can't lease the same task
+            try:
+                yield connection
+                connection.execute('COMMIT')
+            except BaseException:
+                connection.execute('ROLLBACK')
+                raise
+
+    @staticmethod
+    def __jobToJson(job: JobInfo) -> str:
+        return json.dumps({ 'title': job.title, 'company': job.company, 'jobLink': job.jobLink, 'location': job.location, 'salary': job.salary,
+                            'datePosted': job.datePosted.isoformat() if job.datePosted else None })
+
+    @staticmethod
+    def __jobFromJson(s: str) -> JobInfo:
+        d = json.loads(s)
+        return JobInfo(d['title'], d['company'], d['jobLink'], d['location'], d['salary'],
+                       datetime.fromisoformat(d['datePosted']) if d['datePosted'] else None)
+
+    @staticmethod
+    def __insertTask(connection: sqlite3.Connection, searchKey: str, searchNames: list[str], searchParams: BaseSearchParams) -> bool:
+        cursor = connection.execute('INSERT OR IGNORE INTO tasks (searchKey, searchNames, searchParams, state) VALUES (?, ?, ?, ?)',
+                                    (searchKey, json.dumps(searchNames), pickle.dumps(searchParams), 'pending'))
+        return cursor.rowcount > 0
+
+    # Replaces whatever crawl was in the queue with a new one; returns how many tasks the searches became
+    def startCrawl(self, searches: dict[str, BaseSearchParams], getSearchKey: Callable[[BaseSearchParams], str]) -> int:
+        uniqueSearches: dict[str, tuple[BaseSearchParams, list[str]]] = {} # search key -> (params, search names)
+        for name, params in searches.items():
+            uniqueSearches.setdefault(getSearchKey(params), (params, []))[1].append(name)
+        with self.__transaction() as connection:
+            connection.execute('DELETE FROM jobs')
+            connection.execute('DELETE FROM tasks')
+            for searchKey, (params, names) in uniqueSearches.items():
+                self.__insertTask(connection, searchKey, names, params)
+        self.__logger.info('Queued %d searches (%d unique)', len(searches), len(uniqueSearches))
+        return len(uniqueSearches)
+
+    # returns None if there's nothing to lease right now
+    def lease(self, workerId: str) -> WorkTask | None:
+        now = self.__clock()
+        with self.__transaction() as connection:
+            givenUp = connection.execute("UPDATE tasks SET state = 'failed', workerId = NULL WHERE state = 'leased' AND leaseExpiresAt < ? AND attempts >= ?",
+                                         (now, self.__maxAttempts)).rowcount
+            if givenUp:
+                self.__logger.warning('Gave up on %d searches after %d attempts, keeping the jobs they loaded', givenUp, self.__maxAttempts)
+            row = connection.execute("SELECT id, searchKey, searchNames, searchParams, attempts FROM tasks WHERE state = 'pending' OR "
+                                     "(state = 'leased' AND leaseExpiresAt < ?) ORDER BY id LIMIT 1", (now,)).fetchone()
+            if row is None:
+                return None
+            taskId, searchKey, searchNames, searchParams, attempts = row
+            connection.execute("UPDATE tasks SET state = 'leased', attempts = ?, workerId = ?, leaseExpiresAt = ? WHERE id = ?",
+                               (attempts + 1, workerId, now + self.__leaseSeconds, taskId))
+        return WorkTask(taskId, searchKey, json.loads(searchNames), pickle.loads(searchParams), attempts + 1, workerId)
+
+    # extends the lease, raises LeaseLostError if the task was taken over
+    def __renew(self, connection: sqlite3.Connection, task: WorkTask, **columns) -> None:
+        assignments = ''.join(', %s = ?' % column for column in columns)
+        cursor = connection.execute("UPDATE tasks SET leaseExpiresAt = ?%s WHERE id = ? AND workerId = ? AND state = 'leased'" % assignments,
+                                    (self.__clock() + self.__leaseSeconds, *columns.values(), task.taskId, task.workerId))
+        if cursor.rowcount == 0:
+            raise LeaseLostError('Search "%s" was taken over by another worker' % task.searchKey)
+
+    def getCheckpoint(self, task: WorkTask) -> CrawlCheckpoint | None:
+        with closing(self.__connect()) as connection:
+            pageNumber, nextPageUrl, limit, loadedCount = connection.execute(
+                'SELECT pageNumber, nextPageUrl, jobLimit, loadedCount FROM tasks WHERE id = ?', (task.taskId,)).fetchone()
+            if pageNumber is None:
+                return None
+            jobs = [ self.__jobFromJson(job) for job, in connection.execute('SELECT job FROM jobs WHERE taskId = ? ORDER BY rowid', (task.taskId,)) ]
+        return CrawlCheckpoint(pageNumber, nextPageUrl, limit, loadedCount, jobs)
+
+    def recordPage(self, task: WorkTask, pageNumber: int, nextPageUrl: str, limit: int, loadedCount: int, jobs: list[JobInfo]) -> None:
+        with self.__transaction() as connection:
+            self.__renew(connection, task, pageNumber = pageNumber, nextPageUrl = nextPageUrl, jobLimit = limit, loadedCount = loadedCount)
+            connection.executemany('INSERT INTO jobs (taskId, job) VALUES (?, ?)', [ (task.taskId, self.__jobToJson(job)) for job in jobs ])
+
+    # shards are found by the same searches as the task they were split from
+    def addShards(self, task: WorkTask, shards: list[BaseSearchParams], getSearchKey: Callable[[BaseSearchParams], str]) -> None:
+        with self.__transaction() as connection:
+            self.__renew(connection, task)
+            for shard in shards:
+                if not self.__insertTask(connection, getSearchKey(shard), task.searchNames, shard):
+                    self.__logger.info('Shard "%s" is queued already', getSearchKey(shard))
+
+    # Jobs are all jobs of the search, including those of pages recorded before: those are kept as they are, only the rest is added
+    def complete(self, task: WorkTask, jobs: list[JobInfo]) -> None:
+        with self.__transaction() as connection:
+            self.__renew(connection, task, state = 'done', workerId = None)
+            recordedJobs = Counter(job for job, in connection.execute('SELECT job FROM jobs WHERE taskId = ?', (task.taskId,)))
+            newJobs = []
+            for jobJson in map(self.__jobToJson, jobs):
+                if recordedJobs[jobJson]:
+                    recordedJobs[jobJson] -= 1
+                else:
+                    newJobs.append((task.taskId, jobJson))
+            connection.executemany('INSERT INTO jobs (taskId, job) VALUES (?, ?)', newJobs)
+
+    # hands the task back to be tried again by any worker, or gives up on it if it was tried enough
+    def release(self, task: WorkTask) -> None:
+        with self.__transaction() as connection:
+            self.__renew(connection, task, state = 'failed' if task.attempt >= self.__maxAttempts else 'pending', workerId = None)
+
+    # task count by state
+    def getProgress(self) -> dict[str, int]:
+        with closing(self.__connect()) as connection:
+            return dict(connection.execute('SELECT state, COUNT(*) FROM tasks GROUP BY state').fetchall())
+
+    def isCrawlFinished(self) -> bool:
+        progress = self.getProgress()
+        return not progress.get('pending') and not progress.get('leased')
+
+    # Jobs of all searches, every job once (by canonical link) and tagged with the names of all searches that found it
+    def getJobs(self) -> list[JobInfo]:
+        with closing(self.__connect()) as connection:
+            rows = connection.execute('SELECT tasks.searchNames, jobs.job FROM jobs JOIN tasks ON tasks.id = jobs.taskId ORDER BY tasks.id, jobs.rowid').fetchall()
+
+        jobs = []
+        jobsByLink: dict[str, JobInfo] = {}
+        for searchNames, jobJson in rows:
+            job = self.__jobFromJson(jobJson)
+            jobLink = canonicalizeUrl(job.jobLink) if job.jobLink else None
+            knownJob = jobsByLink.get(jobLink) if jobLink else None
+            if knownJob is None:
+                job.searchLabels = json.loads(searchNames)
+                if jobLink:
+                    jobsByLink[jobLink] = job
+                jobs.append(job)
+            else:
+                knownJob.searchLabels.extend(name for name in json.loads(searchNames) if name not in knownJob.searchLabels)
+        return jobs
+
+    # what a loader working on the task uses as its crawl journal
+    def getJournal(self, task: WorkTask) -> '_TaskJournal':
+        return _TaskJournal(self, task)
+
+
+# Crawl journal of one leased task: loaders resume from and record pages into the task's row instead of journal files
+class _TaskJournal:
+    __workQueue: WorkQueue
+    __task: WorkTask
+
+    def __init__(self, workQueue: WorkQueue, task: WorkTask):
+        self.__workQueue = workQueue
+        self.__task = task
+
+    def getCheckpoint(self, searchKey: str) -> CrawlCheckpoint | None:
+        return self.__workQueue.getCheckpoint(self.__task)
+
+    def recordPage(self, searchKey: str, pageNumber: int, nextPageUrl: str, limit: int, loadedCount: int, jobs: list[JobInfo]) -> None:
+        self.__workQueue.recordPage(self.__task, pageNumber, nextPageUrl, limit, loadedCount, jobs)
+
+    def discard(self, searchKey: str) -> None:
+        pass # the task keeps its pages until it's complete
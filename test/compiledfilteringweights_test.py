@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+
+import unittest
+import os
+import sys
+import re
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.jobprocessor import RegexFilteringWeight, SalaryFilteringWeight
+from src.jobprocessor.compiledfilteringweights import CompiledFilteringWeights
+from src.jobinfo import Job
+
+class Test_CompiledFilteringWeights(unittest.TestCase):
+
+    @staticmethod
+    def __createJobs() -> list[Job]:
+        return [ Job('Diesel Mechanic', 'Talent Partners', datetime(2024, 5, 1), [], [ '$90,000 a year' ]),
+                 Job('Class A Local Driver', 'Department of Transportation', datetime(2024, 5, 1), [], []),
+                 Job('Local Loader, Class A', 'We Hire', datetime(2024, 5, 1), [], [ '$15 an hour' ]),
+                 Job('Nurse', 'Hospital', datetime(2024, 5, 1), [], []) ]
+
+    def test_CompiledFilteringWeightsWeighJobsSameAsWeightsOneByOne(self):
+        # arrange
+        weights = [ RegexFilteringWeight('title', -10, r'diesel|loader'),
+                    RegexFilteringWeight('company', -10, r'recruit|hire|talent|partners'),
+                    RegexFilteringWeight('title', 2, r'class a|local'),
+                    RegexFilteringWeight('company', 1, r'department'),
+                    RegexFilteringWeight('title', 5, ''),
+                    SalaryFilteringWeight(3, 80000) ]
+        expectedJobs = self.__createJobs()
+        for weight in weights:
+            weight.assignWeightsAndDerogatoryMarksToJobs(expectedJobs)
+        jobs = self.__createJobs()
+
+        # act
+        CompiledFilteringWeights(weights).assignWeightsAndDerogatoryMarksToJobs(jobs)
+
+        # assert
+        self.assertEqual([ job.weight for job in jobs ], [ job.weight for job in expectedJobs ])
+        self.assertEqual([ job.derogatoryMarks for job in jobs ], [ job.derogatoryMarks for job in expectedJobs ])
+        self.assertEqual(jobs[2].derogatoryMarks, [ 'Undesirable word in title: \'Loader\'', 'Undesirable word in company: \'Hire\'' ])
+
+
+    __overlappingRulesTestParams = [ [ RegexFilteringWeight('title', 2, r'driver'), RegexFilteringWeight('title', -10, r'truck driver|diesel') ],
+                                     [ RegexFilteringWeight('title', -10, r'truck'), RegexFilteringWeight('title', 2, r'truck driver') ],
+                                     [ RegexFilteringWeight('title', 1, r'java'), RegexFilteringWeight('title', -10, r'javascript'), RegexFilteringWeight('title', 1, r'script') ] ]
+
+    def test_RulesMatchingSameTextWeighJobsSameAsOneByOne(self):
+        for weights in self.__overlappingRulesTestParams:
+            with self.subTest():
+                # arrange
+                expectedJobs = [ Job('Truck Driver', 'Big Company', datetime(2024, 5, 1), [], []), Job('JavaScript Developer', 'Big Company', datetime(2024, 5, 1), [], []) ]
+                for weight in weights:
+                    weight.assignWeightsAndDerogatoryMarksToJobs(expectedJobs)
+                jobs = [ Job('Truck Driver', 'Big Company', datetime(2024, 5, 1), [], []), Job('JavaScript Developer', 'Big Company', datetime(2024, 5, 1), [], []) ]
+
+                # act
+                CompiledFilteringWeights(weights).assignWeightsAndDerogatoryMarksToJobs(jobs)
+
+                # assert
+                self.assertEqual([ job.weight for job in jobs ], [ job.weight for job in expectedJobs ])
+                self.assertEqual([ job.derogatoryMarks for job in jobs ], [ job.derogatoryMarks for job in expectedJobs ])
+
+
+    def test_RegexesThatCannotBeFusedAreStillWeighed(self):
+        # arrange
+        jobs = [ Job('Driver Driver', 'Big Company', datetime(2024, 5, 1), [], []) ]
+        weights = [ RegexFilteringWeight('title', -1, r'(\w+) \1'), RegexFilteringWeight('title', 1, r'(?x) driver'), RegexFilteringWeight('title', 1, r'big|driver') ]
+
+        # act
+        CompiledFilteringWeights(weights).assignWeightsAndDerogatoryMarksToJobs(jobs)
+
+        # assert
+        self.assertEqual(jobs[0].weight, 3)
+        self.assertEqual(jobs[0].derogatoryMarks, [ 'Undesirable word in title: \'Driver Driver\'' ])
+
+
+    def test_MalformedRegexIsNotFused(self):
+        # arrange
+        jobs = [ Job('Driver', 'Big Company', datetime(2024, 5, 1), [], []) ]
+        compiledWeights = CompiledFilteringWeights([ RegexFilteringWeight('title', 1, r'driver'), RegexFilteringWeight('title', 1, r'a)|(b') ])
+
+        # act
+        with self.assertRaises(re.error) as cm: # same as weighing with it on its own
+            compiledWeights.assignWeightsAndDerogatoryMarksToJobs(jobs)
+
+        # assert
+        self.assertIn('unbalanced parenthesis', str(cm.exception))
+
+
+if __name__ == '__main__':
+    unittest.main()
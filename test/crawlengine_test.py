@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+
+import unittest
+from unittest.mock import Mock
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.base.basejobloader import BaseJobLoader
+from src.base.driverpool import DriverPool
+from src.base.pageprefetcher import PagePrefetcher
+from src.crawlengine import CrawlEngine
+from src.jobinfo import JobInfo
+
+class PageLoadTracker:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.activeLoads = 0
+        self.maxActiveLoads = 0
+        self.totalLoads = 0
+
+    def __enter__(self):
+        with self.lock:
+            self.activeLoads += 1
+            self.totalLoads += 1
+            self.maxActiveLoads = max(self.maxActiveLoads, self.activeLoads)
+
+    def __exit__(self, *args):
+        with self.lock:
+            self.activeLoads -= 1
+
+
+class FakeJobLoader(BaseJobLoader):
+    def __init__(self, host: str, pageCount: int, tracker: PageLoadTracker, driverPool: DriverPool = None):
+        super().__init__(driverPool, 'fakejobloader')
+        self.host = host
+        self.pageCount = pageCount
+        self.tracker = tracker
+
+    @contextmanager
+    def _openSession(self):
+        if self._driverPool is None:
+            yield
+        else:
+            with super()._openSession():
+                yield
+
+    def _fetchPage(self, url: str) -> str:
+        with self.tracker:
+            time.sleep(0.05)
+        return url
+
+    def _parsePage(self, url: str, rawPage: str) -> dict:
+        return { 'jobs': [ rawPage ], 'count': self.pageCount, 'next': None }
+
+    def _getFirstPageUrl(self, searchParams) -> str:
+        return '%s?page=0' % self.host
+
+    def _getJobCountLimit(self, page: dict) -> int:
+        return page['count']
+
+    def _getJobsFromPage(self, url: str, page: dict) -> list[JobInfo]:
+        return [ JobInfo('Title', 'Company', url, 'Location', '', datetime.now()) for url in page['jobs'] ]
+
+    def _getNextPageUrl(self, searchParams, pageNumber: int, page: dict, jobsOnPage: list[JobInfo]) -> str | None:
+        return '%s?page=%d' % (self.host, pageNumber + 1) if pageNumber + 1 < self.pageCount else None
+
+
+class StartTimeTrackingFakeJobLoader(FakeJobLoader):
+    def __init__(self, host: str, pageCount: int, tracker: PageLoadTracker):
+        super().__init__(host, pageCount, tracker)
+        self.startTime = None
+
+    def _fetchPage(self, url: str) -> str:
+        self.startTime = self.startTime or time.monotonic()
+        return super()._fetchPage(url)
+
+
+class SameJobsFakeJobLoader(FakeJobLoader):
+    def _getJobsFromPage(self, url: str, page: dict) -> list[JobInfo]:
+        return [ JobInfo('Title', 'Company', 'http://jobs.com/' + url.split('=')[-1], 'Location', '', datetime.now()) ]
+
+
+class PrefetchingFakeJobLoader(FakeJobLoader):
+    _prefetchNextPage = True
+
+    def __init__(self, host: str, pageCount: int, tracker: PageLoadTracker):
+        super().__init__(host, pageCount, tracker)
+        self.prefetcher = PagePrefetcher()
+        self.prefetchedUrls = []
+
+    def _predictNextPageUrl(self, searchParams, pageNumber: int, page: dict | None) -> str | None:
+        return self._getNextPageUrl(searchParams, pageNumber, page, [])
+
+    def _startPrefetch(self, url: str) -> None:
+        self.prefetchedUrls.append(url)
+        self.prefetcher.start(url, self._fetchPage)
+
+    def _takePrefetchedPage(self, url: str) -> str:
+        return self.prefetcher.take(url, self._fetchPage)
+
+    def _discardPrefetchedPage(self) -> None:
+        self.prefetcher.discard()
+
+
+class ShardedSearchParams:
+    def __init__(self, host: str, kind: str = None):
+        self.host = host
+        self.kind = kind
+
+
+# finds 2 jobs of every kind, but can only load 2 jobs per search
+class ShardingFakeJobLoader(FakeJobLoader):
+    _shardFacets = [ ('kind', [ 'x', 'y', 'z' ]) ]
+
+    def __init__(self, searchParams: ShardedSearchParams, tracker: PageLoadTracker):
+        super().__init__(searchParams.host, 2, tracker)
+
+    def _getFirstPageUrl(self, searchParams: ShardedSearchParams) -> str:
+        return '%s?kind=%s&page=0' % (self.host, searchParams.kind or 'all')
+
+    def _parsePage(self, url: str, rawPage: str) -> dict:
+        return { 'jobs': [ rawPage ], 'count': 6 if 'kind=all' in url else 2, 'next': None }
+
+    def _getTotalJobCount(self, page: dict) -> int:
+        return page['count']
+
+    def _getJobCountLimit(self, page: dict) -> int:
+        return min(page['count'], 2)
+
+    def _getNextPageUrl(self, searchParams: ShardedSearchParams, pageNumber: int, page: dict, jobsOnPage: list[JobInfo]) -> str | None:
+        return '%s?kind=%s&page=%d' % (self.host, searchParams.kind or 'all', pageNumber + 1)
+
+
+# same as ShardingFakeJobLoader, but every kind finds the same jobs
+class OverlappingShardingFakeJobLoader(ShardingFakeJobLoader):
+    def _getJobsFromPage(self, url: str, page: dict) -> list[JobInfo]:
+        return [ JobInfo('Title', 'Company', 'http://jobs.com/' + url.split('=')[-1], 'Location', '', datetime.now()) ]
+
+
+class Test_CrawlEngine(unittest.TestCase):
+
+    def test_CrawlEngineLoadsAllPagesOfAllSearches(self):
+        # arrange
+        tracker = PageLoadTracker()
+        loaders = [ FakeJobLoader('http://a.com/', 3, tracker), FakeJobLoader('http://b.com/', 2, tracker) ]
+
+        # act
+        result = CrawlEngine().crawl(loaders, [ None, None ], shouldSleep = False)
+
+        # assert
+        self.assertCountEqual([ job.jobLink for job in result ],
+                              [ 'http://a.com/?page=0', 'http://a.com/?page=1', 'http://a.com/?page=2', 'http://b.com/?page=0', 'http://b.com/?page=1' ])
+
+
+    def test_CrawlEngineLimitsConcurrentPageLoadsPerHost(self):
+        # arrange
+        tracker = PageLoadTracker()
+        loaders = [ FakeJobLoader('http://a.com/', 2, tracker) for i in range(4) ]
+
+        # act
+        result = CrawlEngine(maxThreads = 4, maxConcurrentPageLoadsPerHost = 1).crawl(loaders, [ None ] * 4, shouldSleep = False)
+
+        # assert
+        self.assertEqual(len(result), 8)
+        self.assertEqual(tracker.maxActiveLoads, 1)
+
+
+    def test_CrawlEngineLoadsPagesFromDifferentHostsConcurrently(self):
+        # arrange
+        tracker = PageLoadTracker()
+        loaders = [ FakeJobLoader('http://a.com/', 2, tracker), FakeJobLoader('http://b.com/', 2, tracker) ]
+
+        # act
+        CrawlEngine(maxThreads = 4, maxConcurrentPageLoadsPerHost = 1).crawl(loaders, [ None, None ], shouldSleep = False)
+
+        # assert
+        self.assertEqual(tracker.maxActiveLoads, 2)
+
+
+    def test_CrawlEngineStaggersStartsOfSearchesAgainstSameHost(self):
+        # arrange
+        tracker = PageLoadTracker()
+        loaders = [ StartTimeTrackingFakeJobLoader('http://a.com/', 1, tracker), StartTimeTrackingFakeJobLoader('http://a.com/', 1, tracker),
+                    StartTimeTrackingFakeJobLoader('http://b.com/', 1, tracker) ]
+
+        # act
+        CrawlEngine(maxThreads = 4, hostStaggerSeconds = 0.3).crawl(loaders, [ None ] * 3, shouldSleep = False)
+
+        # assert
+        self.assertGreaterEqual(loaders[1].startTime - loaders[0].startTime, 0.3)
+        self.assertLess(abs(loaders[2].startTime - loaders[0].startTime), 0.2) # other hosts don't wait
+
+
+    def test_CrawlEngineDoesNotRunOutOfThreadsWhenSearchesWaitForBrowsers(self):
+        # arrange
+        tracker = PageLoadTracker()
+        driverPool = DriverPool(lambda: Mock(), size = 1)
+        loaders = [ FakeJobLoader('http://a.com/', 2, tracker, driverPool) for i in range(4) ]
+
+        # act
+        result = CrawlEngine(maxThreads = 1).crawl(loaders, [ None ] * 4, shouldSleep = False)
+
+        # assert
+        self.assertEqual(len(result), 8)
+
+
+    def test_CrawlEnginePrefetchesNextPagesWithinPerHostLimit(self):
+        # arrange
+        tracker = PageLoadTracker()
+        loaders = [ PrefetchingFakeJobLoader('http://a.com/', 3, tracker) for i in range(2) ]
+
+        # act
+        result = CrawlEngine(maxThreads = 4, maxConcurrentPageLoadsPerHost = 1).crawl(loaders, [ None, None ], shouldSleep = False)
+
+        # assert
+        self.assertCountEqual([ job.jobLink for job in result ], [ 'http://a.com/?page=%d' % i for i in [ 0, 1, 2, 0, 1, 2 ] ])
+        self.assertEqual(loaders[0].prefetchedUrls, [ 'http://a.com/?page=1', 'http://a.com/?page=2' ])
+        self.assertEqual(tracker.maxActiveLoads, 1)
+
+
+    def test_CrawlEngineLoadsSameSearchOnceAndTagsJobsWithAllSearchNames(self):
+        # arrange
+        tracker = PageLoadTracker()
+        searches = { 'first': 'http://a.com/', 'same as first': 'HTTP://A.COM/', 'second': 'http://b.com/' }
+
+        # act
+        result = CrawlEngine().crawlSearches(searches, lambda host: FakeJobLoader(host, 2, tracker), shouldSleep = False)
+
+        # assert
+        self.assertCountEqual([ (job.jobLink, job.searchLabels) for job in result ],
+                              [ ('http://a.com/?page=0', [ 'first', 'same as first' ]), ('http://a.com/?page=1', [ 'first', 'same as first' ]),
+                                ('http://b.com/?page=0', [ 'second' ]), ('http://b.com/?page=1', [ 'second' ]) ])
+        self.assertEqual(tracker.totalLoads, 4)
+
+
+    def test_CrawlEngineReturnsJobsFoundByDifferentSearchesOnce(self):
+        # arrange
+        tracker = PageLoadTracker()
+        searches = { 'first': 'http://a.com/', 'second': 'http://b.com/' }
+
+        # act
+        result = CrawlEngine().crawlSearches(searches, lambda host: SameJobsFakeJobLoader(host, 2, tracker), shouldSleep = False)
+
+        # assert
+        self.assertCountEqual([ (job.jobLink, sorted(job.searchLabels)) for job in result ],
+                              [ ('http://jobs.com/0', [ 'first', 'second' ]), ('http://jobs.com/1', [ 'first', 'second' ]) ])
+        self.assertEqual(tracker.totalLoads, 4)
+
+
+    def test_CrawlEngineSplitsSearchThatFindsMoreJobsThanCanBeLoaded(self):
+        # arrange
+        tracker = PageLoadTracker()
+        searches = { 'all kinds': ShardedSearchParams('http://a.com/') }
+        crawlEngine = CrawlEngine(maxThreads = 4, maxConcurrentPageLoadsPerHost = 3)
+
+        # act
+        result = crawlEngine.crawlSearches(searches, lambda params: ShardingFakeJobLoader(params, tracker), shouldSleep = False)
+
+        # assert
+        self.assertCountEqual([ (job.jobLink, job.searchLabels) for job in result ],
+                              [ ('http://a.com/?kind=%s&page=%d' % (kind, page), [ 'all kinds' ]) for kind in 'xyz' for page in range(2) ])
+        self.assertEqual(tracker.totalLoads, 7) # first page of the whole search, then 2 pages of every shard
+        self.assertGreater(tracker.maxActiveLoads, 1) # shards are loaded in parallel
+        self.assertEqual(crawlEngine.pageLoadStats.attempts, 7)
+
+
+    def test_CrawlEngineReturnsJobsFoundByOverlappingShardsOnce(self):
+        # arrange
+        tracker = PageLoadTracker()
+        searches = { 'all kinds': ShardedSearchParams('http://a.com/') }
+
+        # act
+        result = CrawlEngine().crawlSearches(searches, lambda params: OverlappingShardingFakeJobLoader(params, tracker), shouldSleep = False)
+
+        # assert
+        self.assertCountEqual([ (job.jobLink, job.searchLabels) for job in result ], [ ('http://jobs.com/0', [ 'all kinds' ]), ('http://jobs.com/1', [ 'all kinds' ]) ])
+        self.assertEqual(tracker.totalLoads, 7)
+
+
+    def test_CrawlEngineDoesNotSplitSearchesWithoutWayToCreateLoaders(self):
+        # arrange
+        tracker = PageLoadTracker()
+
+        # act
+        result = CrawlEngine().crawl([ ShardingFakeJobLoader(ShardedSearchParams('http://a.com/'), tracker) ], [ ShardedSearchParams('http://a.com/') ],
+                                     shouldSleep = False)
+
+        # assert
+        self.assertEqual([ job.jobLink for job in result ], [ 'http://a.com/?kind=all&page=0', 'http://a.com/?kind=all&page=1' ])
+
+
+    def test_CrawlEngineStreamsJobsPageByPage(self):
+        # arrange
+        tracker = PageLoadTracker()
+        searches = { 'first': 'http://a.com/', 'second': 'http://b.com/' }
+        crawlEngine = CrawlEngine()
+        async def collectBatches():
+            return [ [ job.jobLink for job in batch ] async for batch in crawlEngine.streamSearchesAsync(searches, lambda host: FakeJobLoader(host, 3, tracker), False) ]
+
+        # act
+        result = crawlEngine.run(collectBatches())
+
+        # assert
+        self.assertCountEqual(result, [ [ '%s?page=%d' % (host, page) ] for host in searches.values() for page in range(3) ])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+
+import unittest
+import os
+import sys
+import tempfile
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.base.crawlhistory import CrawlHistory
+from src.jobinfo import JobInfo
+from src.utility import canonicalizeUrl
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class Test_CrawlHistory(unittest.TestCase):
+
+    @staticmethod
+    def __createJob(link: str, datePosted: datetime) -> JobInfo:
+        return JobInfo('Title', 'Company', link, 'Location', '', datePosted)
+
+    def test_CrawlHistoryRemembersJobsPerSearchBetweenRuns(self):
+        with tempfile.TemporaryDirectory() as folder:
+            # arrange
+            filePath = os.path.join(folder, 'history.json')
+            searchKey = canonicalizeUrl('https://www.example.com/jobs?q=driver&l=LA')
+            otherSearchKey = canonicalizeUrl('https://www.example.com/jobs?q=loader&l=LA')
+            CrawlHistory(filePath).remember(searchKey, [ self.__createJob('https://www.example.com/job/1', datetime(2023, 6, 18)) ])
+
+            # act
+            history = CrawlHistory(filePath)
+
+            # assert
+            self.assertTrue(history.isSeen(searchKey, self.__createJob('https://www.example.com/job/1', datetime(2023, 6, 18))))
+            self.assertFalse(history.isSeen(otherSearchKey, self.__createJob('https://www.example.com/job/1', datetime(2023, 6, 18))))
+
+
+    def test_CrawlHistoryConsidersJobsOlderThanNewestSeenJobAsSeen(self):
+        with tempfile.TemporaryDirectory() as folder:
+            # arrange
+            history = CrawlHistory(os.path.join(folder, 'history.json'))
+            history.remember('search', [ self.__createJob('https://www.example.com/job/1', datetime(2023, 6, 18)),
+                                         self.__createJob('https://www.example.com/job/2', datetime(2023, 6, 19)) ])
+
+            # act
+            olderJobSeen = history.isSeen('search', self.__createJob('https://www.example.com/job/3', datetime(2023, 6, 17)))
+            sameDayJobSeen = history.isSeen('search', self.__createJob('https://www.example.com/job/4', datetime(2023, 6, 19)))
+            newerJobSeen = history.isSeen('search', self.__createJob('https://www.example.com/job/5', datetime(2023, 6, 20)))
+
+            # assert
+            self.assertTrue(olderJobSeen)
+            self.assertFalse(sameDayJobSeen)
+            self.assertFalse(newerJobSeen)
+
+
+    def test_CrawlHistoryTellsUndatedJobsByLinksOnly(self):
+        with tempfile.TemporaryDirectory() as folder:
+            # arrange
+            history = CrawlHistory(os.path.join(folder, 'history.json'))
+            history.remember('search', [ self.__createJob('https://www.example.com/job/1', datetime(2023, 6, 18)),
+                                         self.__createJob('https://www.example.com/job/2', None) ])
+
+            # act
+            undatedJobSeen = history.isSeen('search', self.__createJob('https://www.example.com/job/2', None))
+            otherUndatedJobSeen = history.isSeen('search', self.__createJob('https://www.example.com/job/3', None))
+            newerJobSeen = history.isSeen('search', self.__createJob('https://www.example.com/job/4', datetime(2023, 6, 19)))
+
+            # assert
+            self.assertTrue(undatedJobSeen)
+            self.assertFalse(otherUndatedJobSeen)
+            self.assertFalse(newerJobSeen)
+
+
+    def test_CrawlHistoryForgetsLinksAfterRetentionPeriod(self):
+        with tempfile.TemporaryDirectory() as folder:
+            # arrange
+            clock = FakeClock()
+            history = CrawlHistory(os.path.join(folder, 'history.json'), retentionDays = 1, clock = clock)
+            history.remember('search', [ self.__createJob('https://www.example.com/job/1', None) ])
+
+            # act
+            clock.now += 2 * 24 * 60 * 60
+            history.remember('search', [ self.__createJob('https://www.example.com/job/2', None) ])
+
+            # assert
+            self.assertFalse(history.isSeen('search', self.__createJob('https://www.example.com/job/1', None)))
+            self.assertTrue(history.isSeen('search', self.__createJob('https://www.example.com/job/2', None)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+
+import unittest
+from unittest.mock import Mock
+import os
+import sys
+import tempfile
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.base.crawljournal import CrawlJournal
+from src.base.driverpool import DriverPool
+from src.jobinfo import JobInfo
+import src.linkedin as Linkedin
+from src.constants import LINKEDIN_PAGE_SIZE
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class Test_CrawlJournal(unittest.TestCase):
+
+    @staticmethod
+    def __generatePage(startIndex: int, jobCount: int, totalJobCount: str | None = None) -> dict:
+        return { 'jobs': [ { 'title': 'Title %d' % i, 'company': 'Company', 'link': 'http://example.com/%d' % i,
+                             'location': 'New York, NY', 'salary': '', 'datePosted': '2020-02-02' } for i in range(startIndex, startIndex + jobCount) ],
+                 'count': totalJobCount, 'next': None }
+
+    def test_InterruptedCrawlIsResumedFromLastFinishedPage(self):
+        with tempfile.TemporaryDirectory() as folder:
+            # arrange
+            params = Linkedin.SearchParams()
+            params.query = 'A'
+            params.location = 'B'
+            crashingDriver = Mock()
+            crashingDriver.execute_script.side_effect = [ self.__generatePage(0, LINKEDIN_PAGE_SIZE, '60'), self.__generatePage(25, LINKEDIN_PAGE_SIZE),
+                                                          Exception('Browser crashed') ]
+            crashingLoader = Linkedin.JobLoader(DriverPool(lambda: crashingDriver))
+            crashingLoader.crawlJournal = CrawlJournal(folder)
+            with self.assertLogs('linkedinjobloader', level='INFO'):
+                crashingLoader.loadJobs(params, shouldSleep = False)
+
+            driver = Mock()
+            driver.execute_script.side_effect = [ self.__generatePage(50, 10) ]
+            jobLoader = Linkedin.JobLoader(DriverPool(lambda: driver))
+            jobLoader.crawlJournal = CrawlJournal(folder)
+
+            # act
+            with self.assertLogs('linkedinjobloader', level='INFO') as cm:
+                result = jobLoader.loadJobs(params, shouldSleep = False)
+
+            # assert
+            self.assertEqual([ job.jobLink for job in result ], [ 'http://example.com/%d' % i for i in range(60) ])
+            self.assertEqual(driver.get.call_count, 1)
+            self.assertIn('start=50', driver.get.call_args[0][0])
+            self.assertIn('INFO:linkedinjobloader:Resuming interrupted crawl from page 3, 50 jobs were loaded before it was interrupted', cm.output)
+            self.assertEqual(os.listdir(folder), []) # finished crawl leaves nothing to resume
+
+
+    def test_ResumedCrawlEndsOnEmptyPageWithoutRetryingIt(self):
+        with tempfile.TemporaryDirectory() as folder:
+            # arrange
+            params = Linkedin.SearchParams()
+            params.query = 'A'
+            params.location = 'B'
+            crashingDriver = Mock()
+            crashingDriver.execute_script.side_effect = [ self.__generatePage(0, LINKEDIN_PAGE_SIZE, '75'), self.__generatePage(25, LINKEDIN_PAGE_SIZE),
+                                                          Exception('Browser crashed') ]
+            crashingLoader = Linkedin.JobLoader(DriverPool(lambda: crashingDriver))
+            crashingLoader.crawlJournal = CrawlJournal(folder)
+            with self.assertLogs('linkedinjobloader', level='INFO'):
+                crashingLoader.loadJobs(params, shouldSleep = False)
+
+            driver = Mock()
+            driver.execute_script.side_effect = [ self.__generatePage(50, 0) ]
+            jobLoader = Linkedin.JobLoader(DriverPool(lambda: driver))
+            jobLoader.crawlJournal = CrawlJournal(folder)
+
+            # act
+            with self.assertLogs('linkedinjobloader', level='INFO') as cm:
+                result = jobLoader.loadJobs(params, shouldSleep = False)
+
+            # assert
+            self.assertEqual(len(result), 50)
+            self.assertEqual(driver.get.call_count, 1)
+            self.assertEqual(jobLoader.pageLoadStats.attempts, 1)
+            self.assertFalse(any(line.startswith('WARNING') for line in cm.output))
+
+
+    def test_CrawlJournalIgnoresTornLastLineAndOldJournals(self):
+        with tempfile.TemporaryDirectory() as folder:
+            # arrange
+            clock = FakeClock()
+            journal = CrawlJournal(folder, maxAgeSeconds = 60, clock = clock)
+            job = JobInfo('Title', 'Company', 'http://example.com/1', 'Location', '', datetime(2020, 2, 2))
+            journal.recordPage('search', 0, 'http://example.com/?page=1', 100, 25, [ job ])
+            with open(os.path.join(folder, os.listdir(folder)[0]), 'a', encoding='utf-8') as f:
+                f.write('{"searchKey": "search", "pageNu')
+
+            # act
+            checkpoint = journal.getCheckpoint('search')
+            clock.now += 3600
+            oldCheckpoint = journal.getCheckpoint('search')
+
+            # assert
+            self.assertEqual((checkpoint.pageNumber, checkpoint.nextPageUrl, checkpoint.limit, checkpoint.loadedCount), (0, 'http://example.com/?page=1', 100, 25))
+            self.assertEqual([ (job.jobLink, job.datePosted) for job in checkpoint.jobs ], [ ('http://example.com/1', datetime(2020, 2, 2)) ])
+            self.assertIsNone(oldCheckpoint)
+
+
+if __name__ == '__main__':
+    unittest.main()
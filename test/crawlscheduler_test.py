@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+
+import unittest
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.crawlscheduler import CrawlScheduler
+
+class Test_CrawlScheduler(unittest.TestCase):
+
+    def test_CrawlSchedulerRunsCyclesUntilMaxCycles(self):
+        # arrange
+        cycles = []
+        scheduler = CrawlScheduler(intervalSeconds = 0)
+
+        # act
+        result = scheduler.run(cycles.append, maxCycles = 3)
+
+        # assert
+        self.assertEqual(result, 3)
+        self.assertEqual(cycles, [ 1, 2, 3 ])
+
+
+    def test_CrawlSchedulerGoesOnAfterFailedCycle(self):
+        with self.assertLogs('crawlscheduler', level='ERROR') as cm:
+            # arrange
+            cycles = []
+            def runCycle(cycle: int) -> None:
+                cycles.append(cycle)
+                if cycle == 1:
+                    raise Exception('Fubar!')
+            scheduler = CrawlScheduler(intervalSeconds = 0)
+
+            # act
+            scheduler.run(runCycle, maxCycles = 2)
+
+            # assert
+            self.assertEqual(cycles, [ 1, 2 ])
+            self.assertIn('ERROR:crawlscheduler:Exception in crawl cycle 1', cm.output[0])
+
+
+    def test_CrawlSchedulerWaitsForIntervalAndStopsWhenAsked(self):
+        # arrange
+        now = [ 0 ]
+        scheduler = CrawlScheduler(intervalSeconds = 60 * 60, clock = lambda: now[0])
+        def runCycle(cycle: int) -> None:
+            now[0] += 10
+            scheduler.stop() # would otherwise wait for almost an hour
+
+        # act
+        result = scheduler.run(runCycle)
+
+        # assert
+        self.assertEqual(result, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
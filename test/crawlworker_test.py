@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+
+import unittest
+import os
+import sys
+import tempfile
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.base.basejobloader import BaseJobLoader
+from src.crawlworker import CrawlWorker
+from src.workqueue import WorkQueue
+from src.jobinfo import JobInfo
+
+class WorkerSearchParams:
+    def __init__(self, host: str, pageCount: int):
+        self.host = host
+        self.pageCount = pageCount
+
+
+class WorkerFakeJobLoader(BaseJobLoader):
+    def __init__(self, failOnPage: int = None):
+        super().__init__(None, 'workerfakejobloader')
+        self._pageLoadAttempts = 1
+        self.failOnPage = failOnPage
+        self.loadedUrls = []
+
+    @contextmanager
+    def _openSession(self):
+        yield
+
+    def _fetchPage(self, url: str) -> str:
+        if self.failOnPage is not None and url.endswith('page=%d' % self.failOnPage):
+            raise Exception('Browser crashed')
+        self.loadedUrls.append(url)
+        return url
+
+    def _parsePage(self, url: str, rawPage: str) -> dict:
+        return { 'jobs': [ rawPage ], 'count': None, 'next': None }
+
+    def _getFirstPageUrl(self, searchParams: WorkerSearchParams) -> str:
+        return '%s?page=0' % searchParams.host
+
+    def _getJobCountLimit(self, page: dict) -> int:
+        return 100
+
+    def _getJobsFromPage(self, url: str, page: dict) -> list[JobInfo]:
+        return [ JobInfo('Title', 'Company', url, 'Location', '', datetime(2024, 1, 1)) for url in page['jobs'] ]
+
+    def _getNextPageUrl(self, searchParams: WorkerSearchParams, pageNumber: int, page: dict, jobsOnPage: list[JobInfo]) -> str | None:
+        return '%s?page=%d' % (searchParams.host, pageNumber + 1) if pageNumber + 1 < searchParams.pageCount else None
+
+
+class Test_CrawlWorker(unittest.TestCase):
+
+    def test_CrawlWorkersShareOneCrawl(self):
+        with tempfile.TemporaryDirectory() as folder:
+            # arrange
+            filePath = os.path.join(folder, 'workqueue.sqlite')
+            searches = { 'Search %d' % i: WorkerSearchParams('http://site%d.com/' % i, 3) for i in range(6) }
+            WorkQueue(filePath).startCrawl(searches, lambda params: params.host)
+            taskCounts = []
+            def runWorker(workerId: str) -> None:
+                taskCounts.append(CrawlWorker(WorkQueue(filePath), lambda params: WorkerFakeJobLoader(), workerId, shouldSleep = False, pollSeconds = 0.05).run())
+
+            # act
+            workers = [ threading.Thread(target = runWorker, args = ('worker %d' % i,)) for i in range(3) ]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+            jobs = WorkQueue(filePath).getJobs()
+
+            # assert
+            self.assertEqual(sum(taskCounts), 6)
+            self.assertEqual(len(jobs), 18)
+            self.assertCountEqual([ job.jobLink for job in jobs ], [ 'http://site%d.com/?page=%d' % (i, page) for i in range(6) for page in range(3) ])
+
+
+    def test_CrawlWorkerHandsBackSearchThatFailedAndKeepsItsJobs(self):
+        with tempfile.TemporaryDirectory() as folder:
+            # arrange
+            filePath = os.path.join(folder, 'workqueue.sqlite')
+            WorkQueue(filePath).startCrawl({ 'Search': WorkerSearchParams('http://site.com/', 4) }, lambda params: params.host)
+            worker = CrawlWorker(WorkQueue(filePath), lambda params: WorkerFakeJobLoader(failOnPage = 2), 'worker 1', shouldSleep = False)
+
+            # act
+            with self.assertLogs('crawlworker', level='WARNING'):
+                taskCount = worker.run(maxTasks = 1)
+            queue = WorkQueue(filePath)
+
+            # assert
+            self.assertEqual(taskCount, 1)
+            self.assertEqual(queue.getProgress(), { 'pending': 1 })
+            self.assertEqual([ job.jobLink for job in queue.getJobs() ], [ 'http://site.com/?page=0', 'http://site.com/?page=1' ])
+
+
+    def test_CrawlWorkerGivesUpOnSearchThatFailedTooManyTimes(self):
+        with tempfile.TemporaryDirectory() as folder:
+            # arrange
+            filePath = os.path.join(folder, 'workqueue.sqlite')
+            WorkQueue(filePath).startCrawl({ 'Search': WorkerSearchParams('http://site.com/', 4) }, lambda params: params.host)
+            worker = CrawlWorker(WorkQueue(filePath, maxAttempts = 2), lambda params: WorkerFakeJobLoader(failOnPage = 2), 'worker 1', shouldSleep = False)
+
+            # act
+            with self.assertLogs('crawlworker', level='WARNING'):
+                taskCount = worker.run()
+            queue = WorkQueue(filePath)
+
+            # assert
+            self.assertEqual(taskCount, 2)
+            self.assertEqual(queue.getProgress(), { 'failed': 1 })
+            self.assertEqual([ job.jobLink for job in queue.getJobs() ], [ 'http://site.com/?page=0', 'http://site.com/?page=1' ])
+
+
+    def test_CrawlWorkerTakesOverSearchFromWhereFailedWorkerStopped(self):
+        with tempfile.TemporaryDirectory() as folder:
+            # arrange
+            filePath = os.path.join(folder, 'workqueue.sqlite')
+            WorkQueue(filePath).startCrawl({ 'Search': WorkerSearchParams('http://site.com/', 4) }, lambda params: params.host)
+            with self.assertLogs('crawlworker', level='WARNING'):
+                CrawlWorker(WorkQueue(filePath), lambda params: WorkerFakeJobLoader(failOnPage = 2), 'worker 1', shouldSleep = False).run(maxTasks = 1)
+            loader = WorkerFakeJobLoader()
+
+            # act
+            taskCount = CrawlWorker(WorkQueue(filePath), lambda params: loader, 'worker 2', shouldSleep = False).run()
+            jobs = WorkQueue(filePath).getJobs()
+
+            # assert
+            self.assertEqual(taskCount, 1)
+            self.assertEqual(loader.loadedUrls, [ 'http://site.com/?page=2', 'http://site.com/?page=3' ])
+            self.assertEqual([ job.jobLink for job in jobs ], [ 'http://site.com/?page=%d' % page for page in range(4) ])
+
+
+if __name__ == '__main__':
+    unittest.main()
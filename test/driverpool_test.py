@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+
+import unittest
+from unittest.mock import Mock, PropertyMock
+import os
+import sys
+import threading
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.base.driverpool import DriverPool
+
+class Test_DriverPool(unittest.TestCase):
+
+    def test_DriverPoolReusesIdleDriver(self):
+        # arrange
+        factory = Mock(side_effect = lambda: Mock())
+        pool = DriverPool(factory, size = 2)
+
+        # act
+        with pool.lease() as driver1:
+            pass
+        with pool.lease() as driver2:
+            pass
+
+        # assert
+        self.assertIs(driver1, driver2)
+        self.assertEqual(factory.call_count, 1)
+
+
+    def test_DriverPoolStartsNewDriverForConcurrentLease(self):
+        # arrange
+        factory = Mock(side_effect = lambda: Mock())
+        pool = DriverPool(factory, size = 2)
+
+        # act
+        with pool.lease() as driver1:
+            with pool.lease() as driver2:
+                pass
+
+        # assert
+        self.assertIsNot(driver1, driver2)
+        self.assertEqual(factory.call_count, 2)
+
+
+    def test_DriverPoolMakesLeaseWaitWhenAllDriversAreBusy(self):
+        # arrange
+        factory = Mock(side_effect = lambda: Mock())
+        pool = DriverPool(factory, size = 1)
+        leasedDrivers = []
+
+        def leaseInThread():
+            with pool.lease() as driver:
+                leasedDrivers.append(driver)
+
+        # act
+        with pool.lease() as driver:
+            thread = threading.Thread(target = leaseInThread)
+            thread.start()
+            thread.join(timeout = 0.2)
+            waitedForDriver = thread.is_alive()
+        thread.join()
+
+        # assert
+        self.assertTrue(waitedForDriver)
+        self.assertEqual(leasedDrivers, [ driver ])
+        self.assertEqual(factory.call_count, 1)
+
+
+    def test_DriverPoolQuitsAllStartedDrivers(self):
+        # arrange
+        pool = DriverPool(lambda: Mock(), size = 2)
+        with pool.lease() as driver1:
+            with pool.lease() as driver2:
+                pass
+
+        # act
+        pool.quit()
+
+        # assert
+        driver1.quit.assert_called_once()
+        driver2.quit.assert_called_once()
+
+
+    def test_DriverPoolReplacesDeadDriver(self):
+        # arrange
+        factory = Mock(side_effect = lambda: Mock())
+        pool = DriverPool(factory, size = 1)
+        with pool.lease() as deadDriver:
+            type(deadDriver).current_window_handle = PropertyMock(side_effect = Exception('Browser crashed'))
+
+        # act
+        with self.assertLogs('driverpool', level='WARNING'):
+            pool.discardDeadDrivers()
+        with pool.lease() as driver:
+            pass
+
+        # assert
+        self.assertIsNot(driver, deadDriver)
+        self.assertEqual(factory.call_count, 2)
+        deadDriver.quit.assert_called_once()
+
+
+    def test_DriverPoolKeepsLiveDrivers(self):
+        # arrange
+        factory = Mock(side_effect = lambda: Mock())
+        pool = DriverPool(factory, size = 1)
+        with pool.lease() as driver1:
+            pass
+
+        # act
+        pool.discardDeadDrivers()
+        with pool.lease() as driver2:
+            pass
+
+        # assert
+        self.assertIs(driver1, driver2)
+        self.assertEqual(factory.call_count, 1)
+
+
+    def test_DriverPoolThrowsExceptionOnInvalidSize(self):
+        with self.assertRaises(ValueError):
+            DriverPool(lambda: Mock(), size = 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
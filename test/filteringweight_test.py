@@ -6,8 +6,9 @@ import sys
 from datetime import datetime
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from src.jobprocessor import RegexFilteringWeight, SalaryFilteringWeight
+from src.jobprocessor import RegexFilteringWeight, KeywordFilteringWeight, SalaryFilteringWeight
 from src.jobinfo import Job, JobLocation
+from src.utility import getAbsPathRelativeToFile
 
 class Test_FilteringWeight(unittest.TestCase):
 
@@ -68,7 +69,9 @@ class Test_FilteringWeight(unittest.TestCase):
 
     __desirableSalariesTestParams = [[ '$59,108 - $75,652 a year' ], 
                                      [ '$59,108 - $75,652 a year', '$45,000 - $55,000 a year' ],
-                                     [ '$112,300 a year' ] ]
+                                     [ '$112,300 a year' ],
+                                     [ '$30 - $45 an hour' ],
+                                     [ '$6,000 a month' ] ]
      
     def test_SalaryFilteringWeightSetsWeightIfSalaryIsHigherThanSpecified(self):
         for salaryList in self.__desirableSalariesTestParams:
@@ -88,6 +91,7 @@ class Test_FilteringWeight(unittest.TestCase):
     __undesirableSalariesTestParams = [[ '$12 an hour' ], 
                                        [ '$32,108 - $45,652 a year', '$45,000 - $55,000 a year' ],
                                        [ '$32,108 - $45,652 a year' ],
+                                       [ '$25 an hour' ],
                                        [ 'Fubar' ] ]
      
     def test_SalaryFilteringWeightDoesNotSetWeightIfSalaryIsLowerThanSpecified(self):
@@ -104,5 +108,58 @@ class Test_FilteringWeight(unittest.TestCase):
                 self.assertEqual(len(job.derogatoryMarks), 0)
                 self.assertEqual(job.weight, 0)
 
+
+    def test_SalaryFilteringWeightOnlyCountsSalariesInGivenCurrency(self):
+        # arrange
+        job = Job('Nurse', 'Hospital', datetime.now(), [JobLocation('London', 'http://example.com')], [ '£70,000 - £80,000 a year' ])
+        weight = SalaryFilteringWeight(1, 60000, currency = 'USD')
+
+        # act
+        weight.assignWeightAndDerogatoryMarkToJob(job)
+
+        # assert
+        self.assertEqual(job.weight, 0)
+
+
+    def test_KeywordFilteringWeightSetsWeightAndDerogatoryMarkForKeywordsFromFile(self):
+        # arrange
+        jobs = [ Job('Driver', 'Great Talent Partners', datetime.now(), [], []), Job('Driver', 'Recruiters Inc', datetime.now(), [], []) ]
+        weight = KeywordFilteringWeight('company', -1, [ getAbsPathRelativeToFile(__file__, 'resources', 'keywords.txt') ])
+
+        # act
+        weight.assignWeightsAndDerogatoryMarksToJobs(jobs)
+
+        # assert
+        self.assertEqual(jobs[0].derogatoryMarks, [ 'Undesirable word in company: \'Talent Partners\'' ])
+        self.assertEqual(jobs[0].weight, -1)
+        self.assertEqual(jobs[1].derogatoryMarks, [])
+        self.assertEqual(jobs[1].weight, 0)
+
+
+    def test_KeywordFilteringWeightSetsWeightForEveryKeywordFound(self):
+        # arrange
+        job = Job('Local Class A Driver', 'Hospital', datetime.now(), [], [])
+        weight = KeywordFilteringWeight('title', 2, keywords = [ 'class a', 'local' ])
+
+        # act
+        weight.assignWeightAndDerogatoryMarkToJob(job)
+
+        # assert
+        self.assertEqual(len(job.derogatoryMarks), 0)
+        self.assertEqual(job.weight, 4)
+
+
+    def test_KeywordFilteringWeightLogsMissingKeywordFile(self):
+        with self.assertLogs('filteringweight', level='ERROR'):
+            # arrange
+            job = Job('Driver', 'Hire Us', datetime.now(), [], [])
+            weight = KeywordFilteringWeight('company', -1, [ getAbsPathRelativeToFile(__file__, 'resources', 'nonexistent.txt') ], [ 'hire' ])
+
+            # act
+            weight.assignWeightAndDerogatoryMarkToJob(job)
+
+            # assert
+            self.assertEqual(job.weight, -1)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -72,4 +72,15 @@ class Test_HtmlRenderer(unittest.TestCase):
         expectedReportFilePath = getAbsPathRelativeToFile(__file__, 'resources', 'expected_empty_report.html')
         with open(expectedReportFilePath, newline='', encoding='utf-8') as f:
             expectedContent = f.read()
-            self.assertEqual(result, expectedContent)
\ No newline at end of file
+            self.assertEqual(result, expectedContent)
+
+    def test_HtmlRendererTellsWhichSearchesFoundJob(self):
+        # arrange
+        job = Job('Nurse', 'Hospital', datetime(2020, 2, 2), [ JobLocation('New York, NY', 'http://example1.com') ], [], searchLabels = [ 'Nurses in NY', 'Nurses anywhere' ])
+        htmlRenderer = HtmlRenderer()
+
+        # act
+        result = htmlRenderer.render([ job ])
+
+        # assert
+        self.assertIn('<td>Nurse<div><small>Found by: Nurses in NY, Nurses anywhere</small></div></td>', result)
\ No newline at end of file
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+
+import unittest
+import os
+import sys
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import src.indeed as Indeed
+from src.base.httpclient import HttpClient
+from src.base.pageloadstats import PageFailure
+from src.constants import INDEED_SEARCH_PATH
+from src.utility import getAbsPathRelativeToFile
+from standinserver import StandInServer
+
+class Test_IndeedHttpJobLoader(unittest.TestCase):
+
+    @staticmethod
+    def __readResource(fileName: str) -> str:
+        with open(getAbsPathRelativeToFile(__file__, 'resources', fileName), encoding='utf-8') as f:
+            return f.read()
+
+    def __servePages(self, query: dict) -> tuple[int, str]:
+        if 'start' in query:
+            return (200, self.__readResource('indeed_jobs_page_2.html'))
+        else:
+            return (200, self.__readResource('indeed_jobs_page_1.html'))
+
+
+    def test_IndeedHttpJobLoaderLoadsJobsFromEmbeddedJson(self):
+        with StandInServer({ '/' + INDEED_SEARCH_PATH: self.__servePages }) as server:
+            with self.assertLogs('indeedhttpjobloader', level='INFO') as cm:
+                # arrange
+                params = Indeed.SearchParams()
+                params.query = 'Spanish Translator'
+                params.location = 'United States'
+                httpClient = HttpClient()
+                jobLoader = Indeed.HttpJobLoader(httpClient, server.host)
+
+                # act
+                result = jobLoader.loadJobs(params, shouldSleep = False)
+                httpClient.close()
+
+                # assert
+                self.assertEqual(len(result), 3)
+                self.assertEqual(result[0].title, 'Spanish Translator')
+                self.assertEqual(result[0].company, 'Translations Inc')
+                self.assertEqual(result[0].jobLink, server.host + 'rc/clk?jk=1111111111111111&from=vj')
+                self.assertEqual(result[0].location, 'Remote')
+                self.assertEqual(result[0].salary, '$25 - $30 an hour')
+                self.assertEqual(result[0].datePosted, datetime.fromtimestamp(1687132800))
+                self.assertEqual(result[1].title, 'Spanish Interpreter </script> Contract')
+                self.assertEqual(result[2].title, 'Court Interpreter')
+                self.assertEqual(server.requestedPaths[1], '/jobs?q=spanish+translator&l=United+States&start=10')
+                self.assertIn('INFO:indeedhttpjobloader:Will attempt to load 3 jobs', cm.output)
+                self.assertIn('INFO:indeedhttpjobloader:Loaded a total of 3 jobs', cm.output)
+
+
+    def test_IndeedHttpJobLoaderGivesUpIfPageIsBlocked(self):
+        with StandInServer({ '/' + INDEED_SEARCH_PATH: lambda query: (403, '<html><body>Verify you are human</body></html>') }) as server:
+            with self.assertLogs('indeedhttpjobloader', level='INFO') as cm:
+                # arrange
+                params = Indeed.SearchParams()
+                params.query = 'Spanish Translator'
+                params.location = 'United States'
+                jobLoader = Indeed.HttpJobLoader(HttpClient(), server.host)
+
+                # act
+                result = jobLoader.loadJobs(params, shouldSleep = False)
+
+                # assert
+                self.assertEqual(len(result), 0)
+                self.assertEqual(jobLoader.pageLoadStats.attempts, 3)
+                self.assertEqual(jobLoader.pageLoadStats.failures[PageFailure.BlockPage], 3)
+                self.assertEqual(jobLoader.pageLoadStats.searchesGivenUp, 1)
+                self.assertIn('WARNING:indeedhttpjobloader:Could not load page 1, search ends with the jobs loaded so far', cm.output)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,24 +2,21 @@
 
 import unittest
 from unittest.mock import Mock
-import multiprocessing.dummy as multimock
 import os
 import sys
-from selenium.common.exceptions import NoSuchElementException
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.base.driverpool import DriverPool
 import src.indeed as Indeed
 from src.constants import INDEED_JOB_LOADING_LIMIT
 
 class Test_IndeedJobLoader(unittest.TestCase):
 
-    def __generateJobElements(self, count: int) -> list[Mock]:
-        results = []
-        for i in range(0, count):
-            jobElement = Mock()
-            jobElement.get.side_effect = Test_IndeedJobLoader.lmbd
-            results.append(jobElement)
-        return results
+    def __generatePage(self, jobCount: int, totalJobCount: int | None = None, hasNextPage: bool = True) -> dict:
+        jobs = []
+        for i in range(0, jobCount):
+            jobs.append({ 'displayTitle': 'Title %d' % i, 'company': 'Company', 'link': '/fubar?foo=bar', 'formattedLocation': 'New York, NY', 'pubDate': 123456 })
+        return { 'jobs': jobs, 'count': totalJobCount, 'next': 'http://example.com/next' if hasNextPage else None }
 
 
     def test_IndeedJobLoaderLoadsJobsInPages(self):
@@ -31,13 +28,9 @@ class Test_IndeedJobLoader(unittest.TestCase):
 
             driver = Mock()
             jobCount = 25
-            driver.execute_script.side_effect = [ jobCount, self.__generateJobElements(15), self.__generateJobElements(10) ]
-            driver.find_element.side_effect = [ Mock(), NoSuchElementException() ]
-            driver.window_handles = [0]
+            driver.execute_script.side_effect = [ self.__generatePage(15, jobCount), self.__generatePage(10, hasNextPage = False) ]
 
-            lock = multimock.Lock()
-
-            jobLoader = Indeed.JobLoader(driver, lock, 0)
+            jobLoader = Indeed.JobLoader(DriverPool(lambda: driver))
 
             # act
             result = jobLoader.loadJobs(params, shouldSleep = False)
@@ -49,6 +42,8 @@ class Test_IndeedJobLoader(unittest.TestCase):
             self.assertIn('INFO:indeedjobloader:Loaded 25 out of 25 jobs', cm.output)
             self.assertIn('INFO:indeedjobloader:Next page does not exist, there are no more jobs, process finished', cm.output)
             self.assertIn('INFO:indeedjobloader:Loaded a total of 25 jobs', cm.output)
+            self.assertEqual(driver.execute_script.call_count, 2) # one round trip per page
+            driver.find_element.assert_not_called()
 
 
     def test_IndeedJobLoaderDefaultsToJobLoadingLimitWhenNoLimitFound(self):
@@ -62,19 +57,13 @@ class Test_IndeedJobLoader(unittest.TestCase):
             pageSize = 15
             jobCount = INDEED_JOB_LOADING_LIMIT + pageSize
 
-            jobElementBatches = []
-            nextPageMocks = []
+            pages = []
             for i in range(0, jobCount, pageSize):
-                jobElementBatches.append(self.__generateJobElements(pageSize))
-                nextPageMocks.append( Mock() )
-
-            driver.execute_script.side_effect = [ jobCount ] + jobElementBatches
-            driver.find_elements.side_effect = nextPageMocks
-            driver.window_handles = [0]
+                pages.append(self.__generatePage(pageSize, jobCount))
 
-            lock = multimock.Lock()
+            driver.execute_script.side_effect = pages
 
-            jobLoader = Indeed.JobLoader(driver, lock, 0)
+            jobLoader = Indeed.JobLoader(DriverPool(lambda: driver))
 
             # act
             result = jobLoader.loadJobs(params, shouldSleep = False)
@@ -95,13 +84,9 @@ class Test_IndeedJobLoader(unittest.TestCase):
 
             driver = Mock()
             jobCount = 25
-            driver.execute_script.side_effect = [ jobCount, self.__generateJobElements(15), self.__generateJobElements(15) ]
-            driver.find_element.side_effect = [ Mock(), NoSuchElementException() ]
-            driver.window_handles = [0]
-
-            lock = multimock.Lock()
+            driver.execute_script.side_effect = [ self.__generatePage(15, jobCount), self.__generatePage(15, hasNextPage = False) ]
 
-            jobLoader = Indeed.JobLoader(driver, lock, 0)
+            jobLoader = Indeed.JobLoader(DriverPool(lambda: driver))
 
             # act
             result = jobLoader.loadJobs(params, shouldSleep = False)
@@ -124,12 +109,9 @@ class Test_IndeedJobLoader(unittest.TestCase):
 
             driver = Mock()
             jobCount = 0
-            driver.execute_script.side_effect = [ jobCount ]
-            driver.window_handles = [0]
+            driver.execute_script.side_effect = [ self.__generatePage(0, jobCount) ]
 
-            lock = multimock.Lock()
-
-            jobLoader = Indeed.JobLoader(driver, lock, 0)
+            jobLoader = Indeed.JobLoader(DriverPool(lambda: driver))
 
             # act
             result = jobLoader.loadJobs(params, shouldSleep = False)
@@ -149,12 +131,9 @@ class Test_IndeedJobLoader(unittest.TestCase):
 
             driver = Mock()
             jobCount = 0
-            driver.execute_script.side_effect = [ None ]
-            driver.window_handles = [0]
-
-            lock = multimock.Lock()
+            driver.execute_script.return_value = self.__generatePage(0, None) # same on every attempt
 
-            jobLoader = Indeed.JobLoader(driver, lock, 0)
+            jobLoader = Indeed.JobLoader(DriverPool(lambda: driver))
 
             # act
             result = jobLoader.loadJobs(params, shouldSleep = False)
@@ -174,30 +153,42 @@ class Test_IndeedJobLoader(unittest.TestCase):
 
             driver = Mock()
             driver.get.side_effect = Exception('Fubar!')
-            driver.window_handles = [0]
-
-            lock = multimock.Lock()
 
-            jobLoader = Indeed.JobLoader(driver, lock, 0)
+            jobLoader = Indeed.JobLoader(DriverPool(lambda: driver))
 
             # act
             result = jobLoader.loadJobs(params, shouldSleep = False)
 
             # assert
             self.assertEqual(len(result), 0)
+            self.assertEqual(driver.get.call_count, 3) # every attempt
             self.assertEqual(len(cm.output), 1)
-            self.assertIn('ERROR:indeedjobloader:Exception on loading jobs', cm.output[0])
+            self.assertIn('ERROR:indeedjobloader:Giving up on url = "https://www.indeed.com/jobs?q=A&l=B" after 3 attempts', cm.output[0])
             self.assertIn('Fubar!', cm.output[0])
 
-    @staticmethod
-    def lmbd(key):
-        if key == 'link':
-            return '/fubar?foo=bar'
-        elif key == 'pubDate':
-            return 123456
-        else:
-            return Mock()
-        
+    def test_IndeedJobLoaderMapsJsonJobsToJobInfo(self):
+        # arrange
+        params = Indeed.SearchParams()
+        params.query = 'A'
+        params.location = 'B'
+
+        driver = Mock()
+        page = self.__generatePage(1, 1, hasNextPage = False)
+        page['jobs'][0]['salarySnippet'] = { 'text': '$20 an hour' }
+        driver.execute_script.side_effect = [ page ]
+
+        jobLoader = Indeed.JobLoader(DriverPool(lambda: driver))
+
+        # act
+        result = jobLoader.loadJobs(params, shouldSleep = False)
+
+        # assert
+        self.assertEqual(result[0].title, 'Title 0')
+        self.assertEqual(result[0].company, 'Company')
+        self.assertEqual(result[0].jobLink, 'https://www.indeed.com/fubar?foo=bar')
+        self.assertEqual(result[0].location, 'New York, NY')
+        self.assertEqual(result[0].salary, '$20 an hour')
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
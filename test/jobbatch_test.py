@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+
+import unittest
+import os
+import sys
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.jobbatch import JobBatch
+from src.jobinfo import JobInfo
+from src.jobprocessor import JobProcessor, RegexFilteringWeight
+
+class Test_JobBatch(unittest.TestCase):
+
+    def __createJobs(self) -> list[JobInfo]:
+        return [ JobInfo('Nurse', 'Hospital', 'http://example1.com', 'New York, NY', '$100,000 a year', datetime(2024, 1, 3)),
+                 JobInfo('NURSE', 'hospital', 'http://example2.com', 'Troy, MO', '', datetime(2024, 1, 1)),
+                 JobInfo('Diesel Mechanic', 'Hospital', 'http://example3.com', 'New York, NY', '$100,000 a year', None, description = 'Fix trucks') ]
+
+
+    def test_JobBatchStoresRepeatingStringsOnce(self):
+        # arrange
+        jobs = self.__createJobs()
+
+        # act
+        batch = JobBatch.fromJobs(jobs)
+
+        # assert
+        self.assertEqual(len(batch), 3)
+        self.assertEqual(batch.companies.values, [ 'Hospital', 'hospital' ])
+        self.assertEqual(list(batch.companies.codes), [ 0, 1, 0 ])
+        self.assertEqual(batch.locations.values, [ 'New York, NY', 'Troy, MO' ])
+        self.assertEqual(batch.salaries.values, [ '$100,000 a year', '' ])
+        self.assertEqual(batch.datesPosted[2], JobBatch.NO_DATE)
+        self.assertEqual([ (job.title, job.company, job.jobLink, job.location, job.salary, job.datePosted, job.description) for job in batch ],
+                         [ (job.title, job.company, job.jobLink, job.location, job.salary, job.datePosted, job.description) for job in jobs ])
+
+
+    def test_JobProcessorProcessesJobBatchSameAsJobList(self):
+        # arrange
+        weights = [ RegexFilteringWeight(fieldNameToTest = 'title', weight = -10, regex = r'diesel'),
+                    RegexFilteringWeight(fieldNameToTest = 'company', weight = 1, regex = r'hospital') ]
+
+        # act
+        fromList = JobProcessor(filteringWeights = weights).processJobs(self.__createJobs())
+        fromBatch = JobProcessor(filteringWeights = weights).processJobs(JobBatch.fromJobs(self.__createJobs()))
+
+        # assert
+        self.assertEqual(len(fromBatch), 2)
+        for listJob, batchJob in zip(fromList, fromBatch):
+            self.assertEqual((batchJob.title, batchJob.company, batchJob.weight, batchJob.derogatoryMarks, batchJob.description),
+                             (listJob.title, listJob.company, listJob.weight, listJob.derogatoryMarks, listJob.description))
+            self.assertCountEqual(batchJob.locations, listJob.locations)
+            self.assertCountEqual(batchJob.salaries, listJob.salaries)
+        self.assertEqual(fromBatch[0].title, 'Nurse')
+        self.assertEqual(fromBatch[0].datePosted, datetime(2024, 1, 1))
+        self.assertEqual(fromBatch[1].derogatoryMarks, [ 'Undesirable word in title: \'Diesel\'' ])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+
+import unittest
+import os
+import sys
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.base.jobdetailcache import JobDetailCache
+
+class Test_JobDetailCache(unittest.TestCase):
+
+    def test_JobDetailCacheKeepsDescriptionsBetweenRuns(self):
+        with tempfile.TemporaryDirectory() as folder:
+            # arrange
+            JobDetailCache(folder).put('linkedin:1', 'Night shifts')
+
+            # act
+            description = JobDetailCache(folder).get('linkedin:1')
+            missingDescription = JobDetailCache(folder).get('linkedin:2')
+
+            # assert
+            self.assertEqual(description, 'Night shifts')
+            self.assertIsNone(missingDescription)
+
+
+    def test_JobDetailCacheStoresSameDescriptionOnce(self):
+        with tempfile.TemporaryDirectory() as folder:
+            # arrange
+            cache = JobDetailCache(folder)
+
+            # act
+            cache.put('linkedin:1', 'Night shifts')
+            cache.put('linkedin:2', 'Night shifts')
+            cache.put('linkedin:3', 'Day shifts')
+
+            # assert
+            self.assertEqual(cache.get('linkedin:2'), 'Night shifts')
+            self.assertEqual(len(os.listdir(os.path.join(folder, 'content'))), 2)
+            self.assertEqual(len(os.listdir(os.path.join(folder, 'jobs'))), 3)
+
+
+    def test_JobDetailCacheIgnoresDamagedEntries(self):
+        with tempfile.TemporaryDirectory() as folder:
+            with self.assertLogs('jobdetailcache', level='WARNING'):
+                # arrange
+                cache = JobDetailCache(folder)
+                cache.put('linkedin:1', 'Night shifts')
+                contentFolder = os.path.join(folder, 'content')
+                with open(os.path.join(contentFolder, os.listdir(contentFolder)[0]), 'wb') as f:
+                    f.write(b'not gzip')
+
+                # act
+                description = cache.get('linkedin:1')
+
+                # assert
+                self.assertIsNone(description)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+
+import unittest
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import src.linkedin as Linkedin
+import src.indeed as Indeed
+from src.base.driverpool import DriverPool
+from src.base.httpclient import HttpClient
+from src.base.jobdetailcache import JobDetailCache
+from src.jobdetailenricher import JobDetailEnricher
+from src.jobinfo import JobInfo
+from standinserver import StandInServer
+
+class Test_JobDetailEnricher(unittest.TestCase):
+
+    @staticmethod
+    def __serveJobPage(description: str):
+        return lambda query: (200, '<html><body><h1>Job</h1><div class="show-more-less-html__markup">%s</div></body></html>' % description)
+
+    @staticmethod
+    def __createJob(host: str, jobNumber: int) -> JobInfo:
+        return JobInfo('Nurse %d' % jobNumber, 'Hospital', '%sjobs/view/nurse-at-hospital-%d' % (host, jobNumber), 'New York, NY', '', datetime.now())
+
+
+    def test_JobDetailEnricherLoadsDescriptionsFromJobPages(self):
+        routes = { '/jobs/view/nurse-at-hospital-1': self.__serveJobPage('<p>Night <b>shifts</b>,<br>no</p><p>weekends</p>'),
+                   '/jobs/view/nurse-at-hospital-2': lambda query: (500, 'Oops') }
+        with StandInServer(routes) as server, tempfile.TemporaryDirectory() as folder:
+            with self.assertLogs('linkedinhttpjobloader', level='WARNING'):
+                # arrange
+                httpClient = HttpClient()
+                jobs = [ self.__createJob(server.host, 1), self.__createJob(server.host, 2) ]
+                enricher = JobDetailEnricher(JobDetailCache(folder), lambda jobLink: Linkedin.HttpJobLoader(httpClient, server.host), shouldSleep = False)
+
+                # act
+                asyncio.run(enricher.enrichAsync(jobs))
+                httpClient.close()
+
+                # assert
+                self.assertEqual(jobs[0].description, 'Night shifts, no weekends')
+                self.assertIsNone(jobs[1].description)
+
+
+    def test_JobDetailEnricherNeverLoadsJobPageTwice(self):
+        with StandInServer({ '/jobs/view/nurse-at-hospital-1': self.__serveJobPage('Night shifts') }) as server, tempfile.TemporaryDirectory() as folder:
+            # arrange
+            httpClient = HttpClient()
+            createJobLoader = lambda jobLink: Linkedin.HttpJobLoader(httpClient, server.host)
+            firstRunJob = self.__createJob(server.host, 1)
+            secondRunJob = self.__createJob(server.host, 1)
+            secondRunJob.jobLink = 'http://127.0.0.1/jobs/view/1/' # same job, different link
+
+            # act
+            asyncio.run(JobDetailEnricher(JobDetailCache(folder), createJobLoader, shouldSleep = False).enrichAsync([ firstRunJob ]))
+            asyncio.run(JobDetailEnricher(JobDetailCache(folder), createJobLoader, shouldSleep = False).enrichAsync([ secondRunJob ]))
+            httpClient.close()
+
+            # assert
+            self.assertEqual(len(server.requestedPaths), 1)
+            self.assertEqual(secondRunJob.description, 'Night shifts')
+
+
+    def test_JobDetailEnricherLimitsConcurrentLoads(self):
+        loadCount = 0
+        maxLoadCount = 0
+        lock = threading.Lock()
+        def serveSlowly(query: dict) -> tuple[int, str]:
+            nonlocal loadCount, maxLoadCount
+            with lock:
+                loadCount += 1
+                maxLoadCount = max(maxLoadCount, loadCount)
+            time.sleep(0.1)
+            with lock:
+                loadCount -= 1
+            return (200, '<div class="show-more-less-html__markup">Night shifts</div>')
+
+        routes = { '/jobs/view/nurse-at-hospital-%d' % i: serveSlowly for i in range(6) }
+        with StandInServer(routes) as server, tempfile.TemporaryDirectory() as folder:
+            # arrange
+            httpClient = HttpClient()
+            jobs = [ self.__createJob(server.host, i) for i in range(6) ]
+            enricher = JobDetailEnricher(JobDetailCache(folder), lambda jobLink: Linkedin.HttpJobLoader(httpClient, server.host), maxConcurrentLoads = 2,
+                                         maxConcurrentPageLoadsPerHost = 4, shouldSleep = False)
+
+            # act
+            asyncio.run(enricher.enrichAsync(jobs))
+            httpClient.close()
+
+            # assert
+            self.assertEqual(len(server.requestedPaths), 6)
+            self.assertEqual(maxLoadCount, 2)
+            self.assertTrue(all(job.description == 'Night shifts' for job in jobs))
+
+
+    def test_JobDetailEnricherWaitsForBrowsersWithoutHoldingThreads(self):
+        with tempfile.TemporaryDirectory() as folder:
+            # arrange
+            def createDriver() -> Mock:
+                driver = Mock()
+                driver.get.side_effect = lambda url: time.sleep(0.05)
+                driver.execute_script.return_value = 'Night shifts'
+                return driver
+            driverPool = DriverPool(createDriver, size = 2)
+            jobs = [ self.__createJob('http://example%d.com/' % i, i) for i in range(4) ]
+            enricher = JobDetailEnricher(JobDetailCache(folder), lambda jobLink: Linkedin.JobLoader(driverPool), maxConcurrentLoads = 4, shouldSleep = False)
+            async def enrichWithTwoThreads() -> None:
+                asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers = 2))
+                await asyncio.wait_for(enricher.enrichAsync(jobs), 10)
+
+            # act
+            asyncio.run(enrichWithTwoThreads())
+
+            # assert
+            self.assertTrue(all(job.description == 'Night shifts' for job in jobs))
+
+
+    def test_JobDetailEnricherSkipsJobsItCannotLoad(self):
+        with tempfile.TemporaryDirectory() as folder:
+            # arrange
+            job = JobInfo('Nurse', 'Hospital', 'http://example.com/job', 'New York, NY', '', datetime.now())
+            enricher = JobDetailEnricher(JobDetailCache(folder), lambda jobLink: None, shouldSleep = False)
+
+            # act
+            asyncio.run(enricher.enrichAsync([ job ]))
+
+            # assert
+            self.assertIsNone(job.description)
+
+
+    def test_JobLoadersTellJobsApartByJobId(self):
+        # arrange
+        linkedinLoader = Linkedin.JobLoader(None)
+        indeedLoader = Indeed.JobLoader(None)
+
+        # act & assert
+        self.assertEqual(linkedinLoader.getJobId('https://www.linkedin.com/jobs/view/truck-driver-at-some-company-3612345678'), 'linkedin:3612345678')
+        self.assertEqual(linkedinLoader.getJobId('https://www.linkedin.com/jobs/view/3612345678/'), 'linkedin:3612345678')
+        self.assertEqual(indeedLoader.getJobId('https://www.indeed.com/rc/clk?jk=0123456789abcdef&fccid=1'), 'indeed:0123456789abcdef')
+        self.assertEqual(indeedLoader.getJobId('https://www.indeed.com/viewjob?from=serp&jk=0123456789abcdef'), 'indeed:0123456789abcdef')
+
+
+if __name__ == '__main__':
+    unittest.main()
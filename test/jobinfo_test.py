@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+
+import unittest
+import os
+import sys
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.jobinfo import JobKey, JobInfo, JobLocation, Job
+
+class Test_JobInfo(unittest.TestCase):
+
+    def test_JobKeysThatAreEqualHaveEqualHashes(self):
+        # arrange
+        key = JobKey('Registered Nurse', 'General Hospital')
+        sameKey = JobKey('REGISTERED NURSE', 'general hospital')
+        location = JobLocation('New York, NY', 'http://example.com/Job')
+        sameLocation = JobLocation('NEW YORK, NY', 'http://EXAMPLE.com/job')
+
+        # act
+        keys = { key, sameKey }
+        locations = { location, sameLocation }
+
+        # assert
+        self.assertEqual(key, sameKey)
+        self.assertEqual(len(keys), 1)
+        self.assertEqual(len(locations), 1)
+        self.assertEqual(key.key, ('registered nurse', 'general hospital'))
+        self.assertLess(JobKey('nurse', 'Hospital'), JobKey('Nurse', 'Hospital 2'))
+
+
+    def test_JobsHaveNoInstanceDictionaries(self):
+        # arrange
+        jobInfo = JobInfo('Nurse', 'Hospital', 'http://example.com', 'New York, NY', '', datetime.now())
+        job = Job('Nurse', 'Hospital', datetime.now(), [ JobLocation('New York, NY', 'http://example.com') ], [])
+
+        # act & assert
+        for instance in [ jobInfo, job, job.locations[0] ]:
+            self.assertFalse(hasattr(instance, '__dict__'))
+            with self.assertRaises(AttributeError):
+                instance.misspelledAttribute = 1
+
+
+    def test_JobsShareRepeatingStrings(self):
+        # arrange
+        company = ''.join([ 'Hos', 'pital' ]) # not a constant, so it's not interned by the compiler
+        location = ''.join([ 'New York', ', NY' ])
+
+        # act
+        firstJob = JobInfo('Nurse', company, 'http://example.com/1', location, '', datetime.now())
+        secondJob = JobInfo('Nurse', 'Hospital', 'http://example.com/2', 'New York, NY', '', datetime.now())
+
+        # assert
+        self.assertIs(firstJob.company, secondJob.company)
+        self.assertIs(firstJob.location, secondJob.location)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,6 +8,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import src.linkedin as Linkedin
 import src.indeed as Indeed
 from src.jobloaderfactory import JobLoaderFactory
+from src.base.httpclient import HttpClient
 
 class Test_JobLoaderFactory(unittest.TestCase):
 
@@ -20,7 +21,22 @@ class Test_JobLoaderFactory(unittest.TestCase):
                 factory = JobLoaderFactory()
 
                 # act
-                result = factory.createJobLoader(searchParams, None, None, 0)
+                result = factory.createJobLoader(searchParams, None)
+
+                # assert
+                self.assertIsInstance(result, t)
+
+
+    __httpJobLoaderFactoryTestParams = [ (Linkedin.SearchParams(), Linkedin.HttpJobLoader), (Indeed.SearchParams(), Indeed.HttpJobLoader) ]
+
+    def test_JobLoaderFactoryCreatesHttpJobLoaderIfHttpClientIsProvided(self):
+        for searchParams, t in self.__httpJobLoaderFactoryTestParams:
+            with self.subTest():
+                # arrange
+                factory = JobLoaderFactory()
+
+                # act
+                result = factory.createJobLoader(searchParams, None, HttpClient())
 
                 # assert
                 self.assertIsInstance(result, t)
@@ -33,4 +49,4 @@ class Test_JobLoaderFactory(unittest.TestCase):
             factory = JobLoaderFactory()
 
             # act
-            factory.createJobLoader(searchParams, None, None, 0)
\ No newline at end of file
+            factory.createJobLoader(searchParams, None)
\ No newline at end of file
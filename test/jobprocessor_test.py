@@ -3,11 +3,16 @@
 import unittest
 import os
 import sys
-from datetime import datetime
+import asyncio
+import gc
+import tempfile
+from datetime import datetime, timedelta
+from unittest.mock import patch
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from src.jobprocessor import JobProcessor, RegexFilteringWeight, SalaryFilteringWeight
 from src.jobinfo import JobInfo, JobLocation
+from src.jobbatch import JobBatch
 from src.utility import getAbsPathRelativeToFile
 
 class Test_JobProcessor(unittest.TestCase):
@@ -50,6 +55,23 @@ class Test_JobProcessor(unittest.TestCase):
                 self.assertLess(result[0].weight, 0)
 
 
+    def test_JobProcessorUsesStoplistCompiledBefore(self):
+        with tempfile.TemporaryDirectory() as folder:
+            # arrange
+            jobs = [ JobInfo('Driver', 'UPS', 'http://example.com', 'New York, NY', '', datetime.now()) ]
+            stoplistPath = getAbsPathRelativeToFile(__file__, 'resources', 'stoplist.csv')
+            stoplistIndexPath = os.path.join(folder, 'stoplist.index')
+            JobProcessor(stoplistPath, stoplistIndexPath = stoplistIndexPath).processJobs(jobs)
+
+            # act
+            with self.assertLogs('jobprocessor', level='INFO') as cm:
+                result = JobProcessor(stoplistPath, stoplistIndexPath = stoplistIndexPath).processJobs(jobs)
+
+            # assert
+            self.assertIn('INFO:jobprocessor:Processing jobs against stoplist at "%s" (3 entries, compiled before)...' % stoplistPath, cm.output)
+            self.assertEqual(result[0].derogatoryMarks, [ 'Stoplist entry found for job title = \'Driver\' and company name = \'UPS\' with reason: They don\'t have cookies' ])
+
+
     def test_NoStoplistIsLogged(self):
         with self.assertLogs('jobprocessor', level='WARNING') as cm:
             # arrange
@@ -66,6 +88,32 @@ class Test_JobProcessor(unittest.TestCase):
             
                
 
+    def test_JobProcessorValidatesStoplist(self):
+        with self.assertLogs('jobprocessor', level='INFO') as cm:
+            # arrange
+            stoplistPath = getAbsPathRelativeToFile(__file__, 'resources', 'stoplist.csv')
+            jobProcessor = JobProcessor(stopListPath = stoplistPath)
+
+            # act
+            result = jobProcessor.validateStoplist()
+
+            # assert
+            self.assertEqual(result, 3)
+            self.assertIn('INFO:jobprocessor:Stoplist at "%s" has 3 usable entries' % stoplistPath, cm.output)
+
+
+    def test_JobProcessorDoesNotValidateMissingStoplist(self):
+        with self.assertLogs('jobprocessor', level='WARNING'):
+            # arrange
+            jobProcessor = JobProcessor(stopListPath = getAbsPathRelativeToFile(__file__, 'resources', 'nonexistent.csv'))
+
+            # act
+            result = jobProcessor.validateStoplist()
+
+            # assert
+            self.assertIsNone(result)
+
+
     def test_JobProcessorUsesFilteringWeights(self):
             with self.assertLogs('jobprocessor', level='INFO'):
                 # arrange
@@ -99,5 +147,114 @@ class Test_JobProcessor(unittest.TestCase):
         self.assertCountEqual(result[0].salaries, [ '$100,000 a year' ])
 
 
+    def test_JobProcessorGroupsJobsAcrossBatches(self):
+        # arrange
+        date = datetime.now()
+        batches = [ [ JobInfo('Nurse', 'Hospital', 'http://example1.com', 'New York, NY', '$100,000 a year', date),
+                      JobInfo('Junior Developer', 'Startup', 'http://example2.com', 'Remote', '', date) ],
+                    [ JobInfo('NURSE', 'hospital', 'http://example3.com', 'Troy, MO', '', date - timedelta(days = 1)) ] ]
+        jobProcessor = JobProcessor(getAbsPathRelativeToFile(__file__, 'resources', 'stoplist.csv'))
+
+        # act
+        result = jobProcessor.processJobBatches(iter(batches))
+
+        # assert
+        self.assertEqual([ (job.title, job.company) for job in result ], [ ('Nurse', 'Hospital'), ('Junior Developer', 'Startup') ])
+        self.assertEqual(result[0].datePosted, date - timedelta(days = 1))
+        self.assertCountEqual(result[0].locations, [ JobLocation('New York, NY', 'http://example1.com'), JobLocation('Troy, MO', 'http://example3.com') ])
+        self.assertIn('Stoplist entry found for job title = \'Junior Developer\' with reason: Bad pay', result[1].derogatoryMarks)
+
+
+    def test_JobProcessorProcessesBatchesAsTheyAreStreamed(self):
+        # arrange
+        date = datetime.now()
+        async def streamBatches():
+            yield [ JobInfo('Nurse', 'Hospital', 'http://example1.com', 'New York, NY', '', date) ]
+            yield [ JobInfo('Nurse', 'Hospital', 'http://example2.com', 'Troy, MO', '', date) ]
+        jobProcessor = JobProcessor(getAbsPathRelativeToFile(__file__, 'resources', 'stoplist.csv'))
+
+        # act
+        result = asyncio.run(jobProcessor.processJobBatchesAsync(streamBatches()))
+
+        # assert
+        self.assertEqual(len(result), 1)
+        self.assertEqual(len(result[0].locations), 2)
+
+
+    def test_JobProcessorTellsWhichSearchesFoundGroupedJobs(self):
+        # arrange
+        date = datetime.now()
+        laterFoundJob = JobInfo('Nurse', 'Hospital', 'http://example2.com', 'Troy, MO', '', date, [ 'Nurses in MO' ])
+        def streamBatches():
+            yield [ JobInfo('Nurse', 'Hospital', 'http://example1.com', 'New York, NY', '', date, [ 'Nurses in NY' ]),
+                    JobInfo('Driver', 'UPS', 'http://example3.com', 'Troy, MO', '', date) ]
+            yield JobBatch.fromJobs([ laterFoundJob, JobInfo('Nurse', 'Hospital', 'http://example4.com', 'Albany, NY', '', date, [ 'Nurses in NY' ]) ])
+            laterFoundJob.searchLabels.append('Nurses anywhere') # found by another search after it came out
+        jobProcessor = JobProcessor()
+
+        # act
+        result = jobProcessor.processJobBatches(streamBatches())
+
+        # assert
+        searchLabels = { job.title: job.searchLabels for job in result }
+        self.assertEqual(searchLabels['Nurse'], [ 'Nurses in NY', 'Nurses in MO', 'Nurses anywhere' ])
+        self.assertEqual(searchLabels['Driver'], [])
+
+
+    def test_JobProcessorDatesGroupsOfUndatedJobsWhenItProcessesThem(self):
+        # arrange
+        date = datetime(2024, 5, 1)
+        jobs = [ JobInfo('Nurse', 'Hospital', 'http://example1.com', 'New York, NY', '', None),
+                 JobInfo('Nurse', 'Hospital', 'http://example2.com', 'Troy, MO', '', date),
+                 JobInfo('Driver', 'UPS', 'http://example3.com', 'Troy, MO', '', None) ]
+        jobProcessor = JobProcessor()
+        processingStarted = datetime.now()
+
+        # act
+        result = jobProcessor.processJobs(jobs)
+
+        # assert
+        datesPosted = { job.title: job.datePosted for job in result }
+        self.assertEqual(datesPosted['Nurse'], date)
+        self.assertGreaterEqual(datesPosted['Driver'], processingStarted)
+
+
+    def test_JobProcessorLeavesGarbageCollectionAsItWas(self):
+        # arrange
+        jobs = [ JobInfo('Nurse', 'Hospital', 'http://example1.com', 'New York, NY', '', datetime.now()) ]
+        jobProcessor = JobProcessor()
+        wasEnabled = gc.isenabled()
+
+        # act
+        try:
+            gc.disable()
+            jobProcessor.processJobs(jobs)
+            disabledAfter = not gc.isenabled()
+            gc.enable()
+            jobProcessor.processJobs(jobs)
+            enabledAfter = gc.isenabled()
+        finally:
+            (gc.enable if wasEnabled else gc.disable)()
+
+        # assert
+        self.assertTrue(disabledAfter)
+        self.assertTrue(enabledAfter)
+
+
+    def test_JobProcessorDoesNotTouchGarbageCollectionWhileStreamed(self):
+        # arrange
+        async def streamBatches():
+            yield [ JobInfo('Nurse', 'Hospital', 'http://example1.com', 'New York, NY', '', datetime.now()) ]
+        jobProcessor = JobProcessor()
+
+        # act
+        with patch('gc.disable') as disable:
+            result = asyncio.run(jobProcessor.processJobBatchesAsync(streamBatches()))
+
+        # assert
+        self.assertEqual(len(result), 1)
+        disable.assert_not_called()
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
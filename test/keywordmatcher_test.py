@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+
+import unittest
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.jobprocessor.keywordmatcher import KeywordMatcher
+
+class Test_KeywordMatcher(unittest.TestCase):
+
+    __findAllTestParams = [('Hire Talent Partners', [ 'talent', 'talent partners', 'hire' ], [ 'Hire', 'Talent Partners' ]),
+                           ('Hired Hands', [ 'hire' ], []),
+                           ('Junior C++ Developer', [ 'c++' ], [ 'C++' ]),
+                           ('Class   A Driver', [ 'class a' ], [ 'Class   A' ]),
+                           ('Straße Logistics', [ 'strasse' ], [ 'Straße' ]),
+                           ('he she hers', [ 'he', 'she', 'hers' ], [ 'he', 'she', 'hers' ]),
+                           ('', [ 'hire' ], [])]
+
+    def test_KeywordMatcherFindsWholeKeywordsIgnoringCase(self):
+        for text, keywords, expectedWords in self.__findAllTestParams:
+            with self.subTest(text = text):
+                # arrange
+                matcher = KeywordMatcher(keywords)
+
+                # act
+                result = matcher.findAll(text)
+
+                # assert
+                self.assertEqual(result, expectedWords)
+
+
+    def test_KeywordMatcherFindsKeywordsOfLongLists(self):
+        # arrange
+        keywords = [ 'agency %d' % i for i in range(2000) ] + [ 'staffing' ]
+        matcher = KeywordMatcher(keywords + [ ' ', 'Staffing' ])
+
+        # act
+        result = matcher.findAll('Agency 1999 and AGENCY 42 staffing, agency 19990')
+
+        # assert
+        self.assertEqual(len(matcher), 2001)
+        self.assertEqual(result, [ 'Agency 1999', 'AGENCY 42', 'staffing' ])
+
+
+if __name__ == '__main__':
+    unittest.main()
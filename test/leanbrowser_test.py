@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+
+import unittest
+from unittest.mock import Mock
+import os
+import sys
+from selenium.webdriver.chrome.options import Options
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.base.leanbrowser import makeBrowserOptionsLean, blockUnneededResources
+from src.constants import LEAN_BROWSER_BLOCKED_URL_PATTERNS
+
+class Test_LeanBrowser(unittest.TestCase):
+
+    def test_LeanBrowserOptionsDontWaitForFullPageLoadNorLoadImages(self):
+        # arrange
+        options = Options()
+
+        # act
+        makeBrowserOptionsLean(options)
+
+        # assert
+        self.assertEqual(options.page_load_strategy, 'eager')
+        self.assertEqual(options.experimental_options['prefs']['profile.managed_default_content_settings.images'], 2)
+
+
+    def test_LeanBrowserBlocksUnneededResources(self):
+        # arrange
+        driver = Mock()
+
+        # act
+        blockUnneededResources(driver)
+
+        # assert
+        driver.execute_cdp_cmd.assert_any_call('Network.enable', {})
+        driver.execute_cdp_cmd.assert_called_with('Network.setBlockedURLs', { 'urls': LEAN_BROWSER_BLOCKED_URL_PATTERNS })
+        self.assertIn('*.css', LEAN_BROWSER_BLOCKED_URL_PATTERNS)
+        self.assertIn('*.woff2', LEAN_BROWSER_BLOCKED_URL_PATTERNS)
+
+
+if __name__ == '__main__':
+    unittest.main()
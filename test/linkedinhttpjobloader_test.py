@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+
+import unittest
+import os
+import sys
+import tempfile
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import src.linkedin as Linkedin
+from src.linkedin.jobcardparser import JobCardParser
+from src.base.httpclient import HttpClient
+from src.base.pagecache import PageCache, PageCacheMode
+from src.base.crawlhistory import CrawlHistory
+from src.constants import LINKEDIN_PARTIAL_SEARCH_PATH, PAGE_LOAD_ATTEMPTS
+from src.utility import getAbsPathRelativeToFile
+from standinserver import StandInServer
+
+class Test_LinkedinHttpJobLoader(unittest.TestCase):
+
+    @staticmethod
+    def __readResource(fileName: str) -> str:
+        with open(getAbsPathRelativeToFile(__file__, 'resources', fileName), encoding='utf-8') as f:
+            return f.read()
+
+    def __servePages(self, query: dict) -> tuple[int, str]:
+        start = query.get('start', [ '0' ])[0]
+        if start == '0':
+            return (200, self.__readResource('linkedin_jobs_page_1.html'))
+        elif start == '25':
+            return (200, self.__readResource('linkedin_jobs_page_2.html'))
+        else:
+            return (200, '')
+
+
+    def test_JobCardParserParsesCardsLikeBrowserExtractionScript(self):
+        # act
+        result = JobCardParser.parseJobCards(self.__readResource('linkedin_jobs_page_1.html'))
+
+        # assert
+        self.assertEqual(result, [
+            { 'title': 'Truck Driver', 'company': 'Company ABC', 
+              'link': 'https://www.linkedin.com/jobs/view/truck-driver-at-company-abc-3650000001?refId=abc&trackingId=def',
+              'location': 'Los Angeles, CA', 'salary': '$25.00 - $30.00', 'datePosted': '2023-06-19' },
+            { 'title': 'Class A Driver & Loader', 'company': 'Company XYZ',
+              'link': 'https://www.linkedin.com/jobs/view/class-a-driver-at-company-xyz-3650000002?refId=xyz',
+              'location': 'Torrance, CA', 'salary': '', 'datePosted': '2023-06-18' } ])
+
+
+    def test_LinkedinHttpJobLoaderLoadsJobsInPages(self):
+        with StandInServer({ '/' + LINKEDIN_PARTIAL_SEARCH_PATH: self.__servePages }) as server:
+            with self.assertLogs('linkedinhttpjobloader', level='INFO') as cm:
+                # arrange
+                params = Linkedin.SearchParams()
+                params.query = 'Truck Driver'
+                params.location = 'Los Angeles, California, United States'
+                httpClient = HttpClient()
+                jobLoader = Linkedin.HttpJobLoader(httpClient, server.host)
+
+                # act
+                result = jobLoader.loadJobs(params, shouldSleep = False)
+                httpClient.close()
+
+                # assert
+                self.assertEqual(len(result), 3)
+                self.assertEqual(result[0].title, 'Truck Driver')
+                self.assertEqual(result[0].company, 'Company ABC')
+                self.assertEqual(result[0].jobLink, 'https://www.linkedin.com/jobs/view/truck-driver-at-company-abc-3650000001')
+                self.assertEqual(result[0].location, 'Los Angeles, CA')
+                self.assertEqual(result[0].salary, '$25.00 - $30.00')
+                self.assertEqual(result[0].datePosted, datetime(2023, 6, 19))
+                self.assertEqual(result[2].company, 'Department of Corrections')
+                self.assertEqual(len(server.requestedPaths), 3)
+                self.assertEqual(len(server.clientPorts), 1) # all pages were loaded over one kept alive connection
+                self.assertIn('INFO:linkedinhttpjobloader:Found zero jobs on page, looks like there are no more jobs, process finished', cm.output)
+                self.assertIn('INFO:linkedinhttpjobloader:Loaded a total of 3 jobs', cm.output)
+
+
+    def test_LinkedinHttpJobLoaderPrefetchesNextPage(self):
+        with StandInServer({ '/' + LINKEDIN_PARTIAL_SEARCH_PATH: self.__servePages }) as server:
+            with self.assertLogs('linkedinhttpjobloader', level='INFO') as cm:
+                # arrange
+                params = Linkedin.SearchParams()
+                params.query = 'Truck Driver'
+                params.location = 'Los Angeles, California, United States'
+                httpClient = HttpClient()
+                jobLoader = Linkedin.HttpJobLoader(httpClient, server.host)
+                jobLoader._prefetchNextPage = True
+
+                # act
+                result = jobLoader.loadJobs(params, shouldSleep = False)
+                httpClient.close()
+
+                # assert
+                self.assertEqual([ job.title for job in result ], [ 'Truck Driver', 'Class A Driver & Loader', 'Local Driver' ])
+                self.assertEqual(len([ line for line in cm.output if 'Prefetching jobs from url' in line ]), 3)
+                self.assertEqual(len([ line for line in cm.output if 'Loading jobs from url' in line ]), 1)
+
+
+    def test_LinkedinHttpJobLoaderReplaysRecordedPagesWithoutNetwork(self):
+        with tempfile.TemporaryDirectory() as cacheFolder:
+            # arrange
+            params = Linkedin.SearchParams()
+            params.query = 'Truck Driver'
+            params.location = 'Los Angeles, California, United States'
+            with StandInServer({ '/' + LINKEDIN_PARTIAL_SEARCH_PATH: self.__servePages }) as server:
+                host = server.host
+                httpClient = HttpClient()
+                recordingLoader = Linkedin.HttpJobLoader(httpClient, host)
+                recordingLoader.pageCache = PageCache(cacheFolder, PageCacheMode.Record)
+                recordedResult = recordingLoader.loadJobs(params, shouldSleep = False)
+                httpClient.close()
+
+            replayingLoader = Linkedin.HttpJobLoader(None, host) # server is gone and there is no http client to use
+            replayingLoader.pageCache = PageCache(cacheFolder, PageCacheMode.Replay)
+
+            # act
+            with self.assertLogs('linkedinhttpjobloader', level='INFO') as cm:
+                result = replayingLoader.loadJobs(params, shouldSleep = False)
+
+            # assert
+            self.assertEqual(len(recordedResult), 3)
+            self.assertEqual([ (job.title, job.jobLink) for job in result ], [ (job.title, job.jobLink) for job in recordedResult ])
+            self.assertEqual(len([ line for line in cm.output if '(cached)' in line ]), 3)
+
+
+    def test_LinkedinHttpJobLoaderStopsAtPageOfJobsSeenOnPreviousRun(self):
+        with tempfile.TemporaryDirectory() as historyFolder:
+            with StandInServer({ '/' + LINKEDIN_PARTIAL_SEARCH_PATH: self.__servePages }) as server:
+                # arrange
+                params = Linkedin.SearchParams()
+                params.query = 'Truck Driver'
+                params.location = 'Los Angeles, California, United States'
+                httpClient = HttpClient()
+                crawlHistory = CrawlHistory(os.path.join(historyFolder, 'history.json'))
+                jobLoader = Linkedin.HttpJobLoader(httpClient, server.host)
+                jobLoader.crawlHistory = crawlHistory
+                jobLoader.loadJobs(params, shouldSleep = False)
+                pageLoadsOnFirstRun = len(server.requestedPaths)
+
+                # act
+                with self.assertLogs('linkedinhttpjobloader', level='INFO') as cm:
+                    result = jobLoader.loadJobs(params, shouldSleep = False)
+                httpClient.close()
+
+                # assert
+                self.assertEqual(pageLoadsOnFirstRun, 3)
+                self.assertEqual(len(server.requestedPaths), 4)
+                self.assertEqual(len(result), 2)
+                self.assertIn('INFO:linkedinhttpjobloader:All jobs on page were loaded on previous runs, won\'t be loading more, process finished', cm.output)
+
+
+    def test_LinkedinHttpJobLoaderStopsOnErrorStatus(self):
+        with StandInServer({ '/' + LINKEDIN_PARTIAL_SEARCH_PATH: lambda query: (429, 'Too many requests') }) as server:
+            with self.assertLogs('linkedinhttpjobloader', level='INFO') as cm:
+                # arrange
+                params = Linkedin.SearchParams()
+                params.query = 'Truck Driver'
+                params.location = 'Los Angeles, California, United States'
+                jobLoader = Linkedin.HttpJobLoader(HttpClient(), server.host)
+
+                # act
+                result = jobLoader.loadJobs(params, shouldSleep = False)
+
+                # assert
+                self.assertEqual(len(result), 0)
+                self.assertIn('INFO:linkedinhttpjobloader:Loaded a total of 0 jobs', cm.output)
+                self.assertTrue(any('Got http status 429' in line for line in cm.output))
+
+
+    def test_LinkedinHttpJobLoaderDoesNotRetrySearchThatFoundNothing(self):
+        with StandInServer({ '/' + LINKEDIN_PARTIAL_SEARCH_PATH: lambda query: (200, '') }) as server:
+            with self.assertLogs('linkedinhttpjobloader', level='INFO') as cm:
+                # arrange
+                params = Linkedin.SearchParams()
+                params.query = 'Truck Driver'
+                params.location = 'Nowhere'
+                httpClient = HttpClient()
+                jobLoader = Linkedin.HttpJobLoader(httpClient, server.host)
+
+                # act
+                result = jobLoader.loadJobs(params, shouldSleep = False)
+                httpClient.close()
+
+                # assert
+                self.assertEqual(len(result), 0)
+                self.assertEqual(len(server.requestedPaths), 1)
+                self.assertEqual(jobLoader.pageLoadStats.searchesGivenUp, 0)
+                self.assertIn('INFO:linkedinhttpjobloader:Search found no jobs', cm.output)
+                self.assertFalse(any(line.startswith('WARNING') for line in cm.output))
+
+
+    def test_LinkedinHttpJobLoaderRetriesFirstPageWithoutJobCards(self):
+        with StandInServer({ '/' + LINKEDIN_PARTIAL_SEARCH_PATH: lambda query: (200, '<html><body>Sign in to see jobs</body></html>') }) as server:
+            with self.assertLogs('linkedinhttpjobloader', level='INFO') as cm:
+                # arrange
+                params = Linkedin.SearchParams()
+                params.query = 'Truck Driver'
+                params.location = 'Los Angeles, California, United States'
+                httpClient = HttpClient()
+                jobLoader = Linkedin.HttpJobLoader(httpClient, server.host)
+
+                # act
+                result = jobLoader.loadJobs(params, shouldSleep = False)
+                httpClient.close()
+
+                # assert
+                self.assertEqual(len(result), 0)
+                self.assertEqual(len(server.requestedPaths), PAGE_LOAD_ATTEMPTS)
+                self.assertTrue(any('failed with' in line for line in cm.output))
+
+
+    def test_LinkedinHttpJobLoaderRetriesLaterPageWithoutJobCards(self):
+        def servePages(query: dict) -> tuple[int, str]:
+            if query.get('start', [ '0' ])[0] == '0':
+                return (200, self.__readResource('linkedin_jobs_page_1.html'))
+            return (200, '<html><body>Sign in to see jobs</body></html>')
+
+        with StandInServer({ '/' + LINKEDIN_PARTIAL_SEARCH_PATH: servePages }) as server:
+            with self.assertLogs('linkedinhttpjobloader', level='INFO') as cm:
+                # arrange
+                params = Linkedin.SearchParams()
+                params.query = 'Truck Driver'
+                params.location = 'Los Angeles, California, United States'
+                httpClient = HttpClient()
+                jobLoader = Linkedin.HttpJobLoader(httpClient, server.host)
+
+                # act
+                result = jobLoader.loadJobs(params, shouldSleep = False)
+                httpClient.close()
+
+                # assert
+                self.assertEqual(len(result), 2)
+                self.assertEqual(len(server.requestedPaths), 1 + PAGE_LOAD_ATTEMPTS)
+                self.assertEqual(jobLoader.pageLoadStats.searchesGivenUp, 1)
+                self.assertTrue(any('failed with' in line for line in cm.output))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,31 +2,32 @@
 
 import unittest
 from unittest.mock import Mock
-import multiprocessing.dummy as multimock
 import os
 import sys
-from selenium.webdriver.common.by import By
-from selenium.common.exceptions import NoSuchElementException
+from datetime import datetime
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from selenium.common.exceptions import TimeoutException
+from src.base.driverpool import DriverPool
+from src.base.pageloadstats import PageFailure
 import src.linkedin as Linkedin
 from src.constants import LINKEDIN_PAGE_SIZE, LINKEDIN_JOB_LOADING_LIMIT
 
 class Test_LinkedinJobLoader(unittest.TestCase):
 
-    def __generateJobElements(self, count: int) -> list[Mock]:
+    def __generateJobCards(self, count: int) -> list[dict]:
         results = []
         for i in range(0, count):
-            jobElement = Mock()
-            jobElement.tag_name = 'a'
-            jobElement.get_attribute.return_value = 'http://example.com'
+            results.append({ 'title': 'Title %d' % i, 'company': 'Company', 'link': 'http://example.com?trackingId=123',
+                             'location': 'New York, NY', 'salary': '', 'datePosted': '2020-02-02' })
+        return results
 
-            timeElement = Mock()
-            timeElement.get_attribute.return_value = '2020-02-02'
-            jobElement.find_element.side_effect = lambda by, selector: timeElement if by == By.TAG_NAME and selector == 'time' else Mock()
 
-            results.append(jobElement)
-        return results
+    def __generatePages(self, totalJobCount: str | None, *jobCountsOnPages: int) -> list[dict]:
+        pages = []
+        for i, jobCount in enumerate(jobCountsOnPages):
+            pages.append({ 'jobs': self.__generateJobCards(jobCount), 'count': totalJobCount if i == 0 else None, 'next': None })
+        return pages
 
 
     def test_LinkedinJobLoaderLoadsJobsInPages(self):
@@ -39,15 +40,9 @@ class Test_LinkedinJobLoader(unittest.TestCase):
             driver = Mock()
 
             jobCount = LINKEDIN_PAGE_SIZE + 1
-            limitElement = Mock()
-            limitElement.text = str(jobCount)
-            driver.find_element.return_value = limitElement
-            driver.find_elements.side_effect = [ self.__generateJobElements(LINKEDIN_PAGE_SIZE), self.__generateJobElements(1) ]
-            driver.window_handles = [0]
-
-            lock = multimock.Lock()
+            driver.execute_script.side_effect = self.__generatePages(str(jobCount), LINKEDIN_PAGE_SIZE, 1)
 
-            jobLoader = Linkedin.JobLoader(driver, lock, 0)
+            jobLoader = Linkedin.JobLoader(DriverPool(lambda: driver))
 
             # act
             result = jobLoader.loadJobs(params, shouldSleep = False)
@@ -59,6 +54,9 @@ class Test_LinkedinJobLoader(unittest.TestCase):
             self.assertIn('INFO:linkedinjobloader:Loaded 26 out of 26 jobs', cm.output)
             self.assertIn('INFO:linkedinjobloader:Loaded equal to or more jobs (26) than discovered limit (26), won\'t be loading more, process finished', cm.output)
             self.assertIn('INFO:linkedinjobloader:Loaded a total of 26 jobs', cm.output)
+            self.assertEqual(driver.execute_script.call_count, 2) # one round trip per page no matter how many jobs it has
+            driver.find_element.assert_not_called()
+            driver.find_elements.assert_not_called()
 
 
     def test_LinkedinJobLoaderLoadsNotMoreThanLoadingLimit(self):
@@ -71,19 +69,9 @@ class Test_LinkedinJobLoader(unittest.TestCase):
             driver = Mock()
 
             jobCount = LINKEDIN_JOB_LOADING_LIMIT + LINKEDIN_PAGE_SIZE
-            limitElement = Mock()
-            limitElement.text = str(jobCount)
-            driver.find_element.return_value = limitElement
-            driver.window_handles = [0]
-
-            jobElements = []
-            for i in range(0, jobCount, LINKEDIN_PAGE_SIZE):
-                jobElements.append(self.__generateJobElements(LINKEDIN_PAGE_SIZE))
-            driver.find_elements.side_effect = jobElements
-
-            lock = multimock.Lock()
+            driver.execute_script.side_effect = self.__generatePages(str(jobCount), *([ LINKEDIN_PAGE_SIZE ] * (jobCount // LINKEDIN_PAGE_SIZE)))
 
-            jobLoader = Linkedin.JobLoader(driver, lock, 0)
+            jobLoader = Linkedin.JobLoader(DriverPool(lambda: driver))
 
             # act
             result = jobLoader.loadJobs(params, shouldSleep = False)
@@ -103,12 +91,9 @@ class Test_LinkedinJobLoader(unittest.TestCase):
             driver = Mock()
 
             jobCount = 0
-            driver.find_element.side_effect = NoSuchElementException('No Job Counter!')
-            driver.window_handles = [0]
+            driver.execute_script.side_effect = self.__generatePages(None, LINKEDIN_PAGE_SIZE)
 
-            lock = multimock.Lock()
-
-            jobLoader = Linkedin.JobLoader(driver, lock, 0)
+            jobLoader = Linkedin.JobLoader(DriverPool(lambda: driver))
 
             # act
             result = jobLoader.loadJobs(params, shouldSleep = False)
@@ -130,19 +115,13 @@ class Test_LinkedinJobLoader(unittest.TestCase):
             driver = Mock()
 
             jobCount = LINKEDIN_PAGE_SIZE * 3 + 1
-            limitElement = Mock()
-            limitElement.text = str(jobCount)
-            driver.find_element.return_value = limitElement
-            driver.find_elements.side_effect = [ 
-                self.__generateJobElements(LINKEDIN_PAGE_SIZE), 
-                self.__generateJobElements(LINKEDIN_PAGE_SIZE - 1), # tricky page
-                self.__generateJobElements(LINKEDIN_PAGE_SIZE),
-                 self.__generateJobElements(3) ] # another tricky page (linkedin sometimes gives you more results than expected)
-            driver.window_handles = [0]
-
-            lock = multimock.Lock()
+            driver.execute_script.side_effect = self.__generatePages(str(jobCount),
+                LINKEDIN_PAGE_SIZE, 
+                LINKEDIN_PAGE_SIZE - 1, # tricky page
+                LINKEDIN_PAGE_SIZE,
+                3) # another tricky page (linkedin sometimes gives you more results than expected)
 
-            jobLoader = Linkedin.JobLoader(driver, lock, 0)
+            jobLoader = Linkedin.JobLoader(DriverPool(lambda: driver))
 
             # act
             result = jobLoader.loadJobs(params, shouldSleep = False)
@@ -168,14 +147,9 @@ class Test_LinkedinJobLoader(unittest.TestCase):
             driver = Mock()
 
             jobCount = 0
-            limitElement = Mock()
-            limitElement.text = 'Text that cannot be parsed as int'
-            driver.find_element.return_value = limitElement
-            driver.window_handles = [0]
-
-            lock = multimock.Lock()
+            driver.execute_script.side_effect = self.__generatePages('Text that cannot be parsed as int', LINKEDIN_PAGE_SIZE)
 
-            jobLoader = Linkedin.JobLoader(driver, lock, 0)
+            jobLoader = Linkedin.JobLoader(DriverPool(lambda: driver))
 
             # act
             result = jobLoader.loadJobs(params, shouldSleep = False)
@@ -196,23 +170,48 @@ class Test_LinkedinJobLoader(unittest.TestCase):
 
             driver = Mock()
             driver.get.side_effect = Exception('Fubar!')
-            driver.window_handles = [0]
 
-            lock = multimock.Lock()
-
-            jobLoader = Linkedin.JobLoader(driver, lock, 0)
+            jobLoader = Linkedin.JobLoader(DriverPool(lambda: driver))
 
             # act
             result = jobLoader.loadJobs(params, shouldSleep = False)
 
             # assert
             self.assertEqual(len(result), 0)
+            self.assertEqual(driver.get.call_count, 3) # every attempt
             self.assertEqual(len(cm.output), 1)
-            self.assertIn('ERROR:linkedinjobloader:Exception on loading jobs', cm.output[0])
+            self.assertIn('ERROR:linkedinjobloader:Giving up on url = "https://www.linkedin.com/jobs/search?keywords=A&location=B" after 3 attempts', cm.output[0])
             self.assertIn('Fubar!', cm.output[0])
 
 
-    def test_LinkedinJobLoaderStopsLoadingJobsIfPageHasZeroResults(self):
+    def test_LinkedinJobLoaderRetriesPageThatFailed(self):
+        with self.assertLogs('linkedinjobloader', level='INFO') as cm:
+            # arrange
+            params = Linkedin.SearchParams()
+            params.query = 'A'
+            params.location = 'B'
+
+            driver = Mock()
+
+            jobCount = LINKEDIN_PAGE_SIZE + 1
+            firstPage, secondPage = self.__generatePages(str(jobCount), LINKEDIN_PAGE_SIZE, 1)
+            driver.execute_script.side_effect = [ firstPage, TimeoutException('Too slow'), secondPage ]
+
+            jobLoader = Linkedin.JobLoader(DriverPool(lambda: driver))
+
+            # act
+            result = jobLoader.loadJobs(params, shouldSleep = False)
+
+            # assert
+            self.assertEqual(len(result), jobCount)
+            self.assertIn('WARNING:linkedinjobloader:Attempt 1 of 3 to load url = "https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search?'
+                          'keywords=A&location=B&start=25" failed with timeout: Message: Too slow\n', cm.output)
+            self.assertEqual(jobLoader.pageLoadStats.attempts, 3)
+            self.assertEqual(jobLoader.pageLoadStats.failures[PageFailure.Timeout], 1)
+            self.assertEqual(jobLoader.pageLoadStats.searchesGivenUp, 0)
+
+
+    def test_LinkedinJobLoaderReturnsJobsLoadedSoFarIfPageKeepsFailing(self):
         with self.assertLogs('linkedinjobloader', level='INFO') as cm:
             # arrange
             params = Linkedin.SearchParams()
@@ -222,15 +221,37 @@ class Test_LinkedinJobLoader(unittest.TestCase):
             driver = Mock()
 
             jobCount = 125
-            limitElement = Mock()
-            limitElement.text = str(jobCount)
-            driver.find_element.return_value = limitElement
-            driver.find_elements.side_effect = [ self.__generateJobElements(LINKEDIN_PAGE_SIZE), self.__generateJobElements(0) ]
-            driver.window_handles = [0]
+            firstPage, = self.__generatePages(str(jobCount), LINKEDIN_PAGE_SIZE)
+            driver.execute_script.side_effect = [ firstPage, TimeoutException('Too slow'), Exception('Fubar!'), Exception('Fubar!') ]
+
+            jobLoader = Linkedin.JobLoader(DriverPool(lambda: driver))
+
+            # act
+            result = jobLoader.loadJobs(params, shouldSleep = False)
 
-            lock = multimock.Lock()
+            # assert
+            self.assertEqual(len(result), LINKEDIN_PAGE_SIZE)
+            self.assertIn('WARNING:linkedinjobloader:Could not load page 2, search ends with the jobs loaded so far', cm.output)
+            self.assertIn('INFO:linkedinjobloader:Loaded a total of 25 jobs', cm.output)
+            self.assertEqual(jobLoader.pageLoadStats.attempts, 4)
+            self.assertEqual(jobLoader.pageLoadStats.failures[PageFailure.Timeout], 1)
+            self.assertEqual(jobLoader.pageLoadStats.failures[PageFailure.Error], 2)
+            self.assertEqual(jobLoader.pageLoadStats.searchesGivenUp, 1)
 
-            jobLoader = Linkedin.JobLoader(driver, lock, 0)
+
+    def test_LinkedinJobLoaderStopsLoadingJobsIfPageHasZeroResults(self):
+        with self.assertLogs('linkedinjobloader', level='INFO') as cm:
+            # arrange
+            params = Linkedin.SearchParams()
+            params.query = 'A'
+            params.location = 'B'
+
+            driver = Mock()
+
+            jobCount = 125
+            driver.execute_script.side_effect = self.__generatePages(str(jobCount), LINKEDIN_PAGE_SIZE, 0)
+
+            jobLoader = Linkedin.JobLoader(DriverPool(lambda: driver))
 
             # act
             result = jobLoader.loadJobs(params, shouldSleep = False)
@@ -243,5 +264,90 @@ class Test_LinkedinJobLoader(unittest.TestCase):
             self.assertIn('INFO:linkedinjobloader:Loaded a total of 25 jobs', cm.output)
 
 
+    def test_LinkedinJobLoaderSplitsSearchByFirstFacetItDoesNotFilterBy(self):
+        # arrange
+        params = Linkedin.SearchParams()
+        params.query = 'A'
+        params.location = 'B'
+        params.jobType = Linkedin.Enums.JobType.FullTime
+
+        jobLoader = Linkedin.JobLoader(DriverPool(lambda: Mock()))
+
+        # act
+        result = jobLoader.getShards(params)
+
+        # assert
+        self.assertEqual([ shard.experienceLevel for shard in result ], list(Linkedin.Enums.ExperienceLevel))
+        self.assertTrue(all(shard.jobType == Linkedin.Enums.JobType.FullTime and shard.query == 'A' for shard in result))
+        self.assertIsNone(params.experienceLevel)
+
+
+    def test_LinkedinJobLoaderLeavesShardsIfSearchFindsMoreJobsThanCanBeLoaded(self):
+        with self.assertLogs('linkedinjobloader', level='INFO') as cm:
+            # arrange
+            params = Linkedin.SearchParams()
+            params.query = 'A'
+            params.location = 'B'
+
+            driver = Mock()
+            driver.execute_script.side_effect = self.__generatePages('1,000+', LINKEDIN_PAGE_SIZE)
+
+            jobLoader = Linkedin.JobLoader(DriverPool(lambda: driver))
+            jobLoader.shardOverflowingSearches = True
+
+            # act
+            result = jobLoader.loadJobs(params, shouldSleep = False)
+
+            # assert
+            self.assertEqual(result, [])
+            self.assertEqual([ shard.jobType for shard in jobLoader.shards ], list(Linkedin.Enums.JobType))
+            self.assertIn('INFO:linkedinjobloader:Search found 1000 jobs, more than 500 that can be loaded, splitting it into 6 searches', cm.output)
+
+
+    def test_LinkedinJobLoaderMapsJobCardsToJobInfo(self):
+        # arrange
+        params = Linkedin.SearchParams()
+        params.query = 'A'
+        params.location = 'B'
+
+        driver = Mock()
+        driver.execute_script.side_effect = self.__generatePages(' 1,000+ ', 1, 0)
+
+        jobLoader = Linkedin.JobLoader(DriverPool(lambda: driver))
+
+        # act
+        result = jobLoader.loadJobs(params, shouldSleep = False)
+
+        # assert
+        self.assertEqual(len(result), 1)
+        self.assertEqual(result[0].title, 'Title 0')
+        self.assertEqual(result[0].company, 'Company')
+        self.assertEqual(result[0].jobLink, 'http://example.com')
+        self.assertEqual(result[0].location, 'New York, NY')
+        self.assertEqual(result[0].salary, '')
+        self.assertEqual(result[0].datePosted, datetime(2020, 2, 2))
+
+
+    def test_LinkedinJobLoaderLeavesJobCardsWithoutDateUndated(self):
+        # arrange
+        params = Linkedin.SearchParams()
+        params.query = 'A'
+        params.location = 'B'
+
+        driver = Mock()
+        pages = self.__generatePages('1', 1, 0)
+        pages[0]['jobs'][0]['datePosted'] = ''
+        driver.execute_script.side_effect = pages
+
+        jobLoader = Linkedin.JobLoader(DriverPool(lambda: driver))
+
+        # act
+        result = jobLoader.loadJobs(params, shouldSleep = False)
+
+        # assert
+        self.assertEqual(len(result), 1)
+        self.assertIsNone(result[0].datePosted)
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
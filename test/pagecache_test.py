@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+
+import unittest
+import os
+import sys
+import tempfile
+from unittest.mock import patch
+from pathlib import Path
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.base.pagecache import PageCache, PageCacheMode
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class Test_PageCache(unittest.TestCase):
+
+    @staticmethod
+    def __makeEntriesOlder(folder: str, seconds: float) -> None:
+        for path in Path(folder).glob('*'):
+            modificationTime = path.stat().st_mtime - seconds
+            os.utime(path, (modificationTime, modificationTime))
+
+    def test_PageCacheReturnsStoredPayload(self):
+        with tempfile.TemporaryDirectory() as folder:
+            # arrange
+            cache = PageCache(folder)
+
+            # act
+            cache.put('https://example.com/jobs?q=driver', { 'jobs': [ 'a', 'b' ], 'count': 2, 'next': None })
+
+            # assert
+            self.assertEqual(cache.get('https://example.com/jobs?q=driver'), { 'jobs': [ 'a', 'b' ], 'count': 2, 'next': None })
+            self.assertIsNone(cache.get('https://example.com/jobs?q=loader'))
+
+
+    def test_PageCacheDoesNotServeExpiredEntriesUnlessReplaying(self):
+        with tempfile.TemporaryDirectory() as folder:
+            # arrange
+            clock = FakeClock()
+            cache = PageCache(folder, PageCacheMode.ReadThrough, ttlSeconds = 60, clock = clock)
+            replayCache = PageCache(folder, PageCacheMode.Replay, ttlSeconds = 60, clock = clock)
+            cache.put('https://example.com/', 'payload')
+
+            # act
+            clock.now += 61
+
+            # assert
+            self.assertIsNone(cache.get('https://example.com/'))
+            self.assertEqual(replayCache.get('https://example.com/'), 'payload')
+
+
+    def test_PageCacheEvictsOldestEntriesWhenOverSize(self):
+        with tempfile.TemporaryDirectory() as folder:
+            # arrange
+            cache = PageCache(folder, maxSizeBytes = 520000)
+            cache.put('https://example.com/1', os.urandom(200000).hex()) # ~200KB gzipped
+            self.__makeEntriesOlder(folder, 100)
+            cache.put('https://example.com/2', os.urandom(200000).hex())
+            self.__makeEntriesOlder(folder, 100)
+
+            # act
+            cache.put('https://example.com/3', os.urandom(200000).hex())
+
+            # assert
+            self.assertIsNone(cache.get('https://example.com/1'))
+            self.assertIsNotNone(cache.get('https://example.com/2'))
+            self.assertIsNotNone(cache.get('https://example.com/3'))
+
+
+    def test_PageCacheDoesNotServePayloadInAnotherFormat(self):
+        with tempfile.TemporaryDirectory() as folder:
+            # arrange
+            cache = PageCache(folder)
+            cache.put('https://example.com/jobs?q=driver', { 'jobs': [], 'count': 0, 'next': None }, 'extractedpage')
+
+            # act
+            result = cache.get('https://example.com/jobs?q=driver', 'httpresponse')
+
+            # assert
+            self.assertIsNone(result)
+            self.assertIsNotNone(cache.get('https://example.com/jobs?q=driver', 'extractedpage'))
+
+
+    def test_PageCacheDoesNotLookThroughFolderOnEveryWrite(self):
+        with tempfile.TemporaryDirectory() as folder:
+            # arrange
+            cache = PageCache(folder, maxSizeBytes = 10 * 1024 * 1024)
+            cache.put('https://example.com/0', 'payload')
+            globbedFolders = []
+            glob = Path.glob
+            def countingGlob(path, pattern):
+                globbedFolders.append(path)
+                return glob(path, pattern)
+
+            # act
+            with patch.object(Path, 'glob', countingGlob):
+                for i in range(1, 50):
+                    cache.put('https://example.com/%d' % i, 'payload')
+
+            # assert
+            self.assertEqual(globbedFolders, [])
+            self.assertEqual(cache.get('https://example.com/0'), 'payload')
+
+
+    def test_PageCacheIgnoresDamagedEntries(self):
+        with tempfile.TemporaryDirectory() as folder:
+            with self.assertLogs('pagecache', level='WARNING') as cm:
+                # arrange
+                cache = PageCache(folder)
+                cache.put('https://example.com/', 'payload')
+                for path in Path(folder).glob('*'):
+                    path.write_bytes(b'not gzip')
+
+                # act
+                result = cache.get('https://example.com/')
+
+                # assert
+                self.assertIsNone(result)
+                self.assertIn('WARNING:pagecache:Page cache entry for url = "https://example.com/" is damaged, ignoring it', cm.output)
+
+
+if __name__ == '__main__':
+    unittest.main()
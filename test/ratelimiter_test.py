@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+
+import unittest
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.base.ratelimiter import HostRateLimiter, RateLimiters
+from src.constants import RATE_LIMIT_JITTER
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class Test_RateLimiter(unittest.TestCase):
+
+    __rateLimit = { 'minSeconds': 2, 'initialSeconds': 8, 'maxSeconds': 30, 'burst': 2 }
+
+    def test_HostRateLimiterLetsBurstThroughThenSpacesRequests(self):
+        # arrange
+        clock = FakeClock()
+        limiter = HostRateLimiter('example.com', self.__rateLimit, clock)
+
+        # act
+        waits = [ limiter.reserve() for i in range(4) ]
+
+        # assert
+        self.assertEqual(waits[0:2], [ 0, 0 ])
+        self.assertGreaterEqual(waits[2], 8)
+        self.assertLessEqual(waits[2], 8 * (1 + RATE_LIMIT_JITTER))
+        self.assertGreaterEqual(waits[3], 16) # every waiting caller queues behind the previous one
+
+
+    def test_HostRateLimiterRefillsOverTime(self):
+        # arrange
+        clock = FakeClock()
+        limiter = HostRateLimiter('example.com', self.__rateLimit, clock)
+        limiter.reserve()
+        limiter.reserve()
+
+        # act
+        clock.now += 8
+        wait = limiter.reserve()
+
+        # assert
+        self.assertEqual(wait, 0)
+
+
+    def test_HostRateLimiterSpeedsUpOnSuccessButNotPastMinimum(self):
+        # arrange
+        limiter = HostRateLimiter('example.com', self.__rateLimit, FakeClock())
+
+        # act
+        limiter.reportSuccess()
+        afterOneSuccess = limiter.secondsPerToken
+        for i in range(100):
+            limiter.reportSuccess()
+
+        # assert
+        self.assertLess(afterOneSuccess, 8)
+        self.assertEqual(limiter.secondsPerToken, 2)
+
+
+    def test_HostRateLimiterBacksOffExponentiallyButNotPastMaximum(self):
+        # arrange
+        limiter = HostRateLimiter('example.com', self.__rateLimit, FakeClock())
+
+        # act
+        with self.assertLogs('ratelimiter', level='WARNING'):
+            limiter.reportThrottled()
+            afterOneThrottle = limiter.secondsPerToken
+            limiter.reportThrottled()
+            afterTwoThrottles = limiter.secondsPerToken
+            for i in range(10):
+                limiter.reportThrottled()
+
+        # assert
+        self.assertEqual(afterOneThrottle, 16)
+        self.assertEqual(afterTwoThrottles, 30)
+        self.assertEqual(limiter.secondsPerToken, 30)
+
+
+    def test_HostRateLimiterStopsBurstsAfterThrottling(self):
+        # arrange
+        limiter = HostRateLimiter('example.com', self.__rateLimit, FakeClock())
+
+        # act
+        with self.assertLogs('ratelimiter', level='WARNING'):
+            limiter.reportThrottled()
+        wait = limiter.reserve()
+
+        # assert
+        self.assertGreaterEqual(wait, 16)
+
+
+    def test_RateLimitersShareOneLimiterPerHost(self):
+        # arrange
+        limiters = RateLimiters({ 'https://www.example.com/': self.__rateLimit }, { 'minSeconds': 1, 'initialSeconds': 1, 'maxSeconds': 1, 'burst': 1 }, FakeClock())
+
+        # act
+        limiter1 = limiters.forUrl('https://www.example.com/jobs?q=a')
+        limiter2 = limiters.forUrl('https://WWW.EXAMPLE.COM/jobs?q=b')
+        otherLimiter = limiters.forUrl('https://www.other.com/jobs')
+
+        # assert
+        self.assertIs(limiter1, limiter2)
+        self.assertEqual(limiter1.secondsPerToken, 8)
+        self.assertEqual(otherLimiter.secondsPerToken, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+
+import unittest
+import os
+import sys
+import tempfile
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.resultstore import ResultStore
+from src.jobinfo import Job, JobLocation
+
+class Test_ResultStore(unittest.TestCase):
+
+    def test_ResultStoreLoadsSavedJobs(self):
+        with tempfile.TemporaryDirectory() as folder:
+            # arrange
+            date = datetime(2024, 1, 2, 3, 4, 5)
+            job = Job('Nurse', 'Hospital', datetime(2024, 1, 1), [ JobLocation('New York, NY', 'http://example.com') ], [ '$100,000 a year' ])
+            job.weight = -10
+            job.derogatoryMarks = [ 'Bad pay' ]
+            job.searchLabels = [ 'Nurses in NY' ]
+            store = ResultStore(os.path.join(folder, 'lastresults.json'))
+
+            # act
+            store.save([ job ], date)
+            jobs, loadedDate = ResultStore(os.path.join(folder, 'lastresults.json')).load()
+
+            # assert
+            self.assertEqual(loadedDate, date)
+            self.assertEqual(len(jobs), 1)
+            self.assertEqual(jobs[0], job)
+            self.assertEqual(jobs[0].datePosted, job.datePosted)
+            self.assertEqual(jobs[0].locations, job.locations)
+            self.assertEqual(jobs[0].salaries, job.salaries)
+            self.assertEqual(jobs[0].weight, -10)
+            self.assertEqual(jobs[0].derogatoryMarks, [ 'Bad pay' ])
+            self.assertEqual(jobs[0].searchLabels, [ 'Nurses in NY' ])
+
+
+    def test_ResultStoreLoadsNothingIfThereAreNoResults(self):
+        with tempfile.TemporaryDirectory() as folder:
+            with self.assertLogs('resultstore', level='WARNING'):
+                # arrange
+                store = ResultStore(os.path.join(folder, 'lastresults.json'))
+
+                # act
+                result = store.load()
+
+                # assert
+                self.assertIsNone(result)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+
+import unittest
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.salary import Salary, SalaryPeriod, parseSalary
+
+class Test_Salary(unittest.TestCase):
+
+    __salaryTestParams = [ ('$59,108 - $75,652 a year', Salary(59108, 75652, 'USD', SalaryPeriod.Year)),
+                           ('$25 an hour', Salary(25, 25, 'USD', SalaryPeriod.Hour)),
+                           ('$50-60 an hour', Salary(50, 60, 'USD', SalaryPeriod.Hour)),
+                           ('From $20.50 an hour', Salary(20.5, None, 'USD', SalaryPeriod.Hour)),
+                           ('Up to $80,000 a year', Salary(None, 80000, 'USD', SalaryPeriod.Year)),
+                           ('$4,000 - $5,000 a month', Salary(4000, 5000, 'USD', SalaryPeriod.Month)),
+                           ('$1,200 a week', Salary(1200, 1200, 'USD', SalaryPeriod.Week)),
+                           ('$250 a day', Salary(250, 250, 'USD', SalaryPeriod.Day)),
+                           ('$80,000.00/yr - $100,000.00/yr', Salary(80000, 100000, 'USD', SalaryPeriod.Year)),
+                           ('$120K/yr - $150K/yr', Salary(120000, 150000, 'USD', SalaryPeriod.Year)),
+                           ('$25.00/hr - $30.00/hr', Salary(25, 30, 'USD', SalaryPeriod.Hour)),
+                           ('£30,000 - £35,000 a year', Salary(30000, 35000, 'GBP', SalaryPeriod.Year)),
+                           ('CA$70,000 - CA$80,000', Salary(70000, 80000, 'CAD', SalaryPeriod.Year)) ]
+
+    def test_ParseSalaryParsesIndeedAndLinkedinSalaries(self):
+        for text, expectedSalary in self.__salaryTestParams:
+            with self.subTest(text = text):
+                # act
+                salary = parseSalary(text)
+
+                # assert
+                self.assertEqual(salary, expectedSalary)
+
+
+    def test_ParseSalaryReturnsNothingForTextWithoutAmounts(self):
+        for text in [ '', None, 'Competitive', 'Depends on experience' ]:
+            with self.subTest(text = text):
+                # act & assert
+                self.assertIsNone(parseSalary(text))
+
+
+    def test_SalaryIsNormalizedToAnnualAmounts(self):
+        # act
+        salary = parseSalary('$30 - $40 an hour')
+
+        # assert
+        self.assertEqual(salary.annualMinAmount, 62400)
+        self.assertEqual(salary.annualMaxAmount, 83200)
+        self.assertEqual(salary.annualTopAmount, 83200)
+        self.assertEqual(parseSalary('From $20 an hour').annualTopAmount, 41600)
+        self.assertIs(parseSalary('$30 - $40 an hour'), salary) # parsed once
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+
+import threading
+import urllib.parse
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Callable
+
+# Local stand-in for a job site: serves whatever the route handlers return, so loaders can be tested without internet.
+# A route handler gets the parsed query string and returns (http status, response body).
+class StandInServer:
+    routes: dict[str, Callable[[dict], tuple[int, str]]]
+    requestedPaths: list[str]
+    clientPorts: set[int]
+
+    def __init__(self, routes: dict[str, Callable[[dict], tuple[int, str]]]):
+        self.routes = routes
+        self.requestedPaths = []
+        self.clientPorts = set()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1' # keep connections alive
+
+            def do_GET(self):
+                urlParts = urllib.parse.urlsplit(self.path)
+                server.requestedPaths.append(self.path)
+                server.clientPorts.add(self.client_address[1])
+                route = server.routes.get(urlParts.path)
+                status, body = route(urllib.parse.parse_qs(urlParts.query)) if route else (404, 'Not found')
+                content = body.encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.__httpServer = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.__thread = threading.Thread(target = self.__httpServer.serve_forever, daemon = True)
+
+    @property
+    def host(self) -> str:
+        return 'http://127.0.0.1:%d/' % self.__httpServer.server_address[1]
+
+    def __enter__(self):
+        self.__thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.__httpServer.shutdown()
+        self.__httpServer.server_close()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.jobprocessor.stoplistindex import StoplistIndex
+from src.jobinfo import JobKey
+from src.utility import getAbsPathRelativeToFile
+
+class Test_StoplistIndex(unittest.TestCase):
+
+    __entries = [ ('Driver', 'UPS', 'No cookies'),
+                  ('', 'ups', 'Annoying company'),
+                  ('driver', '', 'Bad pay'),
+                  ('Nurse', '', 'Night shifts') ]
+
+    def test_StoplistIndexFindsAllMatchingEntriesInStoplistOrder(self):
+        # arrange
+        stoplistIndex = StoplistIndex(self.__entries)
+
+        # act
+        result = stoplistIndex.getMatches(JobKey('DRIVER', 'Ups').key)
+
+        # assert
+        self.assertEqual(result, self.__entries[:3])
+
+
+    def test_StoplistIndexMatchesTitleAndCompanyTogether(self):
+        # arrange
+        stoplistIndex = StoplistIndex(self.__entries)
+
+        # act
+        result = stoplistIndex.getMatches(JobKey('Driver', 'FedEx').key)
+
+        # assert
+        self.assertEqual(result, [ ('driver', '', 'Bad pay') ])
+
+
+    def test_CompiledStoplistIsReusedUntilStoplistChanges(self):
+        with tempfile.TemporaryDirectory() as folder:
+            # arrange
+            stoplistPath = os.path.join(folder, 'stoplist.csv')
+            cachePath = os.path.join(folder, 'stoplist.index')
+            shutil.copyfile(getAbsPathRelativeToFile(__file__, 'resources', 'stoplist.csv'), stoplistPath)
+            StoplistIndex(self.__entries).saveCached(cachePath, stoplistPath)
+
+            # act
+            unchanged = StoplistIndex.loadCached(cachePath, stoplistPath)
+            os.utime(stoplistPath, ns = (0, 0)) # touched, but the same
+            touched = StoplistIndex.loadCached(cachePath, stoplistPath)
+            with open(stoplistPath, 'a', encoding = 'utf-8') as f:
+                f.write('Cook,,Long hours\n')
+            changed = StoplistIndex.loadCached(cachePath, stoplistPath)
+
+            # assert
+            self.assertEqual(len(unchanged), 4)
+            self.assertEqual(len(touched), 4)
+            self.assertIsNone(changed)
+
+
+    def test_DamagedCompiledStoplistIsIgnored(self):
+        with tempfile.TemporaryDirectory() as folder:
+            with self.assertLogs('stoplistindex', level='WARNING'):
+                # arrange
+                stoplistPath = getAbsPathRelativeToFile(__file__, 'resources', 'stoplist.csv')
+                cachePath = os.path.join(folder, 'stoplist.index')
+                with open(cachePath, 'wb') as f:
+                    f.write(b'not a compiled stoplist')
+
+                # act
+                result = StoplistIndex.loadCached(cachePath, stoplistPath)
+
+                # assert
+                self.assertIsNone(result)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -75,5 +75,31 @@ class Test_Utility(unittest.TestCase):
                 # assert
                 self.assertEqual(result, expectedResult)
 
+
+    __extractAssignedJsonParams = [('<script>window.data = {"a": [1, 2]};</script>', 'window.data', {'a': [1, 2]}),
+                                   ('if (window.data == null) {} window.data={"a": "}</script>"}', 'window.data', {'a': '}</script>'}),
+                                   ('<script>window.other = 1;</script>', 'window.data', None),
+                                   ('<script>window.data = undefined;</script>', 'window.data', None)]
+    def test_extractAssignedJson(self):
+        for text, assignmentTarget, expectedResult in self.__extractAssignedJsonParams:
+            with self.subTest():
+                # act
+                result = extractAssignedJson(text, assignmentTarget)
+
+                # assert
+                self.assertEqual(result, expectedResult)
+
+    __canonicalizeUrlParams = [('HTTPS://WWW.Example.com/jobs?q=a+b&l=US#results', 'https://www.example.com/jobs?l=US&q=a+b'),
+                               ('https://www.example.com', 'https://www.example.com/'),
+                               (' https://www.example.com/jobs?start=0&q= ', 'https://www.example.com/jobs?q=&start=0')]
+    def test_canonicalizeUrl(self):
+        for url, expectedResult in self.__canonicalizeUrlParams:
+            with self.subTest():
+                # act
+                result = canonicalizeUrl(url)
+
+                # assert
+                self.assertEqual(result, expectedResult)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
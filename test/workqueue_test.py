@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+
+import unittest
+import os
+import sys
+import tempfile
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.workqueue import WorkQueue, LeaseLostError
+from src.jobinfo import JobInfo
+
+class QueuedSearchParams:
+    def __init__(self, host: str):
+        self.host = host
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class Test_WorkQueue(unittest.TestCase):
+
+    @staticmethod
+    def __createJob(link: str) -> JobInfo:
+        return JobInfo('Nurse', 'Hospital', link, 'New York, NY', '', datetime(2024, 1, 1))
+
+    @staticmethod
+    def __getSearchKey(params: QueuedSearchParams) -> str:
+        return params.host
+
+
+    def test_WorkQueueLeasesEverySearchToOneWorker(self):
+        with tempfile.TemporaryDirectory() as folder:
+            with self.assertLogs('workqueue', level='INFO'):
+                # arrange
+                queue = WorkQueue(os.path.join(folder, 'workqueue.sqlite'))
+                queue.startCrawl({ 'A': QueuedSearchParams('http://a.com/'), 'B': QueuedSearchParams('http://b.com/'),
+                                   'Also A': QueuedSearchParams('http://a.com/') }, self.__getSearchKey)
+
+                # act
+                firstTask = queue.lease('worker 1')
+                secondTask = WorkQueue(os.path.join(folder, 'workqueue.sqlite')).lease('worker 2')
+                thirdTask = queue.lease('worker 3')
+
+                # assert
+                self.assertEqual(firstTask.searchKey, 'http://a.com/')
+                self.assertEqual(firstTask.searchNames, [ 'A', 'Also A' ])
+                self.assertEqual(firstTask.searchParams.host, 'http://a.com/')
+                self.assertEqual(secondTask.searchKey, 'http://b.com/')
+                self.assertIsNone(thirdTask)
+                self.assertFalse(queue.isCrawlFinished())
+
+
+    def test_WorkQueueHandsSearchWithExpiredLeaseToAnotherWorkerFromLastRecordedPage(self):
+        with tempfile.TemporaryDirectory() as folder:
+            # arrange
+            clock = FakeClock()
+            queue = WorkQueue(os.path.join(folder, 'workqueue.sqlite'), leaseSeconds = 60, clock = clock)
+            queue.startCrawl({ 'A': QueuedSearchParams('http://a.com/') }, self.__getSearchKey)
+            deadWorkerTask = queue.lease('worker 1')
+            queue.recordPage(deadWorkerTask, 0, 'http://a.com/?page=1', 50, 25, [ self.__createJob('http://a.com/job/1') ])
+
+            # act
+            clock.now += 30
+            leaseBeforeExpiry = queue.lease('worker 2')
+            clock.now += 60
+            task = queue.lease('worker 2')
+            checkpoint = queue.getCheckpoint(task)
+
+            # assert
+            self.assertIsNone(leaseBeforeExpiry) # recording a page extended the lease
+            self.assertEqual(task.attempt, 2)
+            self.assertEqual(checkpoint.pageNumber, 0)
+            self.assertEqual(checkpoint.nextPageUrl, 'http://a.com/?page=1')
+            self.assertEqual(checkpoint.limit, 50)
+            self.assertEqual(checkpoint.loadedCount, 25)
+            self.assertEqual([ job.jobLink for job in checkpoint.jobs ], [ 'http://a.com/job/1' ])
+            with self.assertRaises(LeaseLostError):
+                queue.recordPage(deadWorkerTask, 1, 'http://a.com/?page=2', 50, 50, [])
+
+
+    def test_WorkQueueGivesUpOnSearchAfterMaxAttempts(self):
+        with tempfile.TemporaryDirectory() as folder:
+            with self.assertLogs('workqueue', level='WARNING') as cm:
+                # arrange
+                clock = FakeClock()
+                queue = WorkQueue(os.path.join(folder, 'workqueue.sqlite'), leaseSeconds = 60, maxAttempts = 2, clock = clock)
+                queue.startCrawl({ 'A': QueuedSearchParams('http://a.com/') }, self.__getSearchKey)
+                queue.recordPage(queue.lease('worker 1'), 0, 'http://a.com/?page=1', 50, 25, [ self.__createJob('http://a.com/job/1') ])
+
+                # act
+                clock.now += 61
+                queue.lease('worker 2')
+                clock.now += 61
+                task = queue.lease('worker 3')
+
+                # assert
+                self.assertIsNone(task)
+                self.assertTrue(queue.isCrawlFinished())
+                self.assertEqual(queue.getProgress(), { 'failed': 1 })
+                self.assertEqual([ job.jobLink for job in queue.getJobs() ], [ 'http://a.com/job/1' ])
+                self.assertIn('WARNING:workqueue:Gave up on 1 searches after 2 attempts, keeping the jobs they loaded', cm.output)
+
+
+    def test_WorkQueueReturnsJobsOfAllSearchesOnceWithSearchNames(self):
+        with tempfile.TemporaryDirectory() as folder:
+            # arrange
+            queue = WorkQueue(os.path.join(folder, 'workqueue.sqlite'))
+            queue.startCrawl({ 'A': QueuedSearchParams('http://a.com/'), 'B': QueuedSearchParams('http://b.com/') }, self.__getSearchKey)
+            firstTask = queue.lease('worker 1')
+            secondTask = queue.lease('worker 1')
+
+            # act
+            queue.complete(firstTask, [ self.__createJob('http://jobs.com/1'), self.__createJob('http://jobs.com/2') ])
+            queue.complete(secondTask, [ self.__createJob('HTTP://JOBS.COM/2'), self.__createJob('http://jobs.com/3') ])
+            jobs = queue.getJobs()
+
+            # assert
+            self.assertTrue(queue.isCrawlFinished())
+            self.assertEqual([ job.jobLink for job in jobs ], [ 'http://jobs.com/1', 'http://jobs.com/2', 'http://jobs.com/3' ])
+            self.assertEqual([ job.searchLabels for job in jobs ], [ [ 'A' ], [ 'A', 'B' ], [ 'B' ] ])
+
+
+    def test_WorkQueueKeepsRecordedJobsOfCompletedSearch(self):
+        with tempfile.TemporaryDirectory() as folder:
+            with self.assertLogs('workqueue', level='INFO'):
+                # arrange
+                queue = WorkQueue(os.path.join(folder, 'workqueue.sqlite'))
+                queue.startCrawl({ 'A': QueuedSearchParams('http://a.com/') }, self.__getSearchKey)
+                task = queue.lease('worker 1')
+                queue.recordPage(task, 0, 'http://a.com/?page=1', 50, 25, [ self.__createJob('http://a.com/job/1') ])
+
+                # act
+                queue.complete(task, [])
+                jobs = queue.getJobs()
+
+                # assert
+                self.assertEqual([ job.jobLink for job in jobs ], [ 'http://a.com/job/1' ])
+                self.assertEqual(queue.getProgress(), { 'done': 1 })
+
+
+    def test_WorkQueueQueuesShardsAsSearchesOfTheirOwn(self):
+        with tempfile.TemporaryDirectory() as folder:
+            # arrange
+            queue = WorkQueue(os.path.join(folder, 'workqueue.sqlite'))
+            queue.startCrawl({ 'A': QueuedSearchParams('http://a.com/') }, self.__getSearchKey)
+            task = queue.lease('worker 1')
+
+            # act
+            queue.addShards(task, [ QueuedSearchParams('http://a.com/?type=1'), QueuedSearchParams('http://a.com/?type=2') ], self.__getSearchKey)
+            queue.complete(task, [])
+            shardTasks = [ queue.lease('worker 1'), queue.lease('worker 2') ]
+
+            # assert
+            self.assertEqual([ shardTask.searchKey for shardTask in shardTasks ], [ 'http://a.com/?type=1', 'http://a.com/?type=2' ])
+            self.assertEqual([ shardTask.searchNames for shardTask in shardTasks ], [ [ 'A' ], [ 'A' ] ])
+
+
+if __name__ == '__main__':
+    unittest.main()